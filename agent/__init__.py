@@ -1,2 +1,32 @@
 from .agent import Agent
-from .minimaxAgt import MinimaxAgent
+
+# Agent được nạp khi cần: import agent không kéo theo engine tìm kiếm
+# Tên -> "module:lớp"
+AGENTS = {
+    'minimax': 'agent.minimaxAgt:MinimaxAgent',
+    'random': 'agent.randomAgt:RandomAgent',
+    'learning': 'agent.learningAgt:LearningAgent',
+}
+
+
+def load_agent(name):
+    """Lớp agent theo tên trong AGENTS (import module ở lần gọi đầu)"""
+    from importlib import import_module
+
+    try:
+        module_name, class_name = AGENTS[name].split(':')
+    except KeyError:
+        raise ValueError(f"Unknown agent {name!r}, expected one of {sorted(AGENTS)}") from None
+    return getattr(import_module(module_name), class_name)
+
+
+def create_agent(name, symbol, **kwargs):
+    return load_agent(name)(symbol, **kwargs)
+
+
+def __getattr__(name):
+    # Giữ tương thích `from agent import MinimaxAgent`
+    for key, path in AGENTS.items():
+        if path.split(':')[1] == name:
+            return load_agent(key)
+    raise AttributeError(f"module 'agent' has no attribute {name!r}")
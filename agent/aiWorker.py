@@ -0,0 +1,89 @@
+"""
+Tính nước đi của AI trên thread nền để giao diện không bị đứng
+Kết quả trả về vòng lặp chính qua queue; mỗi yêu cầu có số thứ tự riêng nên
+kết quả của lượt đã hủy (ví dụ bấm Restart giữa chừng) bị bỏ qua.
+Hủy chỉ báo dừng, không chờ; lượt mới giữ khóa của agent (dùng chung với Ponderer) nên
+chỉ bắt đầu tìm kiếm khi lượt cũ đã nhả agent
+"""
+
+import queue
+import threading
+import time
+
+
+class MoveWorker:
+    def __init__(self, agent, ponderer=None):
+        self.agent = agent
+        self.ponderer = ponderer
+        self._results = queue.Queue()
+        self._generation = 0
+        # Khóa dùng chung với ponderer: tại mỗi thời điểm chỉ một lượt get_move trên agent
+        self._lock = ponderer.lock if ponderer else threading.Lock()
+        self._thread = None
+        self._stop = None
+        self._started = None
+        self.last_think_ms = None  # Thời gian nghĩ của nước vừa trả về
+
+    @property
+    def thinking(self):
+        return self._started is not None
+
+    @property
+    def elapsed(self):
+        """Số giây AI đã nghĩ cho lượt hiện tại (0 nếu đang rảnh)"""
+        return time.perf_counter() - self._started if self._started is not None else 0.0
+
+    def request(self, board):
+        """Bắt đầu tính nước đi cho thế cờ hiện tại, không chờ kết quả"""
+        # Chỉ hủy lượt trước; tìm kiếm nền của ponderer để resolve() xét đoán trúng hay trượt
+        self._cancel_request()
+        self._generation += 1
+        self._stop = threading.Event()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, args=(self._generation, board.copy(), self._stop),
+                                        daemon=True)
+        self._thread.start()
+
+    def _run(self, generation, board, stop):
+        start = time.perf_counter()
+        move = self.ponderer.resolve(board) if self.ponderer else None
+        if move is None and not stop.is_set():
+            with self._lock:
+                if not stop.is_set():
+                    # Agent nào có stop_event (Minimax) thì dừng được giữa chừng khi bị hủy
+                    self.agent.stop_event = stop
+                    try:
+                        move = self.agent.get_move(board)
+                    finally:
+                        if self.agent.stop_event is stop:
+                            self.agent.stop_event = None
+        self._results.put((generation, move, (time.perf_counter() - start) * 1000))
+
+    def poll(self):
+        """Nước đi (i, j) nếu AI đã tính xong, ngược lại None; gọi mỗi frame"""
+        while True:
+            try:
+                generation, move, think_ms = self._results.get_nowait()
+            except queue.Empty:
+                return None
+            if generation == self._generation and self._started is not None:
+                self.last_think_ms = think_ms
+                self._started = None
+                return move
+
+    def join(self, timeout=None):
+        """Chờ thread của lượt gần nhất kết thúc (dùng khi đóng chương trình và trong test)"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _cancel_request(self):
+        if self._stop is not None:
+            self._stop.set()
+        self._started = None
+
+    def cancel(self):
+        """Hủy lượt đang tính và tìm kiếm nền (Restart, thoát), không chờ; kết quả sau đó bị bỏ qua"""
+        self._cancel_request()
+        if self.ponderer:
+            self.ponderer.stop()
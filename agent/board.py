@@ -0,0 +1,320 @@
+import random
+
+EMPTY = 0
+X = 1
+O = 2
+
+SYMBOLS = ("", "x", "o")
+PLAYERS = {"x": X, "o": O}
+
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))  # ngang, dọc, chéo xuôi, chéo ngược
+
+# Seed cố định để cùng một thế cờ luôn có cùng key giữa các process
+ZOBRIST_SEED = 20240917
+_zobrist_cache = {}
+
+# Điểm của một đoạn win_length ô chỉ chứa quân một bên, theo số ô còn thiếu để thắng
+WINDOW_SCORES = {1: 500, 2: 50}
+# Tăng khi đổi cách chấm điểm, để cache bảng chuyển vị cũ trên đĩa bị loại bỏ
+EVAL_VERSION = 1
+_window_cache = {}
+
+CANDIDATE_RADIUS = 2  # Ô trống cách quân gần nhất tối đa 2 ô là nước đi ứng viên
+_neighbour_cache = {}
+
+
+def opponent_of(player):
+    """Trả về quân của đối thủ (X <-> O)"""
+    return 3 - player
+
+
+def window_tables(size, win_length):
+    """
+    Tính trước mọi đoạn win_length ô theo 4 hướng và các đoạn đi qua từng ô
+    Trả về (windows, cell_windows, values) với values[code] là điểm (góc nhìn X)
+    của một đoạn có code = số_X * (win_length + 1) + số_O
+    """
+    key = (size, win_length)
+    tables = _window_cache.get(key)
+    if tables is None:
+        windows = []
+        for di, dj in DIRECTIONS:
+            for i in range(size):
+                for j in range(size):
+                    end_i, end_j = i + di * (win_length - 1), j + dj * (win_length - 1)
+                    if 0 <= end_i < size and 0 <= end_j < size:
+                        windows.append(tuple((i + di * k) * size + j + dj * k for k in range(win_length)))
+        cell_windows = [[] for _ in range(size * size)]
+        for w, window in enumerate(windows):
+            for idx in window:
+                cell_windows[idx].append(w)
+        base = win_length + 1
+        values = [0] * (base * base)
+        for x_count in range(base):
+            for o_count in range(base):
+                if o_count == 0 and x_count > 0:
+                    values[x_count * base] = WINDOW_SCORES.get(win_length - x_count, 0)
+                elif x_count == 0 and o_count > 0:
+                    values[o_count] = -WINDOW_SCORES.get(win_length - o_count, 0)
+        tables = (tuple(windows), tuple(tuple(ws) for ws in cell_windows), tuple(values))
+        _window_cache[key] = tables
+    return tables
+
+
+def neighbour_tables(size, radius=CANDIDATE_RADIUS):
+    """Các ô trong vùng (2*radius+1)^2 quanh mỗi ô (không tính chính nó)"""
+    key = (size, radius)
+    tables = _neighbour_cache.get(key)
+    if tables is None:
+        tables = []
+        for i in range(size):
+            for j in range(size):
+                tables.append(tuple(
+                    ni * size + nj
+                    for ni in range(max(0, i - radius), min(size, i + radius + 1))
+                    for nj in range(max(0, j - radius), min(size, j + radius + 1))
+                    if (ni, nj) != (i, j)
+                ))
+        tables = tuple(tables)
+        _neighbour_cache[key] = tables
+    return tables
+
+
+def zobrist_tables(size):
+    """
+    Bảng số ngẫu nhiên 64-bit cho từng (player, ô), tạo một lần cho mỗi kích thước
+    Trả về 2 bảng độc lập: một cho key chính, một cho key kiểm tra va chạm
+    """
+    tables = _zobrist_cache.get(size)
+    if tables is None:
+        rng = random.Random(ZOBRIST_SEED + size)
+        tables = tuple(
+            (None,) + tuple([rng.getrandbits(64) for _ in range(size * size)] for _ in (X, O))
+            for _ in range(2)
+        )
+        _zobrist_cache[size] = tables
+    return tables
+
+
+class Board:
+    """
+    Bàn cờ gọn: mỗi ô là 1 byte trong `bytearray` (0 trống, 1 X, 2 O)
+    Đi/hoàn tác O(1) qua move stack, copy rẻ
+    Ô được đánh số phẳng: idx = i * size + j
+    """
+
+    def __init__(self, size=9, win_length=5):
+        self.size = size
+        self.win_length = win_length
+        self.cells = bytearray(size * size)
+        self.moves = []  # Stack các nước đã đi: (idx, player)
+        self.counts = [0, 0, 0]  # Số quân theo player (index 0 = ô trống, không dùng)
+        self.winner = EMPTY  # Cập nhật ngay trong make/undo
+        self._win_ply = 0  # Số nước đã đi khi có người thắng
+        self._zobrist, self._zobrist2 = zobrist_tables(size)
+        self.hash = 0  # Zobrist key, XOR khi đi/hoàn tác
+        self.hash2 = 0  # Key thứ hai để phát hiện va chạm
+        # Số quân mỗi bên trong từng đoạn win_length ô, cập nhật theo ô vừa đổi
+        self.windows, self._cell_windows, self._window_values = window_tables(size, win_length)
+        self._code_step = (0, win_length + 1, 1)
+        self.window_codes = [0] * len(self.windows)
+        self.score = 0  # Tổng điểm các đoạn, góc nhìn của X
+        # Tập ứng viên: ô trống có ít nhất một quân trong bán kính 2 (đếm tham chiếu)
+        self._neighbours = neighbour_tables(size)
+        self.near = bytearray(size * size)
+        self.candidates = set()
+
+    @classmethod
+    def from_game_array(cls, game_array, win_length=5):
+        """Tạo Board từ game_array cũ (list các tuple (x, y, symbol, can_play))"""
+        board = cls(len(game_array), win_length)
+        for i, row in enumerate(game_array):
+            for j, cell in enumerate(row):
+                if cell[2] != "":
+                    board.make_move(i * board.size + j, PLAYERS[cell[2]])
+        return board
+
+    @classmethod
+    def from_cells(cls, cells, size, win_length=5):
+        """Tạo Board từ dãy ô phẳng (0 trống, 1 X, 2 O), ví dụ một hàng của mảng NumPy"""
+        board = cls(size, win_length)
+        for idx, player in enumerate(bytes(cells)):
+            if player != EMPTY:
+                board.make_move(idx, player)
+        return board
+
+    @classmethod
+    def from_state(cls, state, win_length=5):
+        """Nhận Board hoặc game_array, luôn trả về một Board riêng để agent tự do đi thử"""
+        if isinstance(state, Board):
+            return state.copy()
+        return cls.from_game_array(state, win_length)
+
+    def to_game_array(self, gap=60):
+        """Chuyển ngược về game_array cũ, tọa độ pixel tính theo kích thước ô `gap`"""
+        game_array = []
+        for i in range(self.size):
+            row = []
+            for j in range(self.size):
+                symbol = SYMBOLS[self.cells[i * self.size + j]]
+                row.append((j * gap + gap // 2, i * gap + gap // 2, symbol, symbol == ""))
+            game_array.append(row)
+        return game_array
+
+    def copy(self):
+        """Sao chép bàn cờ (bytearray + move stack)"""
+        board = Board.__new__(Board)
+        board.size = self.size
+        board.win_length = self.win_length
+        board.cells = bytearray(self.cells)
+        board.moves = list(self.moves)
+        board.counts = list(self.counts)
+        board.winner = self.winner
+        board._win_ply = self._win_ply
+        board._zobrist = self._zobrist
+        board._zobrist2 = self._zobrist2
+        board.hash = self.hash
+        board.hash2 = self.hash2
+        board.windows = self.windows
+        board._cell_windows = self._cell_windows
+        board._window_values = self._window_values
+        board._code_step = self._code_step
+        board.window_codes = list(self.window_codes)
+        board.score = self.score
+        board._neighbours = self._neighbours
+        board.near = bytearray(self.near)
+        board.candidates = set(self.candidates)
+        return board
+
+    def index(self, i, j):
+        return i * self.size + j
+
+    def coords(self, idx):
+        return divmod(idx, self.size)
+
+    @property
+    def to_move(self):
+        """Quân tới lượt đi (X luôn đi trước)"""
+        return X if self.counts[X] == self.counts[O] else O
+
+    @property
+    def last_move(self):
+        return self.moves[-1][0] if self.moves else None
+
+    def make_move(self, idx, player=None):
+        """Đặt quân `player` vào ô idx"""
+        if player is None:
+            player = self.to_move
+        self.cells[idx] = player
+        self.moves.append((idx, player))
+        self.counts[player] += 1
+        self.hash ^= self._zobrist[player][idx]
+        self.hash2 ^= self._zobrist2[player][idx]
+        self._update_windows(idx, self._code_step[player])
+        cells = self.cells
+        near = self.near
+        candidates = self.candidates
+        candidates.discard(idx)
+        for nb in self._neighbours[idx]:
+            near[nb] += 1
+            if cells[nb] == EMPTY:
+                candidates.add(nb)
+        # Chỉ cần xét 4 đường đi qua ô vừa đánh
+        if not self.winner and self._line_length(idx, player) >= self.win_length:
+            self.winner = player
+            self._win_ply = len(self.moves)
+
+    def undo_move(self):
+        """Hoàn tác nước đi cuối cùng, trả về idx của ô vừa bỏ"""
+        if self.winner and len(self.moves) == self._win_ply:
+            self.winner = EMPTY
+        idx, player = self.moves.pop()
+        self.cells[idx] = EMPTY
+        self.counts[player] -= 1
+        self.hash ^= self._zobrist[player][idx]
+        self.hash2 ^= self._zobrist2[player][idx]
+        self._update_windows(idx, -self._code_step[player])
+        near = self.near
+        candidates = self.candidates
+        for nb in self._neighbours[idx]:
+            near[nb] -= 1
+            if not near[nb]:
+                candidates.discard(nb)
+        if near[idx]:
+            candidates.add(idx)
+        return idx
+
+    def _update_windows(self, idx, step):
+        """Cộng `step` vào code của các đoạn đi qua ô idx và cập nhật tổng điểm"""
+        codes = self.window_codes
+        values = self._window_values
+        delta = 0
+        for w in self._cell_windows[idx]:
+            code = codes[w]
+            codes[w] = code + step
+            delta += values[code + step] - values[code]
+        self.score += delta
+
+    def _line_length(self, idx, player, direction=None):
+        """Độ dài chuỗi quân `player` dài nhất đi qua ô idx (hoặc theo một hướng)"""
+        n = self.size
+        cells = self.cells
+        i, j = divmod(idx, n)
+        best = 0
+        for di, dj in (DIRECTIONS if direction is None else (direction,)):
+            count = 1
+            r, c = i + di, j + dj
+            while 0 <= r < n and 0 <= c < n and cells[r * n + c] == player:
+                count += 1
+                r, c = r + di, c + dj
+            r, c = i - di, j - dj
+            while 0 <= r < n and 0 <= c < n and cells[r * n + c] == player:
+                count += 1
+                r, c = r - di, c - dj
+            if count > best:
+                best = count
+        return best
+
+    def winning_line(self):
+        """Danh sách (i, j) của chuỗi thắng, rỗng nếu chưa ai thắng"""
+        if not self.winner:
+            return []
+        idx, player = self.moves[self._win_ply - 1]
+        i, j = divmod(idx, self.size)
+        for direction in DIRECTIONS:
+            if self._line_length(idx, player, direction) < self.win_length:
+                continue
+            di, dj = direction
+            # Lùi về đầu chuỗi rồi đi tới cuối chuỗi
+            r, c = i, j
+            while self._in_bounds(r - di, c - dj) and self.cells[(r - di) * self.size + c - dj] == player:
+                r, c = r - di, c - dj
+            line = []
+            while self._in_bounds(r, c) and self.cells[r * self.size + c] == player:
+                line.append((r, c))
+                r, c = r + di, c + dj
+            return line
+        return []
+
+    def _in_bounds(self, r, c):
+        return 0 <= r < self.size and 0 <= c < self.size
+
+    @property
+    def game_over(self):
+        return self.winner != EMPTY or self.is_full()
+
+    def symbol_at(self, i, j):
+        return SYMBOLS[self.cells[i * self.size + j]]
+
+    def is_empty(self, i, j):
+        return self.cells[i * self.size + j] == EMPTY
+
+    def is_full(self):
+        return len(self.moves) == len(self.cells)
+
+    def legal_moves(self):
+        """Danh sách idx các ô còn trống"""
+        return [idx for idx, cell in enumerate(self.cells) if cell == EMPTY]
+
+    def __len__(self):
+        return self.size
@@ -0,0 +1,28 @@
+class GameClock:
+    """
+    Đồng hồ cho cả ván: tổng thời gian (ms) + thời gian cộng thêm mỗi nước
+    Chia thời gian còn lại cho số nước ước lượng còn phải đi
+    """
+
+    def __init__(self, total_ms, increment_ms=0, moves_to_go=None, reserve_ms=50):
+        self.remaining_ms = total_ms
+        self.increment_ms = increment_ms
+        self.moves_to_go = moves_to_go  # None: tự ước lượng theo số ô trống
+        self.reserve_ms = reserve_ms  # Luôn chừa lại để không bị hết giờ
+
+    def allocate(self, board):
+        """Số ms được dùng cho nước đi hiện tại"""
+        if self.moves_to_go:
+            moves_left = self.moves_to_go
+        else:
+            # Ván caro thường kết thúc sớm, coi như còn 1/4 số ô trống (tối thiểu 8 nước)
+            moves_left = max(8, (len(board.cells) - len(board.moves)) // 4)
+        usable = max(0, self.remaining_ms - self.reserve_ms)
+        budget = usable / moves_left + self.increment_ms * 0.8
+        return max(1, min(budget, usable * 0.5))
+
+    def consume(self, elapsed_ms):
+        """Trừ thời gian đã dùng sau mỗi nước đi"""
+        self.remaining_ms = self.remaining_ms - elapsed_ms + self.increment_ms
+        if self.moves_to_go:
+            self.moves_to_go = max(1, self.moves_to_go - 1)
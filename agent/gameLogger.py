@@ -0,0 +1,162 @@
+"""
+Ghi log ván đấu dạng JSON Lines, không chặn luồng chơi
+Bản ghi được đưa vào queue; một thread nền gom lại ghi theo lô (tối đa batch_size bản ghi
+hoặc flush_interval giây), xoay file khi vượt max_bytes và flush nốt khi đóng/thoát chương trình.
+Dùng chung cho GUI, bộ mô phỏng và các chế độ server
+"""
+
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+
+_STOP = object()
+
+
+def new_game_id():
+    return uuid.uuid4().hex[:12]
+
+
+def engine_stats(agent):
+    """Thống kê tìm kiếm của agent sau nước vừa đi (rỗng với agent không tìm kiếm)"""
+    stats = {}
+    for key, attr in (('depth', 'completed_depth'), ('nodes', 'nodes'), ('score', 'best_score')):
+        value = getattr(agent, attr, None)
+        if value is not None:
+            stats[key] = value
+    search_stats = getattr(agent, 'search_stats', None)
+    if search_stats is not None:
+        stats['search'] = search_stats.as_dict()
+    return stats
+
+
+class GameLogger:
+    def __init__(self, path='game_log.jsonl', max_bytes=10 * 1024 * 1024, backups=3,
+                 batch_size=256, flush_interval=1.0):
+        self.path = path
+        self.max_bytes = max_bytes  # Vượt quá thì xoay file (path -> path.1 -> path.2 ...)
+        self.backups = backups
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0  # Bản ghi bị bỏ vì không chuyển được sang JSON
+        self._queue = queue.Queue()
+        self._file = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log(self, record):
+        """Đưa một bản ghi (dict) vào hàng đợi, tự thêm thời điểm 'ts'"""
+        if self._closed:
+            return
+        record.setdefault('ts', time.time())
+        self._queue.put(record)
+
+    def log_move(self, game_id, ply, player, cell, think_ms=None, stats=None, **extra):
+        record = {'event': 'move', 'game': game_id, 'ply': ply, 'player': player, 'cell': list(cell)}
+        if think_ms is not None:
+            record['think_ms'] = round(think_ms, 3)
+        if stats:
+            record['stats'] = stats
+        record.update(extra)
+        self.log(record)
+
+    def log_result(self, game_id, winner, moves, **extra):
+        self.log(dict({'event': 'result', 'game': game_id, 'winner': winner, 'moves': moves}, **extra))
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        return self._file
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        for k in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{k}"):
+                os.replace(f"{self.path}.{k}", f"{self.path}.{k + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def _encode(self, batch):
+        """Các dòng JSON của lô; bản ghi lỗi chỉ bị bỏ riêng nó và báo ra stderr"""
+        lines = []
+        for record in batch:
+            try:
+                lines.append(json.dumps(record, ensure_ascii=False) + '\n')
+            except (TypeError, ValueError) as error:
+                self.dropped += 1
+                print(f"GameLogger: dropped {record.get('event')!r} record: {error}", file=sys.stderr)
+        return lines
+
+    def _write(self, batch):
+        lines = self._encode(batch)
+        if not lines:
+            return
+        try:
+            f = self._open()
+            f.write(''.join(lines))
+            f.flush()
+        except OSError as error:
+            # Log hỏng không được làm dừng ván đấu: bỏ cả lô, lô sau mở lại file
+            self.dropped += len(lines)
+            print(f"GameLogger: dropped {len(lines)} records: {error}", file=sys.stderr)
+            self._discard_file()
+            return
+        self.written += len(lines)
+        if self.max_bytes and f.tell() >= self.max_bytes:
+            try:
+                self._rotate()
+            except OSError as error:
+                # Các bản ghi đã nằm trong file, chỉ là file chưa được xoay
+                print(f"GameLogger: rotating {self.path} failed: {error}", file=sys.stderr)
+
+    def _discard_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            batch = []
+            # Gom bản ghi tới khi đủ lô hoặc hết flush_interval kể từ bản ghi đầu tiên
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if len(batch) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        """Ghi nốt các bản ghi còn trong hàng đợi rồi đóng file (gọi nhiều lần không sao)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        atexit.unregister(self.close)
@@ -0,0 +1,135 @@
+"""
+Mô phỏng một ván giữa 2 agent trên Board (không cần pygame)
+Dùng cho giải đấu (agent.tournament), script test tỉ lệ thắng và ghi log ván đấu
+"""
+
+import time
+
+from agent.board import Board, PLAYERS, SYMBOLS
+from agent.gameLogger import engine_stats, new_game_id
+from agent.searchStats import SearchStats
+
+
+class GameSimulator:
+    def __init__(self, rows=9, logger=None):
+        self.rows = rows
+        self.logger = logger  # GameLogger (tùy chọn) để ghi từng nước đi ra JSON Lines
+        self.search_stats = {}  # symbol -> SearchStats cộng dồn của ván gần nhất (agent bật collect_stats)
+        
+    def initialize_game(self):
+        """Khởi tạo bàn cờ rỗng"""
+        return Board(self.rows)
+    
+    def convert_to_game_array(self, board):
+        """Chuyển board thành format game_array cho agents cũ"""
+        return board.to_game_array(gap=80)  # Giả định
+    
+    def check_winner(self, board):
+        """Kiểm tra có người thắng không (5 liên tiếp qua nước vừa đánh)"""
+        return SYMBOLS[board.winner] or None
+    
+    def is_board_full(self, board):
+        """Kiểm tra bàn cờ đã đầy chưa"""
+        return board.is_full()
+    
+    def play_game(self, agent1, agent2, verbose=False, max_moves=81, opening=()):
+        """
+        Chơi một ván game giữa 2 agents
+        
+        Args:
+            agent1: Agent đi trước (X)
+            agent2: Agent đi sau (O)
+            verbose: In thông tin chi tiết
+            max_moves: Số nước tối đa (tránh game vô hạn)
+            opening: Các nước (i, j) đặt sẵn trước khi agent đi, X đi trước
+        
+        Returns:
+            winner: 'x', 'o', hoặc 'draw'
+            moves: Số nước đi
+        """
+        game_id = new_game_id() if self.logger else None
+        self.search_stats = {}
+        winner, move_count = self._play_game(agent1, agent2, verbose, max_moves, game_id, opening)
+        if self.logger:
+            search = {symbol: stats.as_dict() for symbol, stats in self.search_stats.items()}
+            self.logger.log_result(game_id, winner, move_count, **({'search': search} if search else {}))
+        return winner, move_count
+    
+    def _play_game(self, agent1, agent2, verbose, max_moves, game_id, opening=()):
+        board = self.initialize_game()
+        for i, j in opening:
+            board.make_move(board.index(i, j))
+        current_agent = agent1 if len(opening) % 2 == 0 else agent2
+        current_symbol = 'x' if len(opening) % 2 == 0 else 'o'
+        move_count = len(opening)
+        
+        if verbose:
+            print(f"\n=== New Game: {agent1.__class__.__name__} (X) vs {agent2.__class__.__name__} (O) ===")
+        
+        while move_count < max_moves:
+            # Agent chọn nước đi trực tiếp trên Board (agent tự copy nếu cần đi thử)
+            start = time.perf_counter()
+            move = current_agent.get_move(board)
+            think_ms = (time.perf_counter() - start) * 1000
+            
+            if move is None:
+                if verbose:
+                    print(f"No valid move available!")
+                break
+            
+            i, j = move
+            
+            # Kiểm tra nước đi hợp lệ
+            if not board.is_empty(i, j):
+                if verbose:
+                    print(f"Invalid move at ({i},{j})!")
+                return 'invalid', move_count
+            
+            # Thực hiện nước đi
+            board.make_move(board.index(i, j), PLAYERS[current_symbol])
+            move_count += 1
+            if getattr(current_agent, 'collect_stats', False):
+                self.search_stats.setdefault(current_symbol, SearchStats()).merge(current_agent.search_stats)
+            if self.logger:
+                self.logger.log_move(game_id, move_count, current_symbol, (i, j),
+                                     think_ms=think_ms, stats=engine_stats(current_agent))
+            
+            if verbose:
+                print(f"Move {move_count}: {current_symbol.upper()} -> ({i},{j})")
+            
+            # Kiểm tra thắng
+            winner = self.check_winner(board)
+            if winner:
+                if verbose:
+                    print(f"\n🎉 {winner.upper()} wins after {move_count} moves!")
+                    self.print_board(board)
+                return winner, move_count
+            
+            # Kiểm tra hòa
+            if self.is_board_full(board):
+                if verbose:
+                    print(f"\n🤝 Draw after {move_count} moves!")
+                    self.print_board(board)
+                return 'draw', move_count
+            
+            # Đổi lượt
+            current_agent = agent2 if current_agent == agent1 else agent1
+            current_symbol = 'o' if current_symbol == 'x' else 'x'
+        
+        if verbose:
+            print(f"\n⏱️ Game timeout after {max_moves} moves!")
+        return 'timeout', move_count
+    
+    def print_board(self, board):
+        """In bàn cờ ra console"""
+        print("\n  ", end="")
+        for j in range(self.rows):
+            print(f"{j} ", end="")
+        print()
+        
+        for i in range(self.rows):
+            print(f"{i} ", end="")
+            for j in range(self.rows):
+                symbol = board.symbol_at(i, j) or "."
+                print(f"{symbol} ", end="")
+            print()
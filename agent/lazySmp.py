@@ -0,0 +1,177 @@
+"""
+Tìm kiếm song song kiểu Lazy SMP trên nhiều process
+Mọi worker cùng tìm kiếm thế cờ gốc và dùng chung một bảng chuyển vị đặt trong
+multiprocessing.shared_memory. Bảng ghi/đọc không khóa (check = key ^ data) nên entry
+bị ghi dở chỉ đơn giản là không khớp. Worker 0 là luồng chính; các helper tìm sâu hơn
+1 ply xen kẽ và xoay thứ tự nước ở gốc để lấp bảng bằng các nhánh khác nhau
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import get_context, shared_memory, util
+
+from agent.board import Board
+from agent.transTable import TranspositionTable, BUCKET_SIZE, ENTRY_BYTES
+
+# Trạng thái riêng của từng process worker
+_worker = {}
+# Chu kỳ (giây) process chính xem cờ dừng của agent trong lúc chờ worker
+_STOP_POLL = 0.005
+
+
+class SharedFlag:
+    """Cờ dừng đặt trong shared memory, có is_set() như threading.Event"""
+
+    def __init__(self, buf):
+        self.buf = buf
+
+    def is_set(self):
+        return self.buf[0] != 0
+
+
+def _init_worker(tt_name, control_name, symbol, agent_kwargs):
+    from agent.minimaxAgt import MinimaxAgent
+
+    tt_shm = shared_memory.SharedMemory(name=tt_name)
+    control_shm = shared_memory.SharedMemory(name=control_name)
+    table = TranspositionTable(buffer=tt_shm.buf)
+    agent = MinimaxAgent(symbol, transposition_table=table, **agent_kwargs)
+    agent.stop_event = SharedFlag(control_shm.buf)
+    # Giữ tham chiếu để shared memory không bị đóng khi worker còn sống
+    _worker.update(tt_shm=tt_shm, control_shm=control_shm, agent=agent)
+    # Process con thoát bằng os._exit nên atexit không chạy; Finalize thì có
+    util.Finalize(None, _release_worker, exitpriority=10)
+
+
+def _release_worker():
+    """Nhả view của bảng chuyển vị rồi đóng shared memory khi worker thoát"""
+    agent = _worker.pop('agent', None)
+    if agent is not None:
+        agent.transposition_table.release()
+    for key in ('tt_shm', 'control_shm'):
+        shm = _worker.pop(key, None)
+        if shm is not None:
+            shm.close()
+
+
+def _search_task(worker_id, moves, size, win_length, depth, time_limit_ms, node_limit):
+    agent = _worker['agent']
+    board = Board(size, win_length)
+    for idx, player in moves:
+        board.make_move(idx, player)
+    agent.max_depth = depth
+    agent.time_limit_ms = time_limit_ms
+    agent.node_limit = node_limit
+    agent.root_rotation = worker_id
+    start = time.perf_counter()
+    move = agent.get_move(board)
+    elapsed = time.perf_counter() - start
+    return {
+        'worker': worker_id,
+        'move': move,
+        'depth': agent.completed_depth,
+        'score': agent.best_score,
+        'nodes': agent.nodes,
+        'time': elapsed,
+        'nps': agent.nodes / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+class LazySmpSearch:
+    def __init__(self, symbol, workers=None, tt_size_mb=64, **agent_kwargs):
+        self.symbol = symbol
+        self.workers = workers or os.cpu_count() or 1
+        num_entries = max(BUCKET_SIZE, int(tt_size_mb * 1024 * 1024) // ENTRY_BYTES)
+        tt_bytes = num_entries // BUCKET_SIZE * BUCKET_SIZE * ENTRY_BYTES
+        # Shared memory mới tạo luôn được điền 0 (entry trống)
+        self._tt_shm = shared_memory.SharedMemory(create=True, size=tt_bytes)
+        self._control_shm = shared_memory.SharedMemory(create=True, size=8)
+        self._control_shm.buf[0] = 0
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self._tt_shm.name, self._control_shm.name, symbol, dict(agent_kwargs, workers=1)),
+        )
+        self.stats = {}
+
+    def search(self, board, max_depth, time_limit_ms=None, node_limit=None, stop_event=None):
+        """
+        Tìm nước đi song song, trả về (i, j); thống kê từng worker nằm trong self.stats
+        stop_event (có is_set()) bật lên thì mọi worker dừng như hết giờ
+        """
+        start = time.perf_counter()
+        self._control_shm.buf[0] = 0
+        moves = list(board.moves)
+        futures = []
+        for worker_id in range(self.workers):
+            # Helper lẻ tìm sâu hơn 1 ply để tỏa ra các độ sâu khác nhau
+            depth = max_depth + (worker_id % 2)
+            futures.append(self.pool.submit(_search_task, worker_id, moves, board.size, board.win_length,
+                                            depth, time_limit_ms, node_limit))
+
+        # Worker chính xong thì báo các helper dừng; cờ dừng của agent được chuyển sang worker
+        main = futures[0]
+        while not main.done():
+            if stop_event is not None and stop_event.is_set():
+                self._control_shm.buf[0] = 1
+            wait([main], timeout=_STOP_POLL)
+        self._control_shm.buf[0] = 1
+        results = [future.result() for future in futures]
+        self._control_shm.buf[0] = 0
+        elapsed = time.perf_counter() - start
+
+        # Chọn kết quả của vòng hoàn tất sâu nhất, hòa thì ưu tiên worker chính
+        best = max(results, key=lambda r: (r['depth'], r['worker'] == 0))
+        total_nodes = sum(r['nodes'] for r in results)
+        self.stats = {
+            'workers': results,
+            'depth': best['depth'],
+            'score': best['score'],
+            'chosen_worker': best['worker'],
+            'total_nodes': total_nodes,
+            'time': elapsed,
+            'nps': total_nodes / elapsed if elapsed > 0 else 0.0,
+        }
+        return best['move']
+
+    def close(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        for shm in (self._tt_shm, self._control_shm):
+            shm.close()
+            shm.unlink()
+
+
+def measure_speedup(board, symbol, depth, workers=None, **agent_kwargs):
+    """
+    So sánh thời gian tìm tới cùng độ sâu giữa 1 process và Lazy SMP
+    Trả về dict gồm thời gian, nodes/giây và speedup
+    """
+    from agent.minimaxAgt import MinimaxAgent
+
+    single = MinimaxAgent(symbol, max_depth=depth, **agent_kwargs)
+    start = time.perf_counter()
+    single.get_move(board)
+    single_time = time.perf_counter() - start
+
+    parallel = LazySmpSearch(symbol, workers, **agent_kwargs)
+    try:
+        # Lượt đầu để khởi động process, không tính giờ
+        parallel.search(board, 1)
+        start = time.perf_counter()
+        parallel.search(board, depth)
+        parallel_time = time.perf_counter() - start
+        stats = parallel.stats
+    finally:
+        parallel.close()
+    return {
+        'depth': depth,
+        'workers': parallel.workers,
+        'single_time': single_time,
+        'single_nps': single.nodes / single_time if single_time > 0 else 0.0,
+        'parallel_time': parallel_time,
+        'parallel_nps': stats['nps'],
+        'worker_nps': [r['nps'] for r in stats['workers']],
+        'speedup': single_time / parallel_time if parallel_time > 0 else 0.0,
+    }
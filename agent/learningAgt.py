@@ -1,6 +1,12 @@
 from agent import Agent
 
 class LearningAgent(Agent):
+    def __init__(self, symbol, model=None):
+        super().__init__(symbol)
+        self.model = model  # Model học máy đã train, có predict_best_move(state)
+
     def get_move(self, state):
         # Dựa vào model học máy đã train
-        return model.predict_best_move(state)
\ No newline at end of file
+        if self.model is None:
+            raise RuntimeError("LearningAgent needs a trained model (LearningAgent(symbol, model=...))")
+        return self.model.predict_best_move(state)
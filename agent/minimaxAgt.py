@@ -1,41 +1,265 @@
 from agent import Agent
+from agent.board import Board, EMPTY, EVAL_VERSION, X, PLAYERS, SYMBOLS, ZOBRIST_SEED, opponent_of
+from agent.transTable import TranspositionTable, EXACT, LOWER, UPPER
+from agent.threatSpace import ThreatSearch
 import random
+import time
+
+# Helper thứ k của Lazy SMP bỏ qua độ sâu d khi ((d + phase) // size) % 2 == 1, để các helper
+# tìm ở các độ sâu lệch nhau thay vì cùng lặp lại một vòng
+_SKIP_SIZE = (1, 1, 2, 2, 2, 2, 3, 3, 3, 3, 3, 3, 4, 4, 4, 4, 4, 4, 4, 4)
+_SKIP_PHASE = (0, 1, 0, 1, 2, 3, 0, 1, 2, 3, 4, 5, 0, 1, 2, 3, 4, 5, 6, 7)
+
+
+class SearchTimeout(Exception):
+    """Hết thời gian hoặc hết ngân sách node giữa chừng một vòng lặp sâu dần"""
+
 
 class MinimaxAgent(Agent):
-    def __init__(self, symbol):
+    def __init__(self, symbol, verify_hash=False, tt_size_mb=16, max_depth=3,
+                 time_limit_ms=None, node_limit=None, clock=None, threat_nodes=20000,
+                 workers=1, transposition_table=None, opening_book=None, tt_cache=None,
+                 collect_stats=False, on_progress=None):
         super().__init__(symbol)
-        self.max_depth = 3  # Có thể tăng lên 4 với các tối ưu
+        self.max_depth = max_depth  # Độ sâu tối đa của vòng lặp sâu dần
+        self.time_limit_ms = time_limit_ms  # Giới hạn thời gian mỗi nước (None: không giới hạn)
+        self.node_limit = node_limit  # Giới hạn số node mỗi nước (None: không giới hạn)
+        self.clock = clock  # GameClock chia thời gian cho cả ván
+        # Tìm chuỗi 4/3 ép buộc trước minimax, ngân sách node riêng (0/None: tắt)
+        # Tìm kiếm chuỗi đe dọa cũng dừng theo giờ, cờ dừng và node_limit của agent
+        self.threat_search = (ThreatSearch(node_limit=threat_nodes, budget=self._check_threat_budget)
+                              if threat_nodes else None)
+        self.threat_nodes = 0  # Số node tìm chuỗi đe dọa của nước vừa đi, tính chung vào node_limit
+        self._threat_base = 0
         self.opponent = 'x' if symbol == 'o' else 'o'
-        self.transposition_table = {}  # Cache để lưu các trạng thái đã tính
+        self.player = PLAYERS[symbol]
+        self.opponent_player = opponent_of(self.player)
+        # Cache các trạng thái đã tính (key: Zobrist hash), giữ lại giữa các lượt đi
+        # Có thể truyền bảng dùng chung (ví dụ bảng trên shared memory của Lazy SMP)
+        if transposition_table is None:
+            # workers > 1: tìm kiếm dùng bảng trên shared memory của các worker, bảng riêng chỉ cần tối thiểu
+            transposition_table = TranspositionTable(tt_size_mb if workers <= 1 else 0)
+        self.transposition_table = transposition_table
+        self.tt_size_mb = tt_size_mb
+        # File cache bảng chuyển vị: nạp khi khởi tạo, ghi lại khi close()
+        if tt_cache is not None and workers > 1:
+            raise ValueError("tt_cache is not supported with workers > 1")
+        self.tt_cache = tt_cache
+        self.tt_cache_loaded = 0
+        if tt_cache is not None:
+            self.load_tt_cache()
+        self.verify_hash = verify_hash  # Lưu thêm key thứ hai để loại bỏ va chạm hash
+        self.nodes = 0
+        self.completed_depth = 0
+        self.pv = []  # Biến chính của vòng lặp hoàn tất gần nhất (idx)
+        self.iterations = []  # (độ sâu, ms từ đầu lượt, số node, nước đi, điểm) của từng vòng hoàn tất
+        self.best_score = None
+        self._deadline = None
+        self.stop_event = None  # Đối tượng có is_set(), bật lên thì dừng tìm kiếm
+        # Tìm kiếm song song Lazy SMP trên nhiều process (1: chạy trong process hiện tại)
+        self.workers = workers
+        self.root_rotation = 0  # Helper của Lazy SMP xoay thứ tự nước ở gốc để tỏa ra nhánh khác
+        self._smp = None
+        # Thứ tự nước đi học từ các lần cắt tỉa trước
+        self.killers = []  # 2 killer move cho mỗi ply tính từ gốc
+        self.history = None  # Bảng history [player][ô], tạo khi biết kích thước bàn
+        self._root_ply = 0
+        self.stats = {'cutoffs': 0, 'first_move_cutoffs': 0}
+        # Thống kê chi tiết của nước vừa đi (SearchStats), chỉ đo khi collect_stats=True
+        self.collect_stats = collect_stats
+        self.search_stats = None
+        # Hàm gọi lại sau mỗi vòng sâu dần hoàn tất, nhận dict (depth, score, move, nodes, time_ms, pv)
+        self.on_progress = on_progress
+        # Sách khai cuộc (đường dẫn file hoặc OpeningBook), tra trước khi tìm kiếm
+        self._owns_book = isinstance(opening_book, str)
+        if self._owns_book:
+            from agent.openingBook import OpeningBook
+            opening_book = OpeningBook(opening_book)
+        self.opening_book = opening_book
 
     def get_move(self, game_array):
-        """Tìm nước đi tốt nhất sử dụng Minimax với Alpha-Beta Pruning"""
-        # Clear cache mỗi lần đi để tránh memory leak
-        if len(self.transposition_table) > 100000:
-            self.transposition_table.clear()
-        
-        best_score = float('-inf')
-        best_move = None
-        alpha = float('-inf')
-        beta = float('inf')
+        """
+        Tìm nước đi tốt nhất bằng tìm kiếm sâu dần (iterative deepening)
+        Mỗi vòng là Minimax với Alpha-Beta Pruning; khi hết thời gian/node
+        trả về nước tốt nhất của vòng hoàn tất gần nhất
+        Nhận game_array cũ hoặc Board, trả về (i, j)
+        """
+        board = Board.from_state(game_array)
+        if not self.collect_stats:
+            return self._get_move(board)
+        from agent.searchStats import SearchProbe
+        
+        probe = SearchProbe(self)
+        try:
+            return self._get_move(board)
+        finally:
+            self.search_stats = probe.finish()
+
+    def _get_move(self, board):
+        start = time.perf_counter()
+        # Bảng có kích thước cố định, chỉ tăng tuổi để entry cũ dễ bị thay thế
+        self.transposition_table.new_search()
+        self.nodes = 0
+        self.threat_nodes = 0
+        self._threat_base = self.threat_search.total_nodes if self.threat_search is not None else 0
+        self.completed_depth = 0
+        self.pv = []
+        self.iterations = []
+        self.best_score = None
+        self._reset_move_ordering(board)
+        
+        budget_ms = self.time_limit_ms
+        if self.clock is not None:
+            clock_ms = self.clock.allocate(board)
+            budget_ms = clock_ms if budget_ms is None else min(budget_ms, clock_ms)
+        self._deadline = start + budget_ms / 1000 if budget_ms is not None else None
+        
+        # Thế cờ có trong sách khai cuộc thì đi luôn, không cần tìm kiếm
+        if self.opening_book is not None:
+            entry = self.opening_book.lookup(board)
+            if entry is not None:
+                move, self.best_score = entry
+                self.pv = [move]
+                if self.clock is not None:
+                    self.clock.consume((time.perf_counter() - start) * 1000)
+                self._deadline = None
+                return board.coords(move)
+        
+        if self.workers > 1:
+            move = self._parallel_search(board, budget_ms)
+            if self.clock is not None:
+                self.clock.consume((time.perf_counter() - start) * 1000)
+            self._deadline = None
+            return move
         
         # Tìm các nước đi hợp lệ, ưu tiên các ô gần quân đã đánh
-        legal_moves = self._get_prioritized_moves(game_array)
+        legal_moves = self._get_prioritized_moves(board)
         
         if not legal_moves:
             return None
         
+        searching = len(legal_moves) > 1
+        if self.threat_search is not None and searching:
+            # Cả pha đe dọa dùng chung một ngân sách threat_nodes
+            try:
+                # Có chuỗi thắng ép buộc (VCF/VCT) thì đi luôn
+                line = self.threat_search.find_win(board, self.player, self.threat_search.node_limit)
+                if line:
+                    legal_moves = [line[0]]
+                    searching = False
+                else:
+                    # Đối thủ có VCF: chỉ giữ các nước phá được chuỗi đó
+                    legal_moves = self._threat_defences(board, legal_moves)
+            except SearchTimeout:
+                # Hết giờ/bị dừng ngay trong pha đe dọa: đi nước ưu tiên nhất
+                searching = False
+            self.threat_nodes = self._threat_used()
+        
+        if self.root_rotation and len(legal_moves) > 2:
+            shift = self.root_rotation % (len(legal_moves) - 1)
+            legal_moves[1:] = legal_moves[1 + shift:] + legal_moves[1:1 + shift]
+        
+        best_move = legal_moves[0]  # Dự phòng nếu vòng đầu tiên cũng không kịp
+        if searching and len(legal_moves) > 1:
+            for depth in range(1, self.max_depth + 1):
+                if self.root_rotation and 1 < depth < self.max_depth and self._helper_skips(depth):
+                    continue
+                try:
+                    best_score, move = self._search_root(board, depth, legal_moves)
+                except SearchTimeout:
+                    # board là bản sao riêng nên bỏ dở giữa chừng cũng không cần hoàn tác
+                    break
+                best_move = move
+                self.best_score = best_score
+                self.completed_depth = depth
+                self.pv = self._principal_variation(board, best_move, depth)
+                self.iterations.append((depth, (time.perf_counter() - start) * 1000, self.nodes,
+                                        best_move, best_score))
+                if self.on_progress is not None:
+                    self.on_progress({'depth': depth, 'score': best_score, 'move': board.coords(best_move),
+                                      'nodes': self.nodes, 'time_ms': self.iterations[-1][1],
+                                      'pv': [board.coords(idx) for idx in self.pv]})
+                
+                # Nước tốt nhất của vòng trước được xét đầu tiên ở vòng sau
+                legal_moves.remove(best_move)
+                legal_moves.insert(0, best_move)
+                
+                # Đã thấy thắng/thua chắc chắn thì không cần đào sâu thêm
+                if abs(best_score) >= 10000:
+                    break
+                # Vòng sau tốn nhiều thời gian hơn hẳn, không kịp thì dừng luôn
+                if self._deadline is not None:
+                    elapsed = time.perf_counter() - start
+                    if elapsed > (self._deadline - start) * 0.5:
+                        break
+        
+        if self.clock is not None:
+            self.clock.consume((time.perf_counter() - start) * 1000)
+        self._deadline = None
+        return board.coords(best_move)
+
+    def _helper_skips(self, depth):
+        """Helper Lazy SMP (root_rotation > 0) có bỏ qua vòng ở độ sâu này không"""
+        k = (self.root_rotation - 1) % len(_SKIP_SIZE)
+        return (depth + _SKIP_PHASE[k]) // _SKIP_SIZE[k] % 2 == 1
+
+    def _threat_defences(self, board, legal_moves):
+        """
+        Lọc các nước đi ở gốc còn để đối thủ thắng bằng chuỗi 4 liên tiếp
+        Mọi lần gọi find_vcf dùng phần còn lại của ngân sách threat_nodes; hết ngân sách thì
+        giữ nguyên các nước chưa kiểm tra được
+        """
+        search = self.threat_search
+        if not search.find_vcf(board, self.opponent_player, self._threat_left()):
+            return legal_moves
+        kept = []
+        for k, move in enumerate(legal_moves):
+            left = self._threat_left()
+            if left <= 0:
+                kept.extend(legal_moves[k:])
+                break
+            self._make_move(board, move, self.player)
+            try:
+                refuted = search.find_vcf(board, self.opponent_player, left)
+            finally:
+                self._undo_move(board)
+            if not refuted:
+                kept.append(move)
+        # Không nước nào cứu được thì vẫn tìm kiếm bình thường
+        return kept or legal_moves
+
+    def _threat_used(self):
+        return self.threat_search.total_nodes - self._threat_base
+
+    def _threat_left(self):
+        return self.threat_search.node_limit - self._threat_used()
+
+    def _check_threat_budget(self):
+        """ThreatSearch gọi mỗi 64 node: tôn trọng node_limit (tính cả node đe dọa), giờ và cờ dừng"""
+        if self.node_limit is not None and self.nodes + self._threat_used() >= self.node_limit:
+            raise SearchTimeout()
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise SearchTimeout()
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchTimeout()
+
+    def _search_root(self, board, depth, legal_moves):
+        """Một vòng tìm kiếm ở gốc với độ sâu cố định, trả về (điểm, nước đi)"""
+        best_score = float('-inf')
+        best_move = None
+        alpha = float('-inf')
+        beta = float('inf')
+        
         # Thử từng nước đi và chọn nước đi tốt nhất
         for move in legal_moves:
-            i, j = move
             # Thử nước đi
-            self._make_move(game_array, i, j, self.symbol)
+            self._make_move(board, move, self.player)
             
             # Tính điểm cho nước đi này bằng minimax
-            score = self._minimax(game_array, self.max_depth - 1, alpha, beta, False)
+            score = self._minimax(board, depth - 1, alpha, beta, False)
             
             # Hoàn tác nước đi
-            self._undo_move(game_array, i, j)
+            self._undo_move(board)
             
             # Cập nhật nước đi tốt nhất
             if score > best_score:
@@ -49,47 +273,151 @@ class MinimaxAgent(Agent):
             if best_score >= 10000:
                 break
         
-        return best_move
+        return best_score, best_move
+
+    def _reset_move_ordering(self, board):
+        """Xóa killer move, giảm một nửa history để thông tin cũ nhạt dần giữa các lượt"""
+        self._root_ply = len(board.moves)
+        self.killers = [[None, None] for _ in range(self.max_depth + 1)]
+        if self.history is None or len(self.history[X]) != len(board.cells):
+            self.history = [None] + [[0] * len(board.cells) for _ in range(2)]
+        else:
+            for table in self.history[1:]:
+                for idx in range(len(table)):
+                    table[idx] >>= 1
+        self.stats = {'cutoffs': 0, 'first_move_cutoffs': 0}
+
+    @property
+    def first_move_cutoff_rate(self):
+        """Tỉ lệ cắt tỉa xảy ra ngay ở nước đầu tiên (càng gần 1 thứ tự càng tốt)"""
+        cutoffs = self.stats['cutoffs']
+        return self.stats['first_move_cutoffs'] / cutoffs if cutoffs else 0.0
+
+    def _order_moves(self, board, ply, tt_move, player):
+        """
+        Thứ tự nước đi trong cây: nước từ bảng chuyển vị, nước thắng/chặn thắng ngay,
+        2 killer move của ply này, còn lại theo điểm đánh giá nhanh rồi history
+        """
+        scored = self._score_moves(board)
+        if not scored:
+            return self._get_all_legal_moves(board)
+        history = self.history[player]
+        scored.sort(reverse=True, key=lambda x: (x[0], history[x[1]]))
+        
+        ordered = []
+        if tt_move is not None and board.cells[tt_move] == EMPTY:
+            ordered.append(tt_move)
+        # Nước thắng ngay hoặc chặn thắng ngay luôn đứng trước killer move
+        urgent = 0
+        while urgent < len(scored) and scored[urgent][0] >= 9000:
+            urgent += 1
+        ordered.extend(move for _, move in scored[:urgent] if move != tt_move)
+        for killer in self.killers[ply] if ply < len(self.killers) else ():
+            if killer is not None and board.cells[killer] == EMPTY and killer not in ordered:
+                ordered.append(killer)
+        
+        # Chỉ lấy top 15-20 nước đi tốt nhất để giảm branching factor
+        for _, move in scored[urgent:]:
+            if len(ordered) >= 20:
+                break
+            if move not in ordered:
+                ordered.append(move)
+        return ordered
+
+    def _record_cutoff(self, ply, move, player, depth, move_index):
+        """Ghi nhận nước gây cắt tỉa vào killer move và bảng history"""
+        self.stats['cutoffs'] += 1
+        if move_index == 0:
+            self.stats['first_move_cutoffs'] += 1
+        if ply < len(self.killers):
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+        self.history[player][move] += depth * depth
 
-    def _get_prioritized_moves(self, game_array):
+    def _parallel_search(self, board, budget_ms):
+        """Giao lượt tìm kiếm cho các process Lazy SMP, tạo pool ở lần gọi đầu"""
+        if self._smp is None:
+            from agent.lazySmp import LazySmpSearch
+            # Sách khai cuộc đã tra ở process này trước khi giao cho worker
+            self._smp = LazySmpSearch(self.symbol, self.workers, tt_size_mb=self.tt_size_mb,
+                                      threat_nodes=self.threat_search.node_limit if self.threat_search else 0,
+                                      verify_hash=self.verify_hash)
+        move = self._smp.search(board, self.max_depth, budget_ms, self.node_limit, self.stop_event)
+        self.completed_depth = self._smp.stats['depth']
+        self.nodes = self._smp.stats['total_nodes']
+        self.best_score = self._smp.stats['score']
+        return move
+
+    def load_tt_cache(self, path=None):
+        """Nạp cache bảng chuyển vị từ đĩa; file không có hoặc đã cũ thì bắt đầu với bảng trống"""
+        path = path or self.tt_cache
+        try:
+            self.tt_cache_loaded = self.transposition_table.load(path, EVAL_VERSION, ZOBRIST_SEED)
+        except (OSError, ValueError):
+            self.tt_cache_loaded = 0
+        return self.tt_cache_loaded
+
+    def save_tt_cache(self, path=None, min_depth=2):
+        """Ghi các entry sâu của bảng chuyển vị ra đĩa, trả về số entry đã ghi"""
+        return self.transposition_table.save(path or self.tt_cache, EVAL_VERSION, ZOBRIST_SEED, min_depth)
+
+    def close(self):
+        """
+        Giải phóng pool process, shared memory của tìm kiếm song song và file sách tự mở (nếu có)
+        Có tt_cache thì ghi bảng chuyển vị ra đĩa cho lần chạy sau
+        """
+        if self.tt_cache is not None:
+            self.save_tt_cache()
+        if self._smp is not None:
+            self._smp.close()
+            self._smp = None
+        if self._owns_book and self.opening_book is not None:
+            self.opening_book.close()
+            self.opening_book = None
+
+    def _check_budget(self):
+        """Ném SearchTimeout khi vượt giới hạn node, hết thời gian hoặc bị yêu cầu dừng"""
+        if self.node_limit is not None and self.nodes + self.threat_nodes >= self.node_limit:
+            raise SearchTimeout()
+        # Đọc đồng hồ và cờ dừng mỗi 32 node (mỗi node tốn cỡ 0.5ms nên vẫn rẻ, mà không trễ quá lâu)
+        if not self.nodes & 31:
+            if self._deadline is not None and time.perf_counter() >= self._deadline:
+                raise SearchTimeout()
+            if self.stop_event is not None and self.stop_event.is_set():
+                raise SearchTimeout()
+
+    def _principal_variation(self, board, first_move, depth):
+        """Dựng biến chính từ nước tốt nhất lưu trong bảng chuyển vị"""
+        pv = [first_move]
+        board.make_move(first_move, self.player)
+        while len(pv) < depth and not board.game_over:
+            lock = board.hash2 if self.verify_hash else None
+            entry = self.transposition_table.probe(self._get_board_hash(board), lock)
+            if entry is None or entry[3] is None or board.cells[entry[3]] != EMPTY:
+                break
+            pv.append(entry[3])
+            board.make_move(entry[3])
+        for _ in pv:
+            board.undo_move()
+        return pv
+
+    def _get_prioritized_moves(self, board):
         """
         Lấy các nước đi hợp lệ và sắp xếp theo độ ưu tiên
         Chỉ xét các ô trong khoảng 2 ô xung quanh các quân đã đánh
         """
-        n = len(game_array)
-        occupied = set()
-        
-        # Tìm tất cả các ô đã có quân
-        for i in range(n):
-            for j in range(n):
-                if game_array[i][j][2] != "":
-                    occupied.add((i, j))
-        
         # Nếu bàn trống, đánh vào trung tâm
-        if not occupied:
-            center = n // 2
-            return [(center, center)]
-        
-        # Tìm các ô trong vùng 2 ô xung quanh quân đã đánh
-        candidate_moves = set()
-        for (oi, oj) in occupied:
-            for di in range(-2, 3):
-                for dj in range(-2, 3):
-                    ni, nj = oi + di, oj + dj
-                    if 0 <= ni < n and 0 <= nj < n and game_array[ni][nj][3]:
-                        candidate_moves.add((ni, nj))
+        if not board.moves:
+            center = board.size // 2
+            return [board.index(center, center)]
         
+        # Các ô trong vùng 2 ô xung quanh quân đã đánh, Board cập nhật sẵn khi đi/hoàn tác
         # Nếu không có nước đi nào, return tất cả nước đi hợp lệ
-        if not candidate_moves:
-            return self._get_all_legal_moves(game_array)
-        
-        # Đánh giá và sắp xếp các nước đi theo điểm
-        moves_with_scores = []
-        for move in candidate_moves:
-            i, j = move
-            # Đánh giá nhanh nước đi này
-            score = self._quick_evaluate_move(game_array, i, j)
-            moves_with_scores.append((score, move))
+        moves_with_scores = self._score_moves(board)
+        if not moves_with_scores:
+            return self._get_all_legal_moves(board)
         
         # Sắp xếp theo điểm giảm dần
         moves_with_scores.sort(reverse=True, key=lambda x: x[0])
@@ -98,35 +426,41 @@ class MinimaxAgent(Agent):
         max_moves = min(20, len(moves_with_scores))
         return [move for _, move in moves_with_scores[:max_moves]]
 
-    def _quick_evaluate_move(self, game_array, i, j):
+    def _score_moves(self, board):
+        """Đánh giá nhanh từng ô ứng viên, trả về list (điểm, nước đi)"""
+        # Copy ra list vì đánh giá thử sẽ làm thay đổi tập ứng viên
+        return [(self._quick_evaluate_move(board, move), move) for move in list(board.candidates)]
+
+    def _quick_evaluate_move(self, board, move):
         """Đánh giá nhanh một nước đi mà không cần minimax"""
         score = 0
         
         # Thử đánh cả hai symbol để xem nước đi này có tạo thế tấn công/phòng thủ không
-        for symbol in [self.symbol, self.opponent]:
-            self._make_move(game_array, i, j, symbol)
+        for player in (self.player, self.opponent_player):
+            self._make_move(board, move, player)
             
             # Kiểm tra xem có tạo thế thắng không
-            if self._check_winner(game_array) == symbol:
-                self._undo_move(game_array, i, j)
-                return 10000 if symbol == self.symbol else 9000
+            if self._check_winner(board) == SYMBOLS[player]:
+                self._undo_move(board)
+                return 10000 if player == self.player else 9000
             
             # Đếm số chuỗi 4, 3, 2 tạo được
-            board = self._get_board(game_array)
-            temp_score = self._count_threats(board, i, j, symbol)
+            temp_score = self._count_threats(board, move, player)
             
-            if symbol == self.symbol:
+            if player == self.player:
                 score += temp_score
             else:
                 score += temp_score * 0.9  # Phòng thủ quan trọng nhưng ít hơn tấn công
             
-            self._undo_move(game_array, i, j)
+            self._undo_move(board)
         
         return score
 
-    def _count_threats(self, board, row, col, symbol):
+    def _count_threats(self, board, move, player):
         """Đếm số lượng thế nguy hiểm tại một vị trí"""
-        n = len(board)
+        n = board.size
+        cells = board.cells
+        row, col = divmod(move, n)
         score = 0
         directions = [(0, 1), (1, 0), (1, 1), (1, -1)]  # ngang, dọc, chéo xuôi, chéo ngược
         
@@ -139,9 +473,9 @@ class MinimaxAgent(Agent):
             for step in range(1, 5):
                 r, c = row + dr * step, col + dc * step
                 if 0 <= r < n and 0 <= c < n:
-                    if board[r][c] == symbol:
+                    if cells[r * n + c] == player:
                         count += 1
-                    elif board[r][c] == "":
+                    elif cells[r * n + c] == EMPTY:
                         empty += 1
                         break
                     else:
@@ -153,9 +487,9 @@ class MinimaxAgent(Agent):
             for step in range(1, 5):
                 r, c = row - dr * step, col - dc * step
                 if 0 <= r < n and 0 <= c < n:
-                    if board[r][c] == symbol:
+                    if cells[r * n + c] == player:
                         count += 1
-                    elif board[r][c] == "":
+                    elif cells[r * n + c] == EMPTY:
                         empty += 1
                         break
                     else:
@@ -173,192 +507,141 @@ class MinimaxAgent(Agent):
         
         return score
 
-    def _minimax(self, game_array, depth, alpha, beta, is_maximizing):
+    def _minimax(self, board, depth, alpha, beta, is_maximizing):
         """Thuật toán Minimax với Alpha-Beta Pruning và Transposition Table"""
         
-        # Tạo hash key cho trạng thái hiện tại
-        board_key = self._get_board_hash(game_array)
+        self.nodes += 1
+        self._check_budget()
         
-        # Kiểm tra trong cache
-        if board_key in self.transposition_table:
-            cached_depth, cached_score = self.transposition_table[board_key]
+        # Tạo hash key cho trạng thái hiện tại
+        board_key = self._get_board_hash(board)
+        lock = board.hash2 if self.verify_hash else None
+        alpha_orig, beta_orig = alpha, beta
+        
+        # Kiểm tra trong cache (điểm trong bảng tính theo bên tới lượt)
+        tt_move = None
+        entry = self.transposition_table.probe(board_key, lock)
+        if entry is not None:
+            cached_depth, cached_score, cached_flag, tt_move = entry
+            cached_score, cached_flag = self._from_side_to_move(cached_score, cached_flag, is_maximizing)
             if cached_depth >= depth:
-                return cached_score
+                if cached_flag == EXACT:
+                    return cached_score
+                elif cached_flag == LOWER:
+                    alpha = max(alpha, cached_score)
+                elif cached_flag == UPPER:
+                    beta = min(beta, cached_score)
+                if beta <= alpha:
+                    return cached_score
         
         # Kiểm tra điều kiện dừng
-        winner = self._check_winner(game_array)
+        winner = self._check_winner(board)
         if winner == self.symbol:
             return 10000 + depth
         elif winner == self.opponent:
             return -10000 - depth
-        elif self._is_draw(game_array):
+        elif self._is_draw(board):
             return 0
         
         if depth == 0:
-            score = self._evaluate_board(game_array)
-            self.transposition_table[board_key] = (depth, score)
+            score = self._evaluate_board(board)
+            self._store(board_key, lock, depth, score, EXACT, None, is_maximizing)
             return score
         
-        # Lấy các nước đi được ưu tiên
-        legal_moves = self._get_prioritized_moves(game_array)
+        # Lấy các nước đi được ưu tiên: nước từ cache, killer move, history
+        ply = len(board.moves) - self._root_ply
+        player = self.player if is_maximizing else self.opponent_player
+        legal_moves = self._order_moves(board, ply, tt_move, player)
         
+        best_move = None
         if is_maximizing:
             max_eval = float('-inf')
-            for move in legal_moves:
-                i, j = move
-                self._make_move(game_array, i, j, self.symbol)
-                eval_score = self._minimax(game_array, depth - 1, alpha, beta, False)
-                self._undo_move(game_array, i, j)
+            for move_index, move in enumerate(legal_moves):
+                self._make_move(board, move, self.player)
+                eval_score = self._minimax(board, depth - 1, alpha, beta, False)
+                self._undo_move(board)
                 
-                max_eval = max(max_eval, eval_score)
+                if eval_score > max_eval:
+                    max_eval = eval_score
+                    best_move = move
                 alpha = max(alpha, eval_score)
                 
                 if beta <= alpha:
+                    self._record_cutoff(ply, move, player, depth, move_index)
                     break  # Beta cutoff
             
-            self.transposition_table[board_key] = (depth, max_eval)
-            return max_eval
+            best_score = max_eval
         else:
             min_eval = float('inf')
-            for move in legal_moves:
-                i, j = move
-                self._make_move(game_array, i, j, self.opponent)
-                eval_score = self._minimax(game_array, depth - 1, alpha, beta, True)
-                self._undo_move(game_array, i, j)
+            for move_index, move in enumerate(legal_moves):
+                self._make_move(board, move, self.opponent_player)
+                eval_score = self._minimax(board, depth - 1, alpha, beta, True)
+                self._undo_move(board)
                 
-                min_eval = min(min_eval, eval_score)
+                if eval_score < min_eval:
+                    min_eval = eval_score
+                    best_move = move
                 beta = min(beta, eval_score)
                 
                 if beta <= alpha:
+                    self._record_cutoff(ply, move, player, depth, move_index)
                     break  # Alpha cutoff
             
-            self.transposition_table[board_key] = (depth, min_eval)
-            return min_eval
+            best_score = min_eval
+        
+        # Điểm ngoài cửa sổ (alpha, beta) ban đầu chỉ là cận
+        if best_score <= alpha_orig:
+            flag = UPPER
+        elif best_score >= beta_orig:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self._store(board_key, lock, depth, best_score, flag, best_move, is_maximizing)
+        return best_score
+
+    def _from_side_to_move(self, score, flag, is_maximizing):
+        """Đổi điểm giữa góc nhìn của agent và góc nhìn bên tới lượt (đối xứng hai chiều)"""
+        if is_maximizing:
+            return score, flag
+        if flag == LOWER:
+            flag = UPPER
+        elif flag == UPPER:
+            flag = LOWER
+        return -score, flag
 
-    def _get_board_hash(self, game_array):
-        """Tạo hash key cho trạng thái bàn cờ"""
-        return tuple(tuple(game_array[i][j][2] for j in range(len(game_array[i]))) 
-                    for i in range(len(game_array)))
+    def _store(self, board_key, lock, depth, score, flag, move, is_maximizing):
+        """Lưu vào bảng theo góc nhìn bên tới lượt để entry dùng được cho cả hai agent"""
+        score, flag = self._from_side_to_move(score, flag, is_maximizing)
+        self.transposition_table.store(board_key, depth, score, flag, move, lock)
 
-    def _get_all_legal_moves(self, game_array):
+    def _get_board_hash(self, board):
+        """Hash key cho trạng thái bàn cờ (Zobrist, Board cập nhật khi đi/hoàn tác)"""
+        return board.hash
+
+    def _get_all_legal_moves(self, board):
         """Lấy tất cả các nước đi hợp lệ"""
-        moves = []
-        for i in range(len(game_array)):
-            for j in range(len(game_array[i])):
-                if game_array[i][j][3]:
-                    moves.append((i, j))
-        return moves
-
-    def _make_move(self, game_array, i, j, symbol):
+        return board.legal_moves()
+
+    def _make_move(self, board, move, player):
         """Thực hiện nước đi"""
-        x, y, _, _ = game_array[i][j]
-        game_array[i][j] = (x, y, symbol, False)
+        board.make_move(move, player)
 
-    def _undo_move(self, game_array, i, j):
+    def _undo_move(self, board):
         """Hoàn tác nước đi"""
-        x, y, _, _ = game_array[i][j]
-        game_array[i][j] = (x, y, "", True)
+        board.undo_move()
 
-    def _get_board(self, game_array):
-        """Chuyển game_array sang board 2D đơn giản"""
-        return [[game_array[r][c][2] for c in range(len(game_array[r]))] for r in range(len(game_array))]
+    def _check_winner(self, board):
+        """Kiểm tra xem có ai thắng không (Board tự cập nhật sau mỗi nước đi)"""
+        return SYMBOLS[board.winner] or None
 
-    def _check_winner(self, game_array):
-        """Kiểm tra xem có ai thắng không"""
-        board = self._get_board(game_array)
-        n = len(board)
-        
-        # Chỉ kiểm tra xung quanh các quân vừa đánh gần đây
-        for r in range(n):
-            for c in range(n - 4):
-                seq = [board[r][c + k] for k in range(5)]
-                if seq[0] != "" and all(x == seq[0] for x in seq):
-                    return seq[0]
-        
-        for c in range(n):
-            for r in range(n - 4):
-                seq = [board[r + k][c] for k in range(5)]
-                if seq[0] != "" and all(x == seq[0] for x in seq):
-                    return seq[0]
-        
-        for r in range(n - 4):
-            for c in range(n - 4):
-                seq = [board[r + k][c + k] for k in range(5)]
-                if seq[0] != "" and all(x == seq[0] for x in seq):
-                    return seq[0]
-        
-        for r in range(n - 4):
-            for c in range(4, n):
-                seq = [board[r + k][c - k] for k in range(5)]
-                if seq[0] != "" and all(x == seq[0] for x in seq):
-                    return seq[0]
-        
-        return None
-
-    def _is_draw(self, game_array):
+    def _is_draw(self, board):
         """Kiểm tra xem bàn cờ đã đầy chưa (hòa)"""
-        # Chỉ kiểm tra trong vùng có quân
-        for row in game_array:
-            for cell in row:
-                if cell[3]:
-                    return False
-        return True
-
-    def _evaluate_board(self, game_array):
-        """Hàm đánh giá trạng thái bàn cờ - version tối ưu"""
-        board = self._get_board(game_array)
-        score = 0
-        n = len(board)
-        
-        # Chỉ đánh giá các đoạn có ít nhất 1 quân
-        def evaluate_segment(segment, player):
-            opponent = self.opponent if player == self.symbol else self.symbol
-            
-            if opponent in segment:
-                return 0
-            
-            player_count = segment.count(player)
-            
-            if player_count == 4:
-                return 500
-            elif player_count == 3:
-                return 50
-            elif player_count == 2:
-                return 10
-            elif player_count == 1:
-                return 1
-            return 0
-        
-        # Đánh giá hàng ngang
-        for r in range(n):
-            for c in range(n - 4):
-                segment = [board[r][c + k] for k in range(5)]
-                if "" not in segment or segment.count("") <= 2:  # Chỉ đánh giá nếu có tiềm năng
-                    score += evaluate_segment(segment, self.symbol)
-                    score -= evaluate_segment(segment, self.opponent)
-        
-        # Đánh giá hàng dọc
-        for c in range(n):
-            for r in range(n - 4):
-                segment = [board[r + k][c] for k in range(5)]
-                if "" not in segment or segment.count("") <= 2:
-                    score += evaluate_segment(segment, self.symbol)
-                    score -= evaluate_segment(segment, self.opponent)
-        
-        # Đánh giá chéo xuôi
-        for r in range(n - 4):
-            for c in range(n - 4):
-                segment = [board[r + k][c + k] for k in range(5)]
-                if "" not in segment or segment.count("") <= 2:
-                    score += evaluate_segment(segment, self.symbol)
-                    score -= evaluate_segment(segment, self.opponent)
-        
-        # Đánh giá chéo ngược
-        for r in range(n - 4):
-            for c in range(4, n):
-                segment = [board[r + k][c - k] for k in range(5)]
-                if "" not in segment or segment.count("") <= 2:
-                    score += evaluate_segment(segment, self.symbol)
-                    score -= evaluate_segment(segment, self.opponent)
-        
-        return score
\ No newline at end of file
+        return board.is_full()
+
+    def _evaluate_board(self, board):
+        """
+        Hàm đánh giá trạng thái bàn cờ
+        Board giữ số quân mỗi bên trong từng đoạn 5 ô và tổng điểm (góc nhìn X),
+        cập nhật khi đi/hoàn tác nên ở lá chỉ cần đọc ra
+        """
+        return board.score if self.player == X else -board.score
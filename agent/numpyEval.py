@@ -0,0 +1,110 @@
+"""
+Backend NumPy (tùy chọn) để đánh giá hàng loạt bàn cờ
+Bàn cờ lưu thành mảng int8 (0 trống, 1 X, 2 O); số quân mỗi bên trong từng đoạn
+win_length ô được tính bằng 4 phép cộng cửa sổ trượt (ngang, dọc, 2 đường chéo)
+trên view strided, rồi tra bảng điểm. Cho cùng kết quả với MinimaxAgent._evaluate_board
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy không bắt buộc cho engine chính
+    np = None
+
+from agent.board import Board, WINDOW_SCORES, X, O
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("NumPy backend requires numpy (pip install numpy)")
+
+
+def window_value_table(win_length=5):
+    """Bảng điểm [số X, số O] của một đoạn, góc nhìn X (giống bảng của Board)"""
+    _require_numpy()
+    base = win_length + 1
+    table = np.zeros((base, base), dtype=np.int64)
+    for count in range(1, base):
+        table[count, 0] = WINDOW_SCORES.get(win_length - count, 0)
+        table[0, count] = -WINDOW_SCORES.get(win_length - count, 0)
+    return table
+
+
+def to_array(boards):
+    """Board, list Board hoặc mảng (n, n) / (N, n, n) -> mảng int8 (N, n, n) liên tục"""
+    _require_numpy()
+    if isinstance(boards, Board):
+        boards = [boards]
+    if isinstance(boards, (list, tuple)) and boards and isinstance(boards[0], Board):
+        size = boards[0].size
+        return np.frombuffer(b"".join(bytes(b.cells) for b in boards), dtype=np.int8).reshape(-1, size, size).copy()
+    array = np.asarray(boards, dtype=np.int8)
+    if array.ndim == 2:
+        array = array[None]
+    return np.ascontiguousarray(array)
+
+
+def window_counts(stones, win_length=5):
+    """
+    Số quân trong mọi đoạn win_length ô của mảng 0/1 `stones` (N, n, n)
+    Trả về 4 mảng (ngang, dọc, chéo xuôi, chéo ngược), mỗi mảng (N, rows, cols)
+    """
+    stones = np.ascontiguousarray(stones, dtype=np.int8)
+    count, n, _ = stones.shape
+    k = win_length
+    m = n - k + 1
+    if m <= 0:
+        return []
+    s0, s1, s2 = stones.strides
+    as_strided = np.lib.stride_tricks.as_strided
+    horizontal = as_strided(stones, shape=(count, n, m, k), strides=(s0, s1, s2, s2))
+    vertical = as_strided(stones, shape=(count, m, n, k), strides=(s0, s1, s2, s1))
+    diagonal = as_strided(stones, shape=(count, m, m, k), strides=(s0, s1, s2, s1 + s2))
+    # Chéo ngược: đoạn bắt đầu ở cột >= k-1 và đi xuống về bên trái
+    anti = as_strided(stones[:, :, k - 1:], shape=(count, m, m, k), strides=(s0, s1, s2, s1 - s2))
+    counts = []
+    for windows in (horizontal, vertical, diagonal, anti):
+        # Cộng k lát cắt strided nhanh hơn nhiều so với sum() trên trục cuối không liên tục
+        total = windows[..., 0].copy()
+        for offset in range(1, k):
+            total += windows[..., offset]
+        counts.append(total)
+    return counts
+
+
+def evaluate_batch(boards, win_length=5):
+    """Điểm góc nhìn X của từng bàn cờ, trả về mảng int64 (N,)"""
+    _require_numpy()
+    boards = to_array(boards)
+    table = window_value_table(win_length)
+    x_counts = window_counts(boards == X, win_length)
+    o_counts = window_counts(boards == O, win_length)
+    total = np.zeros(len(boards), dtype=np.int64)
+    for x_count, o_count in zip(x_counts, o_counts):
+        total += table[x_count, o_count].reshape(len(boards), -1).sum(axis=1)
+    return total
+
+
+def evaluate(board, symbol='x', win_length=5):
+    """Điểm của một bàn cờ theo góc nhìn `symbol`, giống MinimaxAgent._evaluate_board"""
+    score = int(evaluate_batch(board, win_length)[0])
+    return score if symbol == 'x' else -score
+
+
+def has_five(boards, player, win_length=5):
+    """Mảng bool (N,): bàn nào `player` đã có đủ win_length quân liên tiếp"""
+    _require_numpy()
+    boards = to_array(boards)
+    won = np.zeros(len(boards), dtype=bool)
+    for windows in window_counts(boards == player, win_length):
+        won |= (windows.reshape(len(boards), -1) >= win_length).any(axis=1)
+    return won
+
+
+def find_winners(boards, win_length=5):
+    """Người thắng của từng bàn (0: chưa ai, 1: X, 2: O) trong một lượt vector hóa"""
+    _require_numpy()
+    boards = to_array(boards)
+    winners = np.zeros(len(boards), dtype=np.int8)
+    for player in (X, O):
+        winners[has_five(boards, player, win_length) & (winners == 0)] = player
+    return winners
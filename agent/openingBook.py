@@ -0,0 +1,123 @@
+"""
+Sách khai cuộc tính sẵn
+Builder tìm kiếm sâu các thế cờ của N ply đầu (offline) rồi ghi ra file nhị phân gồm
+header + các bản ghi cố định sắp theo Zobrist hash. Khi chơi, file được mmap và tra bằng
+tìm kiếm nhị phân nên chỉ những trang được đọc tới mới nằm trong bộ nhớ
+"""
+
+import mmap
+import os
+import struct
+import sys
+
+from agent.board import Board, EMPTY, SYMBOLS
+
+MAGIC = b"TTTB"
+VERSION = 1
+# magic, version, size, win_length, số bản ghi
+HEADER = struct.Struct("<4sHBBI")
+# hash, 32 bit thấp của hash2 (loại va chạm), ô đi, điểm (góc nhìn bên đi)
+RECORD = struct.Struct("<QIHh")
+SCORE_LIMIT = 32767
+
+
+class OpeningBook:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # File rỗng không mmap được
+            self._file.close()
+            raise ValueError(f"{path}: not an opening book")
+        magic, version, self.size, self.win_length, self.count = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path}: not an opening book (or unsupported version)")
+
+    def __len__(self):
+        return self.count
+
+    def _record(self, position):
+        return RECORD.unpack_from(self._data, HEADER.size + position * RECORD.size)
+
+    def lookup(self, board):
+        """(ô đi, điểm) của thế cờ trong sách hoặc None"""
+        if board.size != self.size or board.win_length != self.win_length:
+            return None
+        key = board.hash
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self._record(mid)[0] < key:
+                low = mid + 1
+            else:
+                high = mid
+        # Các bản ghi trùng hash nằm liền nhau, so thêm hash2 để chắc đúng thế cờ
+        check = board.hash2 & 0xFFFFFFFF
+        while low < self.count:
+            key_at, check_at, move, score = self._record(low)
+            if key_at != key:
+                break
+            if check_at == check and board.cells[move] == EMPTY:
+                return move, score
+            low += 1
+        return None
+
+    def close(self):
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+        self._file.close()
+
+
+def write_book(path, entries, size=9, win_length=5):
+    """Ghi danh sách (hash, hash2, ô đi, điểm) ra file sách, sắp theo hash"""
+    entries = sorted((key, check & 0xFFFFFFFF, move, max(-SCORE_LIMIT, min(SCORE_LIMIT, int(score))))
+                     for key, check, move, score in entries)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, size, win_length, len(entries)))
+        for entry in entries:
+            f.write(RECORD.pack(*entry))
+    # Ghi file tạm rồi đổi tên để engine đang mmap file cũ không đọc phải file dở
+    os.replace(tmp_path, path)
+    return len(entries)
+
+
+def build_book(path, plies=4, depth=5, width=3, size=9, win_length=5, verbose=False, **agent_kwargs):
+    """
+    Tìm kiếm mọi thế cờ trong `plies` ply đầu và ghi ra sách
+    Ở mỗi thế cờ, mở rộng nước tốt nhất cùng `width` nước xếp đầu khác (nước đối thủ hay đi),
+    thế cờ hoán vị chỉ tìm một lần
+    """
+    from agent.minimaxAgt import MinimaxAgent
+
+    agents = {symbol: MinimaxAgent(symbol, max_depth=depth, **agent_kwargs) for symbol in ("x", "o")}
+    entries = {}
+    frontier = [Board(size, win_length)]
+    for ply in range(plies):
+        next_frontier = []
+        for board in frontier:
+            if board.hash in entries or board.game_over:
+                continue
+            agent = agents[SYMBOLS[board.to_move]]
+            i, j = agent.get_move(board)
+            best = board.index(i, j)
+            entries[board.hash] = (board.hash, board.hash2, best, agent.best_score or 0)
+            for move in [best] + [m for m in agent._get_prioritized_moves(board) if m != best][:width]:
+                child = board.copy()
+                child.make_move(move)
+                next_frontier.append(child)
+        if verbose:
+            print(f"ply {ply + 1}/{plies}: {len(entries)} positions")
+        frontier = next_frontier
+    return write_book(path, entries.values(), size, win_length)
+
+
+if __name__ == "__main__":
+    out = sys.argv[1] if len(sys.argv) > 1 else "opening.book"
+    plies = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    depth = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    count = build_book(out, plies=plies, depth=depth, verbose=True)
+    print(f"Wrote {count} positions to {out}")
@@ -0,0 +1,108 @@
+"""
+Suy nghĩ trong thời gian của đối thủ (pondering)
+Sau khi AI đi, một thread nền đoán nước đáp của người chơi (nước thứ 2 trong biến chính,
+không có thì nước xếp đầu) rồi tìm kiếm sẵn thế cờ sau nước đó, đồng thời lấp bảng chuyển vị.
+Người chơi đi đúng nước đoán: trả lời ngay hoặc tìm tiếp trong ngân sách thời gian.
+Đoán sai: dừng tìm kiếm qua stop_event, kết quả bỏ đi (bảng chuyển vị vẫn có ích).
+Mọi lượt dùng agent (ponder và MoveWorker) giữ `lock`, nên stop() chỉ cần báo dừng mà không
+phải chờ: lượt tìm kiếm sau tự chờ lượt trước nhả agent
+"""
+
+import threading
+import time
+
+
+class Ponderer:
+    def __init__(self, agent):
+        self.agent = agent
+        self.prediction = None  # Ô dự đoán người chơi sẽ đi
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()  # Giữ trong lúc agent đang tìm kiếm
+        self._thread = None
+        self._stop = threading.Event()
+        self._result = None
+        self._key = None
+
+    @property
+    def active(self):
+        return self._thread is not None
+
+    def predict(self, board):
+        """Nước đáp dễ xảy ra nhất của đối thủ sau nước AI vừa đi"""
+        agent = self.agent
+        if len(agent.pv) > 1 and board.moves and board.moves[-1][0] == agent.pv[0]:
+            if board.cells[agent.pv[1]] == 0:
+                return agent.pv[1]
+        moves = agent._get_prioritized_moves(board)
+        return moves[0] if moves else None
+
+    def start(self, board):
+        """Gọi ngay sau khi AI đi; bắt đầu tìm kiếm nền cho thế cờ sau nước dự đoán"""
+        self.stop()
+        if board.game_over:
+            return None
+        self.prediction = self.predict(board)
+        if self.prediction is None:
+            return None
+        pondered = board.copy()
+        pondered.make_move(self.prediction)
+        if pondered.game_over:
+            return None
+        self._key = (pondered.hash, pondered.hash2)
+        self._result = None
+        # Event mới cho mỗi lượt: lượt cũ có thể vẫn đang dừng dần, không được "sống lại"
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(pondered, self._stop), daemon=True)
+        self._thread.start()
+        return self.prediction
+
+    def _run(self, board, stop):
+        agent = self.agent
+        with self.lock:
+            if stop.is_set():
+                return
+            # Tìm tới max_depth hoặc tới khi bị dừng, không tính vào đồng hồ ván
+            saved = agent.time_limit_ms, agent.clock, agent.stop_event
+            agent.time_limit_ms, agent.clock, agent.stop_event = None, None, stop
+            try:
+                result = agent.get_move(board)
+            finally:
+                agent.time_limit_ms, agent.clock, agent.stop_event = saved
+        if stop is self._stop:
+            self._result = result
+
+    def stop(self, wait=False):
+        """
+        Báo dừng tìm kiếm nền, không chặn (gọi được từ thread giao diện)
+        wait=True: chờ thread kết thúc, chỉ dùng ngoài thread giao diện
+        """
+        # Có thể được gọi từ thread khác (hủy lượt), nên chỉ đọc _thread một lần
+        thread, self._thread = self._thread, None
+        self._stop.set()
+        if wait and thread is not None:
+            thread.join()
+
+    def resolve(self, board, budget_ms=None):
+        """
+        Gọi khi người chơi đã đi. Đoán đúng: trả về nước đi (i, j) từ kết quả ponder,
+        nếu còn đang tìm thì chờ thêm tối đa budget_ms (mặc định time_limit_ms của agent).
+        Đoán sai hoặc không ponder: dừng lại và trả về None để tìm kiếm bình thường
+        Chờ thread ponder kết thúc nên chỉ gọi từ thread tính nước (MoveWorker)
+        """
+        thread = self._thread
+        if thread is None:
+            return None
+        if (board.hash, board.hash2) != self._key:
+            self.misses += 1
+            self.stop(wait=True)
+            return None
+
+        self.hits += 1
+        start = time.perf_counter()
+        budget_ms = self.agent.time_limit_ms if budget_ms is None else budget_ms
+        thread.join(None if budget_ms is None else budget_ms / 1000)
+        self.stop(wait=True)
+        if self.agent.clock is not None:
+            self.agent.clock.consume((time.perf_counter() - start) * 1000)
+        return self._result
@@ -0,0 +1,209 @@
+"""
+Giao thức engine dạng dòng lệnh qua stdin/stdout (theo Gomocup/Piskvork)
+    START [size]          -> OK
+    BEGIN                 -> engine đi trước, trả về "x,y"
+    TURN x,y              -> nước của đối thủ, engine trả về "x,y"
+    BOARD ... DONE        -> nạp cả thế cờ (mỗi dòng "x,y,field", 1: quân mình, 2: đối thủ), trả về "x,y"
+    TAKEBACK x,y          -> OK
+    INFO key value        -> timeout_turn, timeout_match, time_left, max_memory (không trả lời)
+    RESTART               -> OK
+    ABOUT / END
+Tọa độ theo Gomocup: x là cột, y là hàng. Một engine (và bảng chuyển vị) sống suốt ván,
+nước đi được cập nhật dần vào Board thay vì gửi lại cả bàn cờ
+"""
+
+import sys
+
+from agent.board import Board, SYMBOLS, X, O, opponent_of
+from agent.clock import GameClock
+from agent.transTable import TranspositionTable
+
+ABOUT = 'name="tictactoe-minimax", version="1.0", author="tictactoe-pygame", country="VN"'
+
+
+class ProtocolError(Exception):
+    """Lệnh sai cú pháp hoặc không hợp lệ với thế cờ hiện tại"""
+
+
+class ProtocolEngine:
+    def __init__(self, win_length=5, max_depth=20, tt_size_mb=16, turn_ms=1000, **agent_kwargs):
+        self.win_length = win_length
+        self.max_depth = max_depth
+        self.tt_size_mb = tt_size_mb
+        self.turn_ms = turn_ms  # Thời gian mỗi nước khi chưa có INFO timeout_turn
+        self.agent_kwargs = agent_kwargs
+        self.board = None
+        self.table = None
+        self._table_mb = None  # tt_size_mb lúc tạo self.table
+        self.agents = {}  # Một agent cho mỗi màu, dùng chung bảng chuyển vị
+        self.clock = None  # GameClock khi có INFO timeout_match/time_left
+        self.running = True
+        self._board_lines = None  # Đang nhận các dòng của lệnh BOARD
+
+    # Chuyển tọa độ Gomocup (x: cột, y: hàng) <-> chỉ số ô
+    def _parse_cell(self, text):
+        try:
+            x, y = (int(part) for part in text.split(',')[:2])
+        except ValueError:
+            raise ProtocolError(f"bad coordinates {text!r}") from None
+        if self.board is None:
+            raise ProtocolError("no game, send START first")
+        if not (0 <= x < self.board.size and 0 <= y < self.board.size):
+            raise ProtocolError(f"coordinates out of board: {text}")
+        return self.board.index(y, x)
+
+    def _format_cell(self, idx):
+        i, j = self.board.coords(idx)
+        return f"{j},{i}"
+
+    def handle(self, line):
+        """Xử lý một dòng lệnh, trả về list các dòng cần in ra"""
+        line = line.strip()
+        if not line:
+            return []
+        if self._board_lines is not None:
+            return self._collect_board(line)
+        command, _, args = line.partition(' ')
+        handler = getattr(self, '_cmd_' + command.lower(), None)
+        if handler is None:
+            return [f"UNKNOWN command {command}"]
+        try:
+            return handler(args.strip())
+        except (ProtocolError, ValueError) as error:
+            return [f"ERROR {error}"]
+
+    def _cmd_start(self, args):
+        size = int(args) if args else 9
+        if size < self.win_length:
+            return [f"ERROR unsupported size {size}"]
+        if not self._build_table() and self.board is not None and self.board.size != size:
+            self.table.clear()
+        self.board = Board(size, self.win_length)
+        return ["OK"]
+
+    def _build_table(self):
+        """Tạo lại bảng chuyển vị khi chưa có hoặc tt_size_mb đã đổi, trả về True nếu tạo mới"""
+        if self.table is not None and self._table_mb == self.tt_size_mb:
+            return False
+        self.table = None  # Bỏ bảng cũ trước để không giữ hai bảng cùng lúc
+        self.table = TranspositionTable(self.tt_size_mb)
+        self._table_mb = self.tt_size_mb
+        return True
+
+    def _cmd_restart(self, args):
+        if self.board is None:
+            raise ProtocolError("no game, send START first")
+        self.board = Board(self.board.size, self.win_length)
+        return ["OK"]
+
+    def _cmd_begin(self, args):
+        if self.board is None or self.board.moves:
+            raise ProtocolError("BEGIN needs an empty board after START")
+        return [self._think()]
+
+    def _cmd_turn(self, args):
+        idx = self._parse_cell(args)
+        if self.board.cells[idx] or self.board.game_over:
+            raise ProtocolError(f"illegal move {args}")
+        self.board.make_move(idx)
+        return [self._think()]
+
+    def _cmd_takeback(self, args):
+        idx = self._parse_cell(args)
+        if not self.board.moves or self.board.moves[-1][0] != idx:
+            raise ProtocolError(f"{args} is not the last move")
+        self.board.undo_move()
+        return ["OK"]
+
+    def _cmd_board(self, args):
+        if self.board is None:
+            raise ProtocolError("no game, send START first")
+        self._board_lines = []
+        return []
+
+    def _collect_board(self, line):
+        if line.upper() != 'DONE':
+            self._board_lines.append(line)
+            return []
+        lines, self._board_lines = self._board_lines, None
+        try:
+            stones = []
+            for text in lines:
+                parts = text.split(',')
+                stones.append((self._parse_cell(text), int(parts[2]) if len(parts) > 2 else 1))
+        except (ValueError, IndexError):
+            return ["ERROR bad BOARD line"]
+        except ProtocolError as error:
+            return [f"ERROR {error}"]
+        # Số quân bằng nhau thì mình là X (đi trước), ngược lại mình là O
+        own = sum(1 for _, field in stones if field == 1)
+        me = X if own == len(stones) - own else O
+        board = Board(self.board.size, self.win_length)
+        for idx, field in stones:
+            board.make_move(idx, me if field == 1 else opponent_of(me))
+        self.board = board
+        return [self._think()]
+
+    def _cmd_info(self, args):
+        key, _, value = args.partition(' ')
+        try:
+            value = int(value)
+        except ValueError:
+            return []
+        if key == 'timeout_turn':
+            self.turn_ms = value  # 0: đi càng nhanh càng tốt
+        elif key == 'timeout_match':
+            self.clock = GameClock(value) if value else None
+        elif key == 'time_left' and self.clock is not None:
+            self.clock.remaining_ms = value
+        elif key == 'max_memory' and value:
+            # Dành một nửa cho bảng chuyển vị; INFO tới sau START nên dựng lại bảng ngay
+            self.tt_size_mb = min(self.tt_size_mb, value / (2 * 1024 * 1024))
+            if self.table is not None:
+                self._build_table()
+        return []
+
+    def _cmd_about(self, args):
+        return [ABOUT]
+
+    def _cmd_end(self, args):
+        self.running = False
+        return []
+
+    def _agent(self, symbol):
+        from agent.minimaxAgt import MinimaxAgent
+
+        agent = self.agents.get(symbol)
+        if agent is None or agent.transposition_table is not self.table:
+            agent = MinimaxAgent(symbol, max_depth=self.max_depth, transposition_table=self.table,
+                                 **self.agent_kwargs)
+            self.agents[symbol] = agent
+        return agent
+
+    def _think(self):
+        """Tìm nước cho bên tới lượt, đi luôn trên board và trả về "x,y" """
+        board = self.board
+        if board.game_over:
+            raise ProtocolError("game is over")
+        agent = self._agent(SYMBOLS[board.to_move])
+        # Chừa 10% thời gian cho phần giao tiếp và độ trễ kiểm tra đồng hồ
+        agent.time_limit_ms = max(1, self.turn_ms * 0.9)
+        agent.clock = self.clock
+        i, j = agent.get_move(board)
+        idx = board.index(i, j)
+        board.make_move(idx)
+        return self._format_cell(idx)
+
+
+def main(stdin=sys.stdin, stdout=sys.stdout, **engine_kwargs):
+    engine = ProtocolEngine(**engine_kwargs)
+    for line in stdin:
+        for output in engine.handle(line):
+            stdout.write(output + '\n')
+        stdout.flush()
+        if not engine.running:
+            break
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,41 @@
 from agent import Agent
+from agent.board import Board
 import random
 
 class RandomAgent(Agent):
+    def __init__(self, symbol, seed=None):
+        super().__init__(symbol)
+        self.rng = random.Random(seed)  # Seed riêng để ván đấu tái lập được
+
     def get_move(self, game_array):
+        # Board: lấy thẳng các ô trống, không cần duyệt tuple
+        if isinstance(game_array, Board):
+            legal_moves = game_array.legal_moves()
+            if legal_moves:
+                return game_array.coords(self.rng.choice(legal_moves))
+            return None
+
         # Get all legal moves
         legal_moves = []
         for i in range(len(game_array)):
             for j in range(len(game_array[i])):
                 if game_array[i][j][3]:  # If can_play is True
                     legal_moves.append((i, j))
-        
+
         if legal_moves:
-            return random.choice(legal_moves)
-        return None
\ No newline at end of file
+            return self.rng.choice(legal_moves)
+        return None
+
+    def get_moves(self, boards, rng=None):
+        """
+        Chọn nước cho nhiều ván cùng lúc
+        boards: mảng NumPy (N, n, n), trả về mảng chỉ số ô phẳng (N,)
+        """
+        import numpy as np
+
+        rng = rng if rng is not None else np.random.default_rng()
+        flat = boards.reshape(len(boards), -1)
+        # Gán số ngẫu nhiên cho ô trống, -1 cho ô đã có quân, rồi lấy ô lớn nhất
+        keys = rng.random(flat.shape)
+        keys[flat != 0] = -1.0
+        return keys.argmax(axis=1)
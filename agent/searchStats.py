@@ -0,0 +1,274 @@
+"""
+Thống kê tìm kiếm và công cụ profile cho MinimaxAgent (chỉ bật khi cần)
+Với collect_stats=True, mỗi lượt get_move gắn tạm các hàm bọc lên agent để đếm TT probe/hit/store,
+cắt tỉa theo vị trí nước, độ sâu lớn nhất đã tới và thời gian từng pha (tính riêng, không cộng
+dồn pha con). Khi tắt, agent chạy đúng code cũ nên không tốn thêm gì
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+
+# Pha của tìm kiếm: thân alpha-beta (TT, đi/hoàn tác), sinh và xếp nước, đánh giá lá,
+# kiểm tra thắng, tìm chuỗi đe dọa; phần còn lại của lượt nằm trong 'other'
+PHASES = ('search', 'movegen', 'eval', 'win_check', 'threats')
+_PHASE_METHODS = {
+    '_minimax': 'search',
+    '_order_moves': 'movegen',
+    '_get_prioritized_moves': 'movegen',
+    '_evaluate_board': 'eval',
+    '_check_winner': 'win_check',
+    '_threat_defences': 'threats',
+}
+
+
+class SearchStats:
+    """Bộ đếm của một nước đi hoặc cộng dồn nhiều nước (merge)"""
+
+    def __init__(self):
+        self.moves = 0
+        self.nodes = 0
+        self.qnodes = 0  # Node của tìm kiếm chuỗi đe dọa (VCF/VCT)
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tt_stores = 0
+        self.cutoffs = []  # cutoffs[k]: số lần cắt tỉa ở nước thứ k trong danh sách
+        self.depth_total = 0  # Tổng độ sâu hoàn tất, chia cho moves ra độ sâu trung bình
+        self.seldepth = 0  # Ply sâu nhất đã tới tính từ gốc
+        self.ebf_total = 0.0
+        self.ebf_samples = 0
+        self.time_ms = 0.0
+        self.phase_ms = dict.fromkeys(PHASES, 0.0)
+
+    @property
+    def tt_hit_rate(self):
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    @property
+    def first_move_cutoff_rate(self):
+        total = sum(self.cutoffs)
+        return self.cutoffs[0] / total if total else 0.0
+
+    @property
+    def effective_branching_factor(self):
+        """Trung bình của các lượt: (node vòng cuối / node vòng đầu) ^ (1 / số bước sâu thêm)"""
+        return self.ebf_total / self.ebf_samples if self.ebf_samples else None
+
+    def add_iterations(self, iterations):
+        """Tính branching factor hiệu dụng từ agent.iterations (số node cộng dồn sau mỗi vòng)"""
+        nodes = [n for _, _, n, _, _ in iterations]
+        per_depth = [b - a for a, b in zip([0] + nodes, nodes)]
+        if len(per_depth) >= 2 and per_depth[0] > 0 and per_depth[-1] > 0:
+            self.ebf_total += (per_depth[-1] / per_depth[0]) ** (1 / (len(per_depth) - 1))
+            self.ebf_samples += 1
+
+    def record_cutoff(self, move_index):
+        cutoffs = self.cutoffs
+        while len(cutoffs) <= move_index:
+            cutoffs.append(0)
+        cutoffs[move_index] += 1
+
+    def merge(self, other):
+        """Cộng dồn thống kê của nước/ván khác vào đây, trả về self"""
+        for key in ('moves', 'nodes', 'qnodes', 'tt_probes', 'tt_hits', 'tt_stores', 'depth_total',
+                    'ebf_total', 'ebf_samples', 'time_ms'):
+            setattr(self, key, getattr(self, key) + getattr(other, key))
+        self.seldepth = max(self.seldepth, other.seldepth)
+        for k, count in enumerate(other.cutoffs):
+            if k == len(self.cutoffs):
+                self.cutoffs.append(0)
+            self.cutoffs[k] += count
+        for phase, ms in other.phase_ms.items():
+            self.phase_ms[phase] = self.phase_ms.get(phase, 0.0) + ms
+        return self
+
+    def as_dict(self):
+        """Dạng JSON được, kèm các chỉ số suy ra (hit rate, nodes/giây, ...)"""
+        phase_ms = {phase: round(ms, 3) for phase, ms in self.phase_ms.items()}
+        phase_ms['other'] = round(max(0.0, self.time_ms - sum(self.phase_ms.values())), 3)
+        ebf = self.effective_branching_factor
+        return {
+            'moves': self.moves,
+            'nodes': self.nodes,
+            'qnodes': self.qnodes,
+            'tt_probes': self.tt_probes,
+            'tt_hits': self.tt_hits,
+            'tt_stores': self.tt_stores,
+            'tt_hit_rate': round(self.tt_hit_rate, 4),
+            'cutoffs': list(self.cutoffs),
+            'first_move_cutoff_rate': round(self.first_move_cutoff_rate, 4),
+            'avg_depth': round(self.depth_total / self.moves, 3) if self.moves else 0.0,
+            'seldepth': self.seldepth,
+            'ebf': round(ebf, 3) if ebf is not None else None,
+            'ebf_samples': self.ebf_samples,
+            'time_ms': round(self.time_ms, 3),
+            'nps': round(self.nodes / self.time_ms * 1000) if self.time_ms else 0,
+            'phase_ms': phase_ms,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Dựng lại từ as_dict() (ví dụ kết quả trả về từ process khác)"""
+        stats = cls()
+        for key in ('moves', 'nodes', 'qnodes', 'tt_probes', 'tt_hits', 'tt_stores', 'seldepth',
+                    'ebf_samples', 'time_ms'):
+            setattr(stats, key, data.get(key, 0))
+        stats.cutoffs = list(data.get('cutoffs', []))
+        stats.depth_total = data.get('avg_depth', 0.0) * stats.moves
+        stats.ebf_total = (data.get('ebf') or 0.0) * stats.ebf_samples
+        stats.phase_ms.update({phase: ms for phase, ms in data.get('phase_ms', {}).items() if phase != 'other'})
+        return stats
+
+
+class SearchProbe:
+    """Gắn các hàm bọc lên agent trong một lượt get_move, finish() gỡ ra và trả về SearchStats"""
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.stats = SearchStats()
+        self._stack = []  # Thời gian của các pha con đang chạy, để trừ khỏi pha cha
+        self._start = time.perf_counter()
+        table = agent.transposition_table
+        self._table_counts = (table.probes, table.hits, table.stores)
+        threat = agent.threat_search
+        self._qnodes = threat.total_nodes if threat is not None else 0
+        self._patched = []
+        for name, phase in _PHASE_METHODS.items():
+            self._patch(agent, name, self._timed(phase, getattr(agent, name)))
+        if threat is not None:
+            self._patch(threat, 'find_win', self._timed('threats', threat.find_win))
+        self._patch(agent, '_record_cutoff', self._cutoff(agent._record_cutoff))
+        # Đo độ sâu đã tới ngay trong hàm bọc của _minimax
+        self._patch(agent, '_minimax', self._track_ply(agent._minimax))
+
+    def _patch(self, owner, name, wrapper):
+        # Hàm bọc chồng lên hàm bọc: chỉ cần gỡ thuộc tính của instance một lần
+        setattr(owner, name, wrapper)
+        if (owner, name) not in self._patched:
+            self._patched.append((owner, name))
+
+    def _timed(self, phase, func):
+        stack = self._stack
+        phase_ms = self.stats.phase_ms
+        clock = time.perf_counter
+
+        def wrapper(*args):
+            stack.append(0.0)
+            start = clock()
+            try:
+                return func(*args)
+            finally:
+                elapsed = clock() - start
+                child = stack.pop()
+                phase_ms[phase] += (elapsed - child) * 1000
+                if stack:
+                    stack[-1] += elapsed
+        return wrapper
+
+    def _cutoff(self, func):
+        stats = self.stats
+
+        def wrapper(ply, move, player, depth, move_index):
+            stats.record_cutoff(move_index)
+            return func(ply, move, player, depth, move_index)
+        return wrapper
+
+    def _track_ply(self, func):
+        stats = self.stats
+        agent = self.agent
+
+        def wrapper(board, *args):
+            ply = len(board.moves) - agent._root_ply
+            if ply > stats.seldepth:
+                stats.seldepth = ply
+            return func(board, *args)
+        return wrapper
+
+    def finish(self):
+        for owner, name in reversed(self._patched):
+            delattr(owner, name)
+        self._patched = []
+        agent = self.agent
+        stats = self.stats
+        table = agent.transposition_table
+        stats.moves = 1
+        stats.nodes = agent.nodes
+        stats.tt_probes = table.probes - self._table_counts[0]
+        stats.tt_hits = table.hits - self._table_counts[1]
+        stats.tt_stores = table.stores - self._table_counts[2]
+        if agent.threat_search is not None:
+            stats.qnodes = agent.threat_search.total_nodes - self._qnodes
+        stats.depth_total = agent.completed_depth
+        stats.add_iterations(agent.iterations)
+        stats.time_ms = (time.perf_counter() - self._start) * 1000
+        return stats
+
+
+class SamplingProfiler:
+    """
+    Profile kiểu lấy mẫu: thread nền đọc stack của thread đang tìm kiếm mỗi `interval` giây
+    Nhẹ hơn cProfile nhiều nên thời gian đo gần với lúc chạy thật
+    """
+
+    def __init__(self, thread_id=None, interval=0.001):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.samples = Counter()  # (file, dòng, hàm) ở đỉnh stack
+        self.inclusive = Counter()  # Hàm xuất hiện ở bất kỳ đâu trong stack
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            code = frame.f_code
+            self.samples[(code.co_filename, frame.f_lineno, code.co_name)] += 1
+            seen = set()
+            while frame is not None:
+                name = frame.f_code.co_name
+                if name not in seen:
+                    seen.add(name)
+                    self.inclusive[name] += 1
+                frame = frame.f_back
+
+    def report(self, limit=15):
+        total = sum(self.samples.values()) or 1
+        lines = [f"{sum(self.samples.values())} samples"]
+        for (filename, lineno, name), count in self.samples.most_common(limit):
+            lines.append(f"{count / total * 100:6.1f}%  {name} ({filename.rsplit('/', 1)[-1]}:{lineno})")
+        return '\n'.join(lines)
+
+
+def profile_move(agent, board, mode='cprofile', interval=0.001):
+    """
+    Chạy một lượt get_move dưới profiler
+    mode 'cprofile' trả về (nước đi, pstats.Stats); 'sample' trả về (nước đi, SamplingProfiler)
+    """
+    if mode == 'sample':
+        with SamplingProfiler(interval=interval) as profiler:
+            move = agent.get_move(board)
+        return move, profiler
+    if mode != 'cprofile':
+        raise ValueError(f"unknown profile mode {mode!r}")
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        move = agent.get_move(board)
+    finally:
+        profiler.disable()
+    return move, pstats.Stats(profiler)
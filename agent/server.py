@@ -0,0 +1,334 @@
+"""
+Server asyncio (TCP, JSON Lines) phục vụ nhiều ván người-vs-AI cùng lúc
+Tin nhắn client -> server (mỗi dòng một object JSON):
+    {"type": "new", "opponent": "minimax", "human": "x", "time_ms": 1000, "budget_ms": 60000}
+    {"type": "move", "session": "...", "cell": [i, j]}
+    {"type": "close", "session": "..."}
+Server trả lời "started", "move" (nước của AI + thời gian), "result" và "error".
+Tìm kiếm chạy trên pool process tạo sẵn: mỗi worker giữ agent (bảng chuyển vị, sách khai cuộc)
+giữa các yêu cầu. Số yêu cầu đang chạy bị giới hạn (backpressure); client ngắt kết nối thì
+yêu cầu chờ bị hủy, yêu cầu đang chạy được dừng qua cờ trong shared memory
+"""
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+
+from agent import create_agent
+from agent.board import Board, PLAYERS, SYMBOLS
+from agent.clock import GameClock
+from agent.gameLogger import new_game_id
+
+# Đối thủ server cho phép chọn: chỉ các agent chạy được không cần file model (không có 'learning')
+OPPONENTS = ('minimax', 'random')
+
+# Trạng thái riêng của từng process worker
+_worker = {}
+
+
+def _init_worker(flags_name, opening_book):
+    from agent.lazySmp import SharedFlag
+
+    flags = shared_memory.SharedMemory(name=flags_name)
+    _worker.update(flags=flags, flag=SharedFlag, opening_book=opening_book, agents={})
+    if opening_book:
+        from agent.openingBook import OpeningBook
+        _worker['opening_book'] = OpeningBook(opening_book)
+
+
+def _warm_up(name, kwargs):
+    """Nạp module và tạo agent trước khi có yêu cầu thật"""
+    _agent(name, 'x', kwargs)
+    _agent(name, 'o', kwargs)
+    return os.getpid()
+
+
+def _agent(name, symbol, kwargs):
+    key = (name, symbol, tuple(sorted(kwargs.items())))
+    agent = _worker['agents'].get(key)
+    if agent is None:
+        extra = {'opening_book': _worker['opening_book']} if name == 'minimax' and _worker['opening_book'] else {}
+        agent = _worker['agents'][key] = create_agent(name, symbol, **kwargs, **extra)
+    return agent
+
+
+def _search(name, symbol, kwargs, moves, size, slot, time_ms):
+    """Chạy trong worker: dựng lại thế cờ và tìm nước đi, trả về (i, j, thống kê)"""
+    from agent.gameLogger import engine_stats
+
+    board = Board(size)
+    for idx, player in moves:
+        board.make_move(idx, player)
+    agent = _agent(name, symbol, kwargs)
+    agent.stop_event = _worker['flag'](_worker['flags'].buf[slot:slot + 1])
+    if hasattr(agent, 'time_limit_ms'):
+        agent.time_limit_ms = time_ms
+    try:
+        i, j = agent.get_move(board)
+    finally:
+        agent.stop_event.buf.release()
+        agent.stop_event = None
+    return i, j, engine_stats(agent)
+
+
+def _positive_int(message, key, default):
+    """Giá trị số nguyên dương của message[key] (thiếu hoặc null thì dùng default)"""
+    value = message.get(key)
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+        raise ValueError(f'{key} must be a positive integer, got {value!r}')
+    return value
+
+
+class Session:
+    def __init__(self, slot, opponent, human, time_ms, budget_ms, agent_kwargs, size=9):
+        self.id = new_game_id()
+        self.slot = slot  # Ô cờ dừng trong shared memory
+        self.opponent = opponent
+        self.human = human
+        self.ai = 'o' if human == 'x' else 'x'
+        self.time_ms = time_ms
+        self.clock = GameClock(budget_ms) if budget_ms else None  # Tổng thời gian của AI cả ván
+        self.agent_kwargs = agent_kwargs
+        self.board = Board(size)
+        self.task = None  # Lượt tìm kiếm đang chạy (asyncio)
+        self.job = None  # Future của lượt đó trong pool process
+
+    @property
+    def result(self):
+        if self.board.winner:
+            return SYMBOLS[self.board.winner]
+        return 'draw' if self.board.is_full() else None
+
+
+class EngineServer:
+    def __init__(self, host='127.0.0.1', port=8765, workers=None, max_sessions=256, max_inflight=None,
+                 move_time_ms=1000, max_time_ms=10000, opening_book=None, **agent_kwargs):
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.max_sessions = max_sessions
+        # Số lượt tìm kiếm được gửi vào pool cùng lúc, phần còn lại chờ ở server
+        self.max_inflight = max_inflight or self.workers * 2
+        self.move_time_ms = move_time_ms
+        self.max_time_ms = max_time_ms
+        self.opening_book = opening_book
+        self.agent_kwargs = dict({'max_depth': 8}, **agent_kwargs)
+        self.sessions = {}
+        self.stats = {'moves': 0, 'cancelled': 0, 'queued': 0, 'errors': 0}
+        self._free_slots = list(range(max_sessions - 1, -1, -1))
+        self._flags = None
+        self._pool = None
+        self._server = None
+        self._inflight = None
+
+    async def start(self):
+        self._flags = shared_memory.SharedMemory(create=True, size=self.max_sessions)
+        self._flags.buf[:self.max_sessions] = bytes(self.max_sessions)
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context('spawn'),
+                                         initializer=_init_worker,
+                                         initargs=(self._flags.name, self.opening_book))
+        self._inflight = asyncio.Semaphore(self.max_inflight)
+        # Tạo sẵn process và agent trong từng worker để nước đầu tiên không phải chờ khởi động
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _warm_up, 'minimax', self.agent_kwargs)
+                               for _ in range(self.workers)))
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for session in list(self.sessions.values()):
+            self._close_session(session)
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+        if self._flags is not None:
+            self._flags.close()
+            self._flags.unlink()
+            self._flags = None
+
+    async def _handle_client(self, reader, writer):
+        owned = set()
+        lock = asyncio.Lock()
+
+        async def send(message):
+            async with lock:
+                writer.write((json.dumps(message) + '\n').encode())
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    await self._dispatch(message, owned, send)
+                except (ValueError, KeyError, TypeError) as error:
+                    await send({'type': 'error', 'message': str(error)})
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            # Client ngắt kết nối: hủy mọi ván của client này
+            for session_id in owned:
+                session = self.sessions.get(session_id)
+                if session is not None:
+                    self._close_session(session)
+            writer.close()
+
+    async def _dispatch(self, message, owned, send):
+        kind = message['type']
+        if kind == 'new':
+            if not self._free_slots:
+                await send({'type': 'error', 'message': 'server full'})
+                return
+            human = message.get('human', 'x')
+            if human not in PLAYERS:
+                raise ValueError(f"human must be 'x' or 'o', got {human!r}")
+            opponent = message.get('opponent', 'minimax')
+            if opponent not in OPPONENTS:
+                raise ValueError(f"unknown opponent {opponent!r}, expected one of {list(OPPONENTS)}")
+            time_ms = min(_positive_int(message, 'time_ms', self.move_time_ms), self.max_time_ms)
+            budget_ms = _positive_int(message, 'budget_ms', None)
+            kwargs = self.agent_kwargs if opponent == 'minimax' else {}
+            session = Session(self._free_slots.pop(), opponent, human, time_ms, budget_ms, kwargs)
+            self.sessions[session.id] = session
+            owned.add(session.id)
+            await send({'type': 'started', 'session': session.id, 'human': human})
+            if session.ai == 'x':
+                self._start_search(session, send)
+        elif kind == 'move':
+            session = self._owned_session(message, owned)
+            i, j = message['cell']
+            board = session.board
+            # Luật giống main.py: đúng lượt, ô trống, ván chưa kết thúc
+            if session.task is not None or SYMBOLS[board.to_move] != session.human:
+                raise ValueError('not your turn')
+            if session.result or not (0 <= i < board.size and 0 <= j < board.size) or not board.is_empty(i, j):
+                raise ValueError(f'illegal move {[i, j]}')
+            board.make_move(board.index(i, j), PLAYERS[session.human])
+            if session.result:
+                await send({'type': 'result', 'session': session.id, 'result': session.result})
+                self._close_session(session)
+            else:
+                self._start_search(session, send)
+        elif kind == 'close':
+            # Ván của mình đã kết thúc thì đóng lại không báo lỗi
+            if message['session'] not in owned:
+                raise ValueError(f"unknown session {message['session']!r}")
+            session = self.sessions.get(message['session'])
+            if session is not None:
+                self._close_session(session)
+        else:
+            raise ValueError(f'unknown message type {kind!r}')
+
+    def _owned_session(self, message, owned):
+        """Ván của chính kết nối này; id của client khác bị từ chối như id không tồn tại"""
+        session_id = message['session']
+        session = self.sessions.get(session_id) if session_id in owned else None
+        if session is None:
+            raise ValueError(f'unknown session {session_id!r}')
+        return session
+
+    def _start_search(self, session, send):
+        session.task = asyncio.ensure_future(self._ai_move(session, send))
+        session.task.add_done_callback(self._search_done)
+
+    def _search_done(self, task):
+        # Lỗi của lượt tìm kiếm (worker hỏng, client đã ngắt) không được làm sập server
+        if not task.cancelled() and task.exception() is not None:
+            self.stats['errors'] += 1
+
+    async def _ai_move(self, session, send):
+        board = session.board
+        time_ms = session.time_ms
+        if session.clock is not None:
+            time_ms = min(time_ms, session.clock.allocate(board))
+        queued = time.perf_counter()
+        self.stats['queued'] += 1
+        waiting = True
+        try:
+            async with self._inflight:
+                self.stats['queued'] -= 1
+                waiting = False
+                started = time.perf_counter()
+                self._flags.buf[session.slot] = 0
+                session.job = self._pool.submit(_search, session.opponent, session.ai, session.agent_kwargs,
+                                                list(board.moves), board.size, session.slot, time_ms)
+                i, j, stats = await asyncio.wrap_future(session.job)
+        except asyncio.CancelledError:
+            self.stats['cancelled'] += 1
+            if waiting:
+                self.stats['queued'] -= 1
+            raise
+        except Exception as error:
+            session.job = None
+            await send({'type': 'error', 'session': session.id, 'message': f'search failed: {error}'})
+            raise
+        finally:
+            session.task = None
+        session.job = None
+        think_ms = (time.perf_counter() - started) * 1000
+        if session.clock is not None:
+            session.clock.consume(think_ms)
+        board.make_move(board.index(i, j), PLAYERS[session.ai])
+        self.stats['moves'] += 1
+        await send({'type': 'move', 'session': session.id, 'cell': [i, j], 'think_ms': round(think_ms, 1),
+                    'queue_ms': round((started - queued) * 1000, 1), 'stats': stats,
+                    'result': session.result})
+        if session.result:
+            self._close_session(session)
+
+    def _close_session(self, session):
+        if self.sessions.pop(session.id, None) is None:
+            return
+        job = session.job
+        if session.task is not None:
+            session.task.cancel()
+        if job is not None and not job.done():
+            # Dừng lượt đang chạy trong worker; ô cờ chỉ được dùng lại khi worker đã trả về
+            self._flags.buf[session.slot] = 1
+            loop = asyncio.get_running_loop()
+            job.add_done_callback(lambda _: loop.call_soon_threadsafe(self._free_slots.append, session.slot))
+        else:
+            self._free_slots.append(session.slot)
+
+
+async def _serve(**kwargs):
+    server = await EngineServer(**kwargs).start()
+    print(f"Serving on {server.host}:{server.port} with {server.workers} workers", flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="JSON Lines engine server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--move-time', type=int, default=1000, dest='move_time_ms')
+    parser.add_argument('--book', dest='opening_book')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(**vars(args)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+from agent.board import EMPTY, X, opponent_of
+
+
+class ThreatBudgetExceeded(Exception):
+    """Hết ngân sách node của tìm kiếm chuỗi đe dọa"""
+
+
+class ThreatSearch:
+    """
+    Tìm kiếm không gian đe dọa (threat-space search)
+    - VCF (victory by continuous fours): bên tấn công chỉ đi nước tạo 4, bên thủ buộc phải chặn
+    - VCT (victory by continuous threats): thêm các nước tạo 3 mở, bên thủ được chặn hoặc phản công bằng 4
+    Chỉ mở rộng nước ép và nước đáp bắt buộc nên cây rất hẹp, tìm được chuỗi thắng dài hơn
+    độ sâu của minimax. Dựa trên số quân trong từng đoạn mà Board cập nhật sẵn
+    """
+
+    def __init__(self, node_limit=20000, vcf_depth=12, vct_depth=4, budget=None):
+        self.node_limit = node_limit  # Ngân sách node mặc định cho mỗi lần gọi find_*
+        self.vcf_depth = vcf_depth  # Số nước tấn công tối đa của VCF
+        self.vct_depth = vct_depth  # Số nước tấn công tối đa của VCT
+        # Hàm gọi mỗi 64 node (ví dụ kiểm tra giờ/cờ dừng của agent), ném exception để dừng giữa chừng
+        self.budget = budget
+        self.nodes = 0
+        self.total_nodes = 0  # Cộng dồn qua mọi lần gọi (nodes chỉ tính lần gọi gần nhất)
+        self.exhausted = False  # Lần gọi gần nhất dừng vì hết ngân sách node (không kết luận được)
+        self._limit = node_limit
+        self._failed = set()
+
+    def find_win(self, board, attacker, node_limit=None):
+        """
+        Thử VCF trước rồi VCT, trả về chuỗi nước đi (idx) hoặc None
+        Có node_limit thì VCF và VCT dùng chung ngân sách đó
+        """
+        line = self.find_vcf(board, attacker, node_limit)
+        if line:
+            return line
+        if node_limit is not None:
+            node_limit -= self.nodes
+            if node_limit <= 0:
+                return None
+        return self.find_vct(board, attacker, node_limit)
+
+    def find_vcf(self, board, attacker, node_limit=None):
+        """Chuỗi thắng chỉ bằng các nước tạo 4 (nước tấn công và nước chặn xen kẽ) hoặc None"""
+        return self._run(self._vcf, board, attacker, self.vcf_depth, node_limit)
+
+    def find_vct(self, board, attacker, node_limit=None):
+        """Nước đi đầu tiên của chuỗi thắng bằng 4 và 3 mở (list) hoặc None"""
+        return self._run(self._vct, board, attacker, self.vct_depth, node_limit)
+
+    def _run(self, search, board, attacker, depth, node_limit=None):
+        self.nodes = 0
+        self.exhausted = False
+        if board.winner or board.is_full():
+            return None
+        self._limit = self.node_limit if node_limit is None else node_limit
+        self._failed = set()
+        board = board.copy()
+        try:
+            return search(board, attacker, depth)
+        except ThreatBudgetExceeded:
+            self.exhausted = True
+            return None
+
+    def _count_node(self):
+        self.nodes += 1
+        self.total_nodes += 1
+        if self.nodes > self._limit:
+            raise ThreatBudgetExceeded()
+        if self.budget is not None and not self.nodes & 63:
+            self.budget()
+
+    # Các hàm đọc đoạn win_length ô
+    @staticmethod
+    def _code(board, player, count):
+        return count * (board.win_length + 1) if player == X else count
+
+    def _window_empties(self, board, player, count):
+        """Các ô trống trong những đoạn có đúng `count` quân `player` và không có quân đối thủ"""
+        target = self._code(board, player, count)
+        cells = board.cells
+        result = set()
+        for w, code in enumerate(board.window_codes):
+            if code == target:
+                for idx in board.windows[w]:
+                    if cells[idx] == EMPTY:
+                        result.add(idx)
+        return result
+
+    def win_cells(self, board, player):
+        """Ô đi vào là thắng ngay (đoạn đã có win_length - 1 quân)"""
+        return self._window_empties(board, player, board.win_length - 1)
+
+    def four_moves(self, board, player):
+        """Ô đi vào tạo 4 (đe dọa thắng ở nước sau)"""
+        return self._window_empties(board, player, board.win_length - 2)
+
+    def three_moves(self, board, player):
+        """Ô đi vào tạo 3 mở: sau đó một hướng có ít nhất 2 đoạn thiếu 2 quân"""
+        moves = []
+        for idx in self._window_empties(board, player, board.win_length - 3):
+            board.make_move(idx, player)
+            if self._three_defences(board, idx, player):
+                moves.append(idx)
+            board.undo_move()
+        return moves
+
+    def _three_defences(self, board, idx, player):
+        """Các ô chặn được thế 3 mở vừa tạo ở ô idx (rỗng nếu không phải 3 mở)"""
+        target = self._code(board, player, board.win_length - 2)
+        by_direction = {}
+        for w in board._cell_windows[idx]:
+            if board.window_codes[w] == target:
+                window = board.windows[w]
+                by_direction.setdefault(window[1] - window[0], []).append(window)
+        defences = set()
+        for windows in by_direction.values():
+            if len(windows) >= 2:
+                defences.update(i for window in windows for i in window if board.cells[i] == EMPTY)
+        return defences
+
+    def _vcf(self, board, attacker, depth):
+        self._count_node()
+        if self.win_cells(board, attacker):
+            return [min(self.win_cells(board, attacker))]
+        defender = opponent_of(attacker)
+        their_wins = self.win_cells(board, defender)
+        if len(their_wins) > 1 or depth == 0 or board.hash in self._failed:
+            return None
+
+        moves = self.four_moves(board, attacker)
+        if their_wins:
+            # Đối thủ đang có 4: chỉ được chặn, và nước chặn cũng phải tạo 4
+            moves &= their_wins
+        for move in sorted(moves):
+            board.make_move(move, attacker)
+            replies = self.win_cells(board, attacker)
+            if len(replies) >= 2:
+                # 4 mở hoặc hai 4 cùng lúc: không chặn được
+                board.undo_move()
+                return [move]
+            reply = replies.pop()
+            board.make_move(reply, defender)
+            line = None if board.winner else self._vcf(board, attacker, depth - 1)
+            board.undo_move()
+            board.undo_move()
+            if line is not None:
+                return [move, reply] + line
+        self._failed.add(board.hash)
+        return None
+
+    def _vct(self, board, attacker, depth):
+        self._count_node()
+        if self.win_cells(board, attacker):
+            return [min(self.win_cells(board, attacker))]
+        defender = opponent_of(attacker)
+        their_wins = self.win_cells(board, defender)
+        if len(their_wins) > 1 or depth == 0 or (board.hash, attacker) in self._failed:
+            return None
+
+        line = self._vcf(board, attacker, self.vcf_depth)
+        if line is not None:
+            return line
+
+        moves = set(self.four_moves(board, attacker)) | set(self.three_moves(board, attacker))
+        if their_wins:
+            moves &= their_wins
+        for move in sorted(moves):
+            board.make_move(move, attacker)
+            replies = self.win_cells(board, attacker)
+            if len(replies) >= 2:
+                board.undo_move()
+                return [move]
+            if replies:
+                defences = replies
+            else:
+                # Chặn thế 3 hoặc phản công bằng một nước tạo 4
+                defences = self._three_defences(board, move, attacker) | self.four_moves(board, defender)
+            refuted = False
+            for defence in sorted(defences):
+                board.make_move(defence, defender)
+                refuted = bool(board.winner) or self._vct(board, attacker, depth - 1) is None
+                board.undo_move()
+                if refuted:
+                    break
+            board.undo_move()
+            if not refuted:
+                return [move]
+        self._failed.add((board.hash, attacker))
+        return None
@@ -0,0 +1,82 @@
+"""
+Chạy giải đấu giữa 2 agent trên nhiều process
+Mỗi ván có seed riêng và được đổi màu xen kẽ, nên kết quả giống nhau dù chạy bao nhiêu worker
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from agent import create_agent
+from agent.gameSimulator import GameSimulator
+
+
+def make_agent(spec, symbol, seed=None):
+    """
+    Tạo agent từ spec: tên trong agent.AGENTS ('minimax') hoặc (tên, kwargs)
+    RandomAgent nhận seed riêng của ván để kết quả tái lập được
+    """
+    name, kwargs = (spec, {}) if isinstance(spec, str) else spec
+    kwargs = dict(kwargs)
+    if name == 'random':
+        kwargs.setdefault('seed', seed)
+    return create_agent(name, symbol, **kwargs)
+
+
+def play_one(task):
+    """Chơi một ván (chạy trong worker), trả về dict kết quả"""
+    game_num, spec_a, spec_b, a_is_x, seed, rows, opening = task
+    symbol_a, symbol_b = ('x', 'o') if a_is_x else ('o', 'x')
+    agent_a = make_agent(spec_a, symbol_a, seed * 2)
+    agent_b = make_agent(spec_b, symbol_b, seed * 2 + 1)
+    first, second = (agent_a, agent_b) if a_is_x else (agent_b, agent_a)
+    simulator = GameSimulator(rows=rows)
+    winner, moves = simulator.play_game(first, second, opening=opening)
+    if winner == symbol_a:
+        result = 'a'
+    elif winner == symbol_b:
+        result = 'b'
+    else:
+        result = winner  # 'draw', 'invalid', 'timeout'
+    outcome = {'game': game_num, 'a_symbol': symbol_a, 'winner': winner, 'result': result, 'moves': moves}
+    # Thống kê tìm kiếm của bên nào bật collect_stats, theo 'a'/'b'
+    search = {side: simulator.search_stats[symbol].as_dict()
+              for side, symbol in (('a', symbol_a), ('b', symbol_b)) if symbol in simulator.search_stats}
+    if search:
+        outcome['search'] = search
+    return outcome
+
+
+def run_tournament(spec_a, spec_b, num_games, workers=None, seed=0, swap_colours=True, rows=9,
+                   on_result=None):
+    """
+    Chơi `num_games` ván giữa spec_a và spec_b
+    
+    Args:
+        workers: Số process (None: số CPU, 1: chạy ngay trong process hiện tại)
+        seed: Seed gốc, ván thứ k dùng seed + k
+        swap_colours: Ván chẵn A cầm X, ván lẻ A cầm O
+        on_result: Hàm gọi lại với từng kết quả (theo thứ tự ván)
+    
+    Returns:
+        list kết quả theo thứ tự ván
+    """
+    tasks = [(game_num, spec_a, spec_b, not swap_colours or game_num % 2 == 1, seed + game_num, rows, ())
+             for game_num in range(1, num_games + 1)]
+    workers = workers or os.cpu_count() or 1
+    results = []
+    if workers == 1:
+        outcomes = map(play_one, tasks)
+        for result in outcomes:
+            results.append(result)
+            if on_result:
+                on_result(result)
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map giữ nguyên thứ tự ván; chia chunk để giảm chi phí gửi nhận
+        chunksize = max(1, num_games // (workers * 8))
+        for result in pool.map(play_one, tasks, chunksize=chunksize):
+            results.append(result)
+            if on_result:
+                on_result(result)
+    return results
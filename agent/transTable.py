@@ -0,0 +1,195 @@
+from array import array
+import os
+import struct
+import sys
+
+# Loại cận của điểm lưu trong bảng (0 = entry trống)
+EXACT = 1
+LOWER = 2  # Điểm thật >= score (beta cutoff)
+UPPER = 3  # Điểm thật <= score (không vượt được alpha)
+
+BUCKET_SIZE = 4  # Số entry trong một bucket
+ENTRY_BYTES = 16  # Mỗi entry gồm 2 từ 64-bit: (check, data)
+
+_MASK64 = (1 << 64) - 1
+_SCORE_OFFSET = 1 << 31
+_AGE_MASK = 63
+
+# Header file cache: magic, phiên bản định dạng, phiên bản hàm đánh giá, seed Zobrist, số bucket, số entry
+CACHE_MAGIC = b"TTTC"
+CACHE_FORMAT = 1
+_CACHE_HEADER = struct.Struct("<4sHIQQQ")
+
+
+def pack(score, move, depth, flag, age):
+    """Gói một entry vào một số nguyên 64-bit"""
+    return ((int(score) + _SCORE_OFFSET) & 0xFFFFFFFF
+            | ((move + 1 if move is not None else 0) << 32)
+            | (min(depth, 255) << 48)
+            | (flag << 56)
+            | ((age & _AGE_MASK) << 58))
+
+
+def unpack(data):
+    """Tách data 64-bit thành (depth, score, flag, move, age)"""
+    move = (data >> 32) & 0xFFFF
+    return ((data >> 48) & 0xFF,
+            (data & 0xFFFFFFFF) - _SCORE_OFFSET,
+            (data >> 56) & 3,
+            move - 1 if move else None,
+            data >> 58)
+
+
+class TranspositionTable:
+    """
+    Bảng chuyển vị kích thước cố định theo ngân sách bộ nhớ (MB)
+    Lưu trong mảng 64-bit liên tục, chia bucket 4 entry, thay thế ưu tiên entry sâu và mới
+    Mỗi entry lưu check = key ^ data nên đọc/ghi không cần khóa (entry bị ghi dở sẽ bị loại)
+    """
+
+    def __init__(self, size_mb=16, buffer=None):
+        if buffer is not None:
+            # Dùng vùng nhớ có sẵn (ví dụ shared memory), kích thước suy ra từ buffer
+            self.table = memoryview(buffer).cast('Q')
+        else:
+            num_entries = max(BUCKET_SIZE, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+            self.table = array('Q', bytes(num_entries // BUCKET_SIZE * BUCKET_SIZE * ENTRY_BYTES))
+        self.num_buckets = len(self.table) // (2 * BUCKET_SIZE)
+        self.age = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    @property
+    def size_mb(self):
+        return len(self.table) * 8 / (1024 * 1024)
+
+    def new_search(self):
+        """Gọi đầu mỗi lượt tìm kiếm: entry cũ vẫn giữ nhưng dễ bị thay thế hơn"""
+        self.age = (self.age + 1) & _AGE_MASK
+
+    def clear(self):
+        self.table[:] = array('Q', bytes(len(self.table) * 8))
+        self.age = 0
+
+    def release(self):
+        """Nhả view tới buffer ngoài (cần trước khi đóng shared memory)"""
+        if isinstance(self.table, memoryview):
+            self.table.release()
+
+    def _bucket(self, key):
+        return (key % self.num_buckets) * BUCKET_SIZE * 2
+
+    def probe(self, key, lock=None):
+        """
+        Tìm entry của thế cờ `key`
+        `lock` là key kiểm tra riêng (mặc định dùng chính key)
+        Trả về (depth, score, flag, move) hoặc None
+        """
+        self.probes += 1
+        check = key if lock is None else lock
+        table = self.table
+        base = self._bucket(key)
+        for slot in range(base, base + BUCKET_SIZE * 2, 2):
+            data = table[slot + 1]
+            if data and table[slot] ^ data == check:
+                self.hits += 1
+                depth, score, flag, move, _ = unpack(data)
+                return depth, score, flag, move
+        return None
+
+    def store(self, key, depth, score, flag, move=None, lock=None):
+        """Ghi entry, chọn chỗ theo: cùng key > ô trống > entry nông/cũ nhất"""
+        self.stores += 1
+        check = key if lock is None else lock
+        table = self.table
+        base = self._bucket(key)
+        victim = None
+        victim_value = None
+        for slot in range(base, base + BUCKET_SIZE * 2, 2):
+            data = table[slot + 1]
+            if not data:
+                victim = slot
+                break
+            old_depth, _, _, old_move, old_age = unpack(data)
+            if table[slot] ^ data == check:
+                # Cùng thế cờ: giữ entry sâu hơn của lượt hiện tại, nhưng vẫn giữ nước đi tốt nhất
+                if old_depth > depth and old_age == self.age:
+                    return
+                if move is None:
+                    move = old_move
+                victim = slot
+                break
+            value = old_depth - 2 * ((self.age - old_age) & _AGE_MASK)
+            if victim is None or value < victim_value:
+                victim = slot
+                victim_value = value
+        data = pack(score, move, depth, flag, self.age)
+        table[victim] = (check ^ data) & _MASK64
+        table[victim + 1] = data
+
+    def hashfull(self, sample=1000):
+        """Tỉ lệ (phần nghìn) entry đang dùng, ước lượng trên `sample` entry đầu"""
+        count = min(sample, len(self.table) // 2)
+        used = sum(1 for i in range(count) if self.table[2 * i + 1])
+        return used * 1000 // max(count, 1)
+
+    def save(self, path, eval_version, seed, min_depth=2):
+        """
+        Ghi các entry có depth >= min_depth ra file nhị phân (chỉ số slot, check, data)
+        Trả về số entry đã ghi
+        """
+        table = self.table
+        records = array('Q')
+        for slot in range(0, len(table), 2):
+            data = table[slot + 1]
+            if data and (data >> 48) & 0xFF >= min_depth:
+                records.extend((slot, table[slot], data))
+        if sys.byteorder != 'little':
+            records.byteswap()
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(_CACHE_HEADER.pack(CACHE_MAGIC, CACHE_FORMAT, eval_version, seed,
+                                       self.num_buckets, len(records) // 3))
+            records.tofile(f)
+        # Đổi tên sau khi ghi xong để process khác không đọc phải file dở
+        os.replace(tmp_path, path)
+        return len(records) // 3
+
+    def load(self, path, eval_version, seed):
+        """
+        Nạp lại entry từ file của save(); entry được gán tuổi hiện tại
+        File sai định dạng, khác phiên bản đánh giá/seed hoặc khác kích thước bảng -> ValueError
+        """
+        with open(path, 'rb') as f:
+            header = f.read(_CACHE_HEADER.size)
+            if len(header) != _CACHE_HEADER.size:
+                raise ValueError(f"{path}: not a transposition cache")
+            magic, fmt, version, cache_seed, num_buckets, count = _CACHE_HEADER.unpack(header)
+            if magic != CACHE_MAGIC or fmt != CACHE_FORMAT:
+                raise ValueError(f"{path}: not a transposition cache")
+            if version != eval_version or cache_seed != seed:
+                raise ValueError(f"{path}: stale cache (eval version {version}, expected {eval_version})")
+            if num_buckets != self.num_buckets:
+                raise ValueError(f"{path}: cache has {num_buckets} buckets, table has {self.num_buckets}")
+            # File bị cắt giữa chừng (ghi dở, đĩa đầy, chép thiếu) cũng là file sai định dạng
+            if os.fstat(f.fileno()).st_size - f.tell() != count * 3 * 8:
+                raise ValueError(f"{path}: truncated cache")
+            records = array('Q')
+            records.fromfile(f, count * 3)
+        if sys.byteorder != 'little':
+            records.byteswap()
+        table = self.table
+        age_bits = (self.age & _AGE_MASK) << 58
+        clear_age = ~(_AGE_MASK << 58) & _MASK64
+        for k in range(0, len(records), 3):
+            slot, check, data = records[k], records[k + 1], records[k + 2]
+            new_data = (data & clear_age) | age_bits
+            # check = lock ^ data, đổi data thì đổi check tương ứng
+            table[slot] = check ^ data ^ new_data
+            table[slot + 1] = new_data
+        return count
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
@@ -0,0 +1,186 @@
+"""
+Chạy engine không cần pygame: chơi trên terminal, đấu agent với agent và phân tích thế cờ
+    python headless.py play --x human --o minimax
+    python headless.py match minimax random --games 20
+    python headless.py analyse --moves 4,4 4,5 3,3 --depth 4 [--profile cprofile|sample]
+    python headless.py protocol        (giao thức Gomocup qua stdin/stdout)
+    python headless.py startup
+Chỉ import những gì lệnh cần; agent được nạp qua registry agent.AGENTS
+"""
+
+import os
+import sys
+import time
+
+from agent import create_agent
+from agent.board import Board, PLAYERS, SYMBOLS
+
+# Thời gian khởi động tối đa (ms) của một process engine: import + nạp MinimaxAgent
+STARTUP_TARGET_MS = 250
+
+
+def parse_cell(text):
+    """'4,5' -> (4, 5)"""
+    i, j = text.split(',')
+    return int(i), int(j)
+
+
+def board_from_moves(moves, size=9):
+    board = Board(size)
+    for i, j in moves:
+        board.make_move(board.index(i, j))
+    return board
+
+
+def format_board(board):
+    lines = ['   ' + ' '.join(str(j) for j in range(board.size))]
+    for i in range(board.size):
+        row = (SYMBOLS[board.cells[board.index(i, j)]] or '.' for j in range(board.size))
+        lines.append(f'{i:2} ' + ' '.join(row))
+    return '\n'.join(lines)
+
+
+def _ask_human(board):
+    while True:
+        try:
+            i, j = parse_cell(input(f"{SYMBOLS[board.to_move].upper()} move (i,j): "))
+        except ValueError:
+            continue
+        if 0 <= i < board.size and 0 <= j < board.size and board.is_empty(i, j):
+            return i, j
+
+
+def play(x_name='human', o_name='minimax', size=9, depth=3, out=sys.stdout):
+    """Một ván trên terminal; 'human' nhập nước đi từ stdin. Trả về 'x', 'o' hoặc 'draw'"""
+    board = Board(size)
+    players = {}
+    for symbol, name in (('x', x_name), ('o', o_name)):
+        kwargs = {'max_depth': depth} if name == 'minimax' else {}
+        players[symbol] = None if name == 'human' else create_agent(name, symbol, **kwargs)
+    while not board.game_over:
+        symbol = SYMBOLS[board.to_move]
+        agent = players[symbol]
+        i, j = _ask_human(board) if agent is None else agent.get_move(board)
+        board.make_move(board.index(i, j), PLAYERS[symbol])
+        print(f"{symbol.upper()} -> ({i},{j})\n{format_board(board)}", file=out)
+    result = SYMBOLS[board.winner] or 'draw'
+    print(f"Result: {result}", file=out)
+    return result
+
+
+def match(name_a, name_b, games=10, workers=None, seed=0, depth=3, out=sys.stdout):
+    """Đấu nhiều ván (song song, đổi màu xen kẽ), trả về dict số ván thắng/hòa"""
+    from agent.tournament import run_tournament
+
+    def spec(name):
+        return (name, {'max_depth': depth}) if name == 'minimax' else name
+
+    results = run_tournament(spec(name_a), spec(name_b), games, workers=workers, seed=seed)
+    summary = {name_a + ' (a)': 0, name_b + ' (b)': 0, 'draw': 0, 'other': 0}
+    for game in results:
+        key = {'a': name_a + ' (a)', 'b': name_b + ' (b)', 'draw': 'draw'}.get(game['result'], 'other')
+        summary[key] += 1
+    print(' | '.join(f"{key}: {value}" for key, value in summary.items()), file=out)
+    return summary
+
+
+def analyse(moves, size=9, depth=4, time_limit_ms=None, profile=None, out=sys.stdout):
+    """
+    Tìm nước tốt nhất cho bên đang tới lượt, in tiến trình từng độ sâu, kết quả, thống kê tìm kiếm
+    và (tùy chọn) profile của lượt tìm kiếm: 'cprofile' hoặc 'sample'
+    """
+    board = board_from_moves(moves, size)
+
+    def progress(info):
+        pv = ' '.join('{},{}'.format(*cell) for cell in info['pv'])
+        print(f"info depth {info['depth']} score {info['score']} nodes {info['nodes']} "
+              f"time {info['time_ms']:.0f}ms pv {pv}", file=out)
+
+    agent = create_agent('minimax', SYMBOLS[board.to_move], max_depth=depth, time_limit_ms=time_limit_ms,
+                         collect_stats=True, on_progress=progress)
+    start = time.perf_counter()
+    if profile:
+        from agent.searchStats import profile_move
+        move, report = profile_move(agent, board, profile)
+    else:
+        move = agent.get_move(board)
+    elapsed = time.perf_counter() - start
+    pv = ' '.join('{},{}'.format(*board.coords(idx)) for idx in agent.pv)
+    print(f"bestmove {move[0]},{move[1]} score {agent.best_score} depth {agent.completed_depth} "
+          f"nodes {agent.nodes} time {elapsed * 1000:.0f}ms pv {pv}", file=out)
+    stats = agent.search_stats.as_dict()
+    print(f"stats qnodes {stats['qnodes']} tt_hit {stats['tt_hit_rate']:.3f} ebf {stats['ebf']} "
+          f"seldepth {stats['seldepth']} cutoffs {stats['cutoffs'][:5]} "
+          f"phase_ms {' '.join(f'{k}={v:.0f}' for k, v in stats['phase_ms'].items())}", file=out)
+    if profile == 'cprofile':
+        report.stream = out
+        report.sort_stats('tottime').print_stats(15)
+    elif profile == 'sample':
+        print(report.report(), file=out)
+    return move
+
+
+def measure_startup(runs=5):
+    """Thời gian (ms, nhỏ nhất trong `runs` lần) để một process mới import và tạo MinimaxAgent"""
+    import subprocess
+
+    code = "import headless; headless.create_agent('minimax', 'x')"
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=cwd, check=True)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Tic-tac-toe 9x9 engine without the GUI")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    play_parser = commands.add_parser('play', help="play one game in the terminal")
+    play_parser.add_argument('--x', default='human')
+    play_parser.add_argument('--o', default='minimax')
+    play_parser.add_argument('--depth', type=int, default=3)
+
+    match_parser = commands.add_parser('match', help="agent vs agent over many games")
+    match_parser.add_argument('agent_a')
+    match_parser.add_argument('agent_b')
+    match_parser.add_argument('--games', type=int, default=10)
+    match_parser.add_argument('--workers', type=int)
+    match_parser.add_argument('--seed', type=int, default=0)
+    match_parser.add_argument('--depth', type=int, default=3)
+
+    analyse_parser = commands.add_parser('analyse', help="search one position")
+    analyse_parser.add_argument('--moves', nargs='*', default=[], type=parse_cell, help="moves as i,j")
+    analyse_parser.add_argument('--depth', type=int, default=4)
+    analyse_parser.add_argument('--time', type=int, dest='time_limit_ms')
+    analyse_parser.add_argument('--profile', choices=('cprofile', 'sample'))
+
+    protocol_parser = commands.add_parser('protocol', help="Gomocup-style engine protocol on stdin/stdout")
+    protocol_parser.add_argument('--tt-size', type=float, default=16, dest='tt_size_mb')
+
+    commands.add_parser('startup', help=f"check process start-up time (target {STARTUP_TARGET_MS} ms)")
+
+    args = parser.parse_args(argv)
+    if args.command == 'play':
+        play(args.x, args.o, depth=args.depth)
+    elif args.command == 'match':
+        match(args.agent_a, args.agent_b, args.games, args.workers, args.seed, args.depth)
+    elif args.command == 'analyse':
+        analyse(args.moves, depth=args.depth, time_limit_ms=args.time_limit_ms, profile=args.profile)
+    elif args.command == 'protocol':
+        from agent.protocol import main as protocol_main
+        protocol_main(tt_size_mb=args.tt_size_mb)
+    elif args.command == 'startup':
+        elapsed = measure_startup()
+        print(f"start-up {elapsed:.0f} ms (target {STARTUP_TARGET_MS} ms)")
+        return 0 if elapsed <= STARTUP_TARGET_MS else 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,17 +1,16 @@
 import pygame
 import math
-from agent.minimaxAgt import MinimaxAgent
-from agent.randomAgt import RandomAgent
-import datetime
-
-pygame.init()
+from agent import create_agent
+from agent.board import Board, PLAYERS, SYMBOLS, X, O
+from agent.ponder import Ponderer
+from agent.aiWorker import MoveWorker
+from agent.gameLogger import GameLogger, engine_stats, new_game_id
 
 # Screen
 WIDTH = 540
 ROWS = 9
 MENU_HEIGHT = 80
-win = pygame.display.set_mode((WIDTH, WIDTH + MENU_HEIGHT))
-pygame.display.set_caption("TicTacToe 9x9")
+win = None  # Cửa sổ, tạo trong init_display()
 
 # Colors
 WHITE = (255, 255, 255)
@@ -22,16 +21,12 @@ BLUE = (0, 0, 255)
 GREEN = (0, 200, 0)
 LIGHT_BLUE = (173, 216, 230)
 DARK_GRAY = (100, 100, 100)
+HIGHLIGHT = (255, 180, 180)
 
-# Images
-# Images
-X_IMAGE = pygame.transform.scale(pygame.image.load("images/x.png"), (36, 36))
-O_IMAGE = pygame.transform.scale(pygame.image.load("images/o.png"), (36, 36))
-
-# Fonts
-END_FONT = pygame.font.SysFont('arial', 24)
-MENU_FONT = pygame.font.SysFont('arial', 18)
-INFO_FONT = pygame.font.SysFont('arial', 14)
+# Ảnh, font và các lớp nền được nạp trong init_display(), import main.py không mở cửa sổ
+PIECE_IMAGES = {}
+END_FONT = MENU_FONT = INFO_FONT = None
+MENU_LAYER = MENU_BUTTONS = BOARD_LAYER = None
 
 # Game states
 STATE_MENU = "menu"
@@ -42,6 +37,26 @@ STATE_GAME_OVER = "game_over"
 current_state = STATE_MENU
 selected_opponent = None
 current_step = 0
+ponderer = None  # Tìm kiếm nền trong lúc người chơi suy nghĩ (chỉ với Minimax)
+ai_worker = None  # Tính nước đi của AI trên thread nền
+game_logger = None  # Log JSON Lines ghi nền theo lô
+game_id = None
+FPS = 30
+
+# Render: chỉ vẽ lại phần thay đổi rồi update đúng các vùng đó
+STATUS_RECT = pygame.Rect(0, WIDTH, WIDTH, MENU_HEIGHT)
+dirty_rects = []
+_status_key = None  # Nội dung thanh trạng thái đã vẽ gần nhất
+_text_cache = {}
+
+
+def render_text(font, content, color):
+    """Surface chữ đã render, cache theo (font, nội dung, màu)"""
+    key = (id(font), content, color)
+    surface = _text_cache.get(key)
+    if surface is None:
+        surface = _text_cache[key] = font.render(content, True, color)
+    return surface
 
 
 class Button:
@@ -56,8 +71,8 @@ class Button:
         color = self.color if not self.hover else tuple(min(c + 30, 255) for c in self.color)
         pygame.draw.rect(surface, color, self.rect, border_radius=10)
         pygame.draw.rect(surface, BLACK, self.rect, 2, border_radius=10)
-        
-        text_surface = MENU_FONT.render(self.text, True, self.text_color)
+
+        text_surface = render_text(MENU_FONT, self.text, self.text_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         surface.blit(text_surface, text_rect)
 
@@ -65,239 +80,245 @@ class Button:
         return self.rect.collidepoint(pos)
 
     def check_hover(self, pos):
-        self.hover = self.rect.collidepoint(pos)
+        """Cập nhật trạng thái hover, trả về True nếu có thay đổi (cần vẽ lại)"""
+        hover = self.rect.collidepoint(pos)
+        changed = hover != self.hover
+        self.hover = hover
+        return changed
 
 
-def draw_menu():
-    """Vẽ menu chọn đối thủ"""
-    win.fill(WHITE)
-    
+def build_menu():
+    """Tạo nền menu (tiêu đề) và các nút một lần"""
+    layer = pygame.Surface(win.get_size())
+    layer.fill(WHITE)
+
     # Title
     title_text = END_FONT.render("TIC-TAC-TOE 9x9", True, BLACK)
-    win.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, 50))
-    
+    layer.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, 50))
+
     subtitle_text = MENU_FONT.render("Choose Your Opponent", True, DARK_GRAY)
-    win.blit(subtitle_text, (WIDTH // 2 - subtitle_text.get_width() // 2, 120))
-    
+    layer.blit(subtitle_text, (WIDTH // 2 - subtitle_text.get_width() // 2, 120))
+
     # Buttons (smaller layout for reduced window)
     button_width = 160
     button_height = 48
     button_spacing = 64
     start_y = 160
-    
+
     buttons = {
-        'random': Button(WIDTH // 2 - button_width // 2, start_y, 
+        'random': Button(WIDTH // 2 - button_width // 2, start_y,
                         button_width, button_height, "Random Agent", BLUE),
-        'minimax': Button(WIDTH // 2 - button_width // 2, start_y + button_spacing, 
+        'minimax': Button(WIDTH // 2 - button_width // 2, start_y + button_spacing,
                          button_width, button_height, "Minimax Agent", RED),
-        'ml': Button(WIDTH // 2 - button_width // 2, start_y + button_spacing * 2, 
+        'ml': Button(WIDTH // 2 - button_width // 2, start_y + button_spacing * 2,
                     button_width, button_height, "ML Agent (Coming)", DARK_GRAY)
     }
-    
-    for i, (key, button) in enumerate(buttons.items()):
+    return layer, buttons
+
+
+def draw_menu():
+    """Vẽ menu chọn đối thủ từ nền đã dựng sẵn"""
+    win.blit(MENU_LAYER, (0, 0))
+    for button in MENU_BUTTONS.values():
         button.draw(win)
-    
-    pygame.display.update()
-    return buttons
+    dirty_rects.append(win.get_rect())
 
 
-def draw_grid():
+def draw_grid(surface):
     gap = WIDTH // ROWS
-    x = 0
-    y = 0
 
     for i in range(ROWS):
         x = i * gap
-        pygame.draw.line(win, GRAY, (x, 0), (x, WIDTH), 2)
-        pygame.draw.line(win, GRAY, (0, x), (WIDTH, x), 2)
+        pygame.draw.line(surface, GRAY, (x, 0), (x, WIDTH), 2)
+        pygame.draw.line(surface, GRAY, (0, x), (WIDTH, x), 2)
+
+
+def build_board_layer():
+    """Nền bàn cờ (màu nền + lưới) vẽ một lần, các frame sau chỉ blit lại"""
+    layer = pygame.Surface((WIDTH, WIDTH))
+    layer.fill(WHITE)
+    draw_grid(layer)
+    return layer
+
+
+def init_display():
+    """Khởi tạo pygame, mở cửa sổ và nạp ảnh/font/lớp nền (một lần, khi bắt đầu chạy GUI)"""
+    global win, END_FONT, MENU_FONT, INFO_FONT, MENU_LAYER, MENU_BUTTONS, BOARD_LAYER
+    if win is not None:
+        return
+    pygame.init()
+    win = pygame.display.set_mode((WIDTH, WIDTH + MENU_HEIGHT))
+    pygame.display.set_caption("TicTacToe 9x9")
+
+    # Images
+    PIECE_IMAGES[X] = pygame.transform.scale(pygame.image.load("images/x.png"), (36, 36))
+    PIECE_IMAGES[O] = pygame.transform.scale(pygame.image.load("images/o.png"), (36, 36))
+
+    # Fonts
+    END_FONT = pygame.font.SysFont('arial', 24)
+    MENU_FONT = pygame.font.SysFont('arial', 18)
+    INFO_FONT = pygame.font.SysFont('arial', 14)
+
+    MENU_LAYER, MENU_BUTTONS = build_menu()
+    BOARD_LAYER = build_board_layer()
+
+
+def draw_status_bar(board, force=False):
+    """Vẽ thanh trạng thái hiển thị thông tin game, chỉ khi nội dung thay đổi"""
+    global _status_key
+    # Current turn, kèm thời gian AI đã nghĩ
+    turn_label = 'X (You)' if x_turn else 'O (AI)'
+    if ai_worker and ai_worker.thinking:
+        turn_label = f"O (AI) thinking... {ai_worker.elapsed:.1f}s"
+    key = (current_step, turn_label, selected_opponent, restart_button.hover, len(board.moves))
+    if key == _status_key and not force:
+        return
+    _status_key = key
 
-
-def draw_status_bar(game_array):
-    """Vẽ thanh trạng thái hiển thị thông tin game"""
     status_y = WIDTH
-    pygame.draw.rect(win, LIGHT_BLUE, (0, status_y, WIDTH, MENU_HEIGHT))
+    pygame.draw.rect(win, LIGHT_BLUE, STATUS_RECT)
     pygame.draw.line(win, BLACK, (0, status_y), (WIDTH, status_y), 2)
-    
+
     # Current step
-    step_text = INFO_FONT.render(f"Step: {current_step}", True, BLACK)
+    step_text = render_text(INFO_FONT, f"Step: {current_step}", BLACK)
     win.blit(step_text, (20, status_y + 15))
-    
-    # Current turn
-    turn_text = INFO_FONT.render(f"Turn: {'X (You)' if x_turn else 'O (AI)'}", 
-                                 True, BLACK)
+
+    # Thời gian nghĩ đổi liên tục nên không đưa vào cache chữ
+    turn_text = INFO_FONT.render(f"Turn: {turn_label}", True, BLACK)
     win.blit(turn_text, (20, status_y + 45))
-    
+
     # Opponent type
     opponent_name = {
         'random': 'Random Agent',
         'minimax': 'Minimax Agent',
         'ml': 'ML Agent'
     }.get(selected_opponent, 'Unknown')
-    
-    opponent_text = INFO_FONT.render(f"Opponent: {opponent_name}", True, BLACK)
+
+    opponent_text = render_text(INFO_FONT, f"Opponent: {opponent_name}", BLACK)
     win.blit(opponent_text, (250, status_y + 15))
-    
+
     # Restart button
     restart_button.draw(win)
-    
+
     # Stats
-    filled_cells = sum(1 for row in game_array for cell in row if cell[2] != "")
-    stats_text = INFO_FONT.render(f"Moves: {filled_cells}/81", True, BLACK)
+    filled_cells = len(board.moves)
+    stats_text = render_text(INFO_FONT, f"Moves: {filled_cells}/81", BLACK)
     win.blit(stats_text, (250, status_y + 45))
+    dirty_rects.append(STATUS_RECT)
 
 
 def initialize_grid():
+    return Board(ROWS)
+
+
+def cell_center(i, j):
+    """Tính tọa độ trung tâm của ô (i, j)"""
     gap = WIDTH // ROWS  # Kích thước mỗi ô
-    game_array = [[None] * ROWS for _ in range(ROWS)]
+    return j * gap + gap // 2, i * gap + gap // 2
+
+
+def cell_rect(i, j):
+    gap = WIDTH // ROWS
+    return pygame.Rect(j * gap, i * gap, gap, gap)
 
-    for i in range(ROWS):
-        for j in range(ROWS):
-            # Tính tọa độ trung tâm của mỗi ô
-            x = j * gap + gap // 2
-            y = i * gap + gap // 2
-            game_array[i][j] = (x, y, "", True)
 
-    return game_array
+def draw_cell(board, i, j, highlight=False):
+    """Vẽ lại một ô: nền lưới, ô tô sáng (nếu có) và quân cờ, đánh dấu vùng cần update"""
+    rect = cell_rect(i, j)
+    # Lấy rộng thêm 1px để phủ cả đường lưới 2px nằm giữa 2 ô
+    area = rect.inflate(2, 2).clip(BOARD_LAYER.get_rect())
+    win.blit(BOARD_LAYER, area.topleft, area)
+    if highlight:
+        gap = WIDTH // ROWS
+        pad = max(4, gap // 12)
+        pygame.draw.rect(win, HIGHLIGHT, rect.inflate(-2 * pad, -2 * pad), border_radius=6)
+    image = PIECE_IMAGES.get(board.cells[board.index(i, j)])
+    if image is not None:
+        x, y = cell_center(i, j)
+        win.blit(image, (x - image.get_width() // 2, y - image.get_height() // 2))
+    dirty_rects.append(area)
+
 
+def make_move(board, i, j, symbol):
+    global x_turn, o_turn, current_step
 
-def make_move(game_array, i, j, symbol):
-    global x_turn, o_turn, images, current_step
-    x, y, _, _ = game_array[i][j]
-    
     if symbol == 'x':
-        images.append((x, y, X_IMAGE))
         x_turn = False
         o_turn = True
     else:
-        images.append((x, y, O_IMAGE))
         x_turn = True
         o_turn = False
-    
-    game_array[i][j] = (x, y, symbol, False)
+
+    board.make_move(board.index(i, j), PLAYERS[symbol])
     current_step += 1
-    
-    # Log the move
-    try:
-        with open('game_log.txt', 'a', encoding='utf-8') as f:
-            f.write(f"{datetime.datetime.now().isoformat()} - Step {current_step} - {symbol.upper()} -> ({i},{j})\n")
-    except Exception:
-        pass
-    
-    try:
-        print(f"Step {current_step}: {symbol.upper()} -> ({i},{j})")
-    except Exception:
-        pass
+    draw_cell(board, i, j)
 
+    # Log the move (chỉ đưa vào hàng đợi, thread nền ghi file)
+    if symbol == 'o':
+        game_logger.log_move(game_id, current_step, symbol, (i, j),
+                             think_ms=ai_worker.last_think_ms, stats=engine_stats(ai_agent))
+    else:
+        game_logger.log_move(game_id, current_step, symbol, (i, j))
 
-def click(game_array):
-    global x_turn, o_turn, images, ai_agent
 
+def click(board, pos):
+    """Xử lý click của người chơi, trả về True nếu đã đi một nước"""
     if x_turn:  # Human's turn (X)
-        m_x, m_y = pygame.mouse.get_pos()
-        
+        m_x, m_y = pos
+
         # Check if click is on game board (not status bar)
         if m_y >= WIDTH:
-            return
+            return False
 
-        for i in range(len(game_array)):
-            for j in range(len(game_array[i])):
-                x, y, char, can_play = game_array[i][j]
+        for i in range(board.size):
+            for j in range(board.size):
+                x, y = cell_center(i, j)
                 dis = math.sqrt((x - m_x) ** 2 + (y - m_y) ** 2)
 
-                if dis < WIDTH // ROWS // 2 and can_play:
-                    make_move(game_array, i, j, 'x')
-                    render(game_array)
-                    pygame.display.update()
-                    
-                    if not has_won(game_array) and not has_drawn(game_array):
-                        pygame.time.delay(500)
-                        
-                        # Make AI move
-                        ai_move = ai_agent.get_move(game_array)
-                        if ai_move:
-                            make_move(game_array, ai_move[0], ai_move[1], 'o')
-                            render(game_array)
-                            pygame.display.update()
-                    return
-
-
-def has_won(game_array):
-    def check_sequence(chars):
-        if len(chars) < 5:
-            return None
-        for idx in range(len(chars) - 4):
-            if chars[idx] == chars[idx+1] == chars[idx+2] == chars[idx+3] == chars[idx+4] and chars[idx] != "":
-                return (chars[idx], idx)
-        return None
-
-    def highlight_win_cells(centers):
-        win.fill(WHITE)
-        draw_grid()
-        gap = WIDTH // ROWS
-        pad = max(4, gap // 12)
-        highlight_color = (255, 180, 180)
-
-        for (cx, cy) in centers:
-            rect = pygame.Rect(cx - gap // 2 + pad, cy - gap // 2 + pad, gap - 2 * pad, gap - 2 * pad)
-            pygame.draw.rect(win, highlight_color, rect, border_radius=6)
-
-        for image in images:
-            ix, iy, IMAGE = image
-            win.blit(IMAGE, (ix - IMAGE.get_width() // 2, iy - IMAGE.get_height() // 2))
-        
-        draw_status_bar(game_array)
-        pygame.display.update()
-        pygame.time.delay(800)
-
-    # Checking rows
-    for row in range(len(game_array)):
-        chars = [game_array[row][j][2] for j in range(len(game_array[row]))]
-        res = check_sequence(chars)
-        if res:
-            winner, start = res
-            centers = [(game_array[row][j][0], game_array[row][j][1]) for j in range(start, start+5)]
-            highlight_win_cells(centers)
-            display_message(winner.upper() + " has won!")
-            return True
-
-    # Checking columns
-    for col in range(len(game_array[0])):
-        chars = [game_array[i][col][2] for i in range(len(game_array))]
-        res = check_sequence(chars)
-        if res:
-            winner, start = res
-            centers = [(game_array[i][col][0], game_array[i][col][1]) for i in range(start, start+5)]
-            highlight_win_cells(centers)
-            display_message(winner.upper() + " has won!")
-            return True
-
-    # Checking diagonals
-    n = len(game_array)
-    for i in range(n - 4):
-        for j in range(n - 4):
-            if (game_array[i][j][2] == game_array[i+1][j+1][2] == 
-                game_array[i+2][j+2][2] == game_array[i+3][j+3][2] == game_array[i+4][j+4][2]) and game_array[i][j][2] != "":
-                centers = [(game_array[i+k][j+k][0], game_array[i+k][j+k][1]) for k in range(5)]
-                highlight_win_cells(centers)
-                display_message(game_array[i][j][2].upper() + " has won!")
-                return True
-
-            if (game_array[i][j+4][2] == game_array[i+1][j+3][2] == 
-                game_array[i+2][j+2][2] == game_array[i+3][j+1][2] == game_array[i+4][j][2]) and game_array[i][j+4][2] != "":
-                centers = [(game_array[i+k][j+4-k][0], game_array[i+k][j+4-k][1]) for k in range(5)]
-                highlight_win_cells(centers)
-                display_message(game_array[i][j+4][2].upper() + " has won!")
-                return True
+                if dis < WIDTH // ROWS // 2 and board.is_empty(i, j):
+                    make_move(board, i, j, 'x')
 
+                    # AI tính nước đi trên thread nền, vòng lặp chính nhận kết quả qua poll_ai_move
+                    if not board.game_over:
+                        ai_worker.request(board)
+                    return True
     return False
 
 
-def has_drawn(game_array):
-    for i in range(len(game_array)):
-        for j in range(len(game_array[i])):
-            if game_array[i][j][2] == "":
-                return False
+def poll_ai_move(board):
+    """Đi nước của AI nếu thread nền đã tính xong, trả về True nếu đã đi"""
+    ai_move = ai_worker.poll() if ai_worker else None
+    if ai_move:
+        make_move(board, ai_move[0], ai_move[1], 'o')
+        # Suy nghĩ tiếp trong thời gian của người chơi
+        if ponderer:
+            ponderer.start(board)
+        return True
+    return False
+
+
+def has_won(board):
+    # Board chỉ kiểm tra 4 đường đi qua nước vừa đánh
+    if not board.winner:
+        return False
+
+    # Tô sáng các ô của đường thắng
+    for (i, j) in board.winning_line():
+        draw_cell(board, i, j, highlight=True)
+    draw_status_bar(board)
+    flush()
+    pygame.time.delay(800)
 
+    game_logger.log_result(game_id, SYMBOLS[board.winner], len(board.moves))
+    display_message(SYMBOLS[board.winner].upper() + " has won!")
+    return True
+
+
+def has_drawn(board):
+    if not board.is_full():
+        return False
+
+    game_logger.log_result(game_id, 'draw', len(board.moves))
     display_message("It's a draw!")
     return True
 
@@ -308,96 +329,126 @@ def display_message(content):
         print(content)
     except Exception:
         pass
-    
-    pygame.time.delay(500)
-    
+
     # Draw semi-transparent overlay
-    overlay = pygame.Surface((WIDTH, WIDTH + MENU_HEIGHT))
+    overlay = pygame.Surface((WIDTH, WIDTH))
     overlay.set_alpha(200)
     overlay.fill(WHITE)
     win.blit(overlay, (0, 0))
-    
+
     # Draw message
-    end_text = END_FONT.render(content, 1, BLACK)
+    end_text = render_text(END_FONT, content, BLACK)
     win.blit(end_text, ((WIDTH - end_text.get_width()) // 2, (WIDTH - end_text.get_height()) // 2 - 50))
-    
+
     # Draw restart button
-    restart_msg = MENU_FONT.render("Click 'Restart' to play again", 1, DARK_GRAY)
+    restart_msg = render_text(MENU_FONT, "Click 'Restart' to play again", DARK_GRAY)
     win.blit(restart_msg, ((WIDTH - restart_msg.get_width()) // 2, (WIDTH - restart_msg.get_height()) // 2 + 20))
-    
-    pygame.display.update()
+
+    dirty_rects.append(pygame.Rect(0, 0, WIDTH, WIDTH))
     current_state = STATE_GAME_OVER
 
 
-def render(game_array):
-    win.fill(WHITE)
-    draw_grid()
+def render(board):
+    """Vẽ lại toàn bộ bàn cờ (khi vào ván mới)"""
+    win.blit(BOARD_LAYER, (0, 0))
+
+    for idx, _ in board.moves:
+        image = PIECE_IMAGES[board.cells[idx]]
+        x, y = cell_center(*board.coords(idx))
+        win.blit(image, (x - image.get_width() // 2, y - image.get_height() // 2))
 
-    for image in images:
-        x, y, IMAGE = image
-        win.blit(IMAGE, (x - IMAGE.get_width() // 2, y - IMAGE.get_height() // 2))
+    draw_status_bar(board, force=True)
+    dirty_rects.append(win.get_rect())
 
-    draw_status_bar(game_array)
-    pygame.display.update()
+
+def flush():
+    """Đưa các vùng đã vẽ lại lên màn hình"""
+    if dirty_rects:
+        pygame.display.update(dirty_rects)
+        dirty_rects.clear()
 
 
 def reset_game():
-    global images, x_turn, o_turn, current_state, current_step
-    images = []
+    global x_turn, o_turn, current_state, current_step, ponderer, ai_worker
+    # Hủy lượt AI đang tính (nếu có) và tìm kiếm nền
+    if ai_worker:
+        ai_worker.cancel()
+        ai_worker = None
+    if ponderer:
+        ponderer.stop()
+        ponderer = None
     x_turn = True
     o_turn = False
     current_step = 0
     current_state = STATE_MENU
+    draw_menu()
+
+
+def check_game_end(board):
+    """Chỉ gọi sau mỗi nước đi"""
+    global current_state
+    if has_won(board) or has_drawn(board):
+        current_state = STATE_GAME_OVER
 
 
 def main():
-    global x_turn, o_turn, images, draw, ai_agent, selected_opponent, current_state, restart_button, current_step
+    global x_turn, o_turn, draw, ai_agent, selected_opponent, current_state, restart_button, current_step, ponderer, ai_worker, game_logger, game_id
 
-    images = []
+    init_display()
     draw = False
     run = True
     x_turn = True
     o_turn = False
     current_step = 0
-    
+
     # Create restart button (will be positioned in status bar)
     # adjust restart button to fit smaller status bar
     restart_button = Button(WIDTH - 130, WIDTH + 10, 110, 40, "Restart", RED)
 
-    game_array = None
-    menu_buttons = None
+    board = None
+    game_logger = GameLogger('game_log.jsonl')
+    clock = pygame.time.Clock()  # Giữ frame rate ổn định, nhường CPU cho thread của AI
+    draw_menu()
 
     while run:
         if current_state == STATE_MENU:
-            menu_buttons = draw_menu()
-            
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     run = False
-                    
+
                 if event.type == pygame.MOUSEMOTION:
-                    for button in menu_buttons.values():
-                        button.check_hover(event.pos)
-                    draw_menu()
-                
+                    changed = [button.check_hover(event.pos) for button in MENU_BUTTONS.values()]
+                    if any(changed):
+                        draw_menu()
+
                 if event.type == pygame.MOUSEBUTTONDOWN:
-                    pos = pygame.mouse.get_pos()
-                    
-                    if menu_buttons['random'].is_clicked(pos):
+                    pos = event.pos
+
+                    if MENU_BUTTONS['random'].is_clicked(pos):
                         selected_opponent = 'random'
-                        ai_agent = RandomAgent('o')
+                        ai_agent = create_agent('random', 'o')
+                        ponderer = None
+                        ai_worker = MoveWorker(ai_agent)
                         current_state = STATE_PLAYING
-                        game_array = initialize_grid()
+                        board = initialize_grid()
+                        render(board)
+                        game_id = new_game_id()
+                        game_logger.log({'event': 'start', 'game': game_id, 'opponent': selected_opponent})
                         print(f"Game started: Human (X) vs Random Agent (O)")
-                        
-                    elif menu_buttons['minimax'].is_clicked(pos):
+
+                    elif MENU_BUTTONS['minimax'].is_clicked(pos):
                         selected_opponent = 'minimax'
-                        ai_agent = MinimaxAgent('o')
+                        ai_agent = create_agent('minimax', 'o')
+                        ponderer = Ponderer(ai_agent)
+                        ai_worker = MoveWorker(ai_agent, ponderer)
                         current_state = STATE_PLAYING
-                        game_array = initialize_grid()
+                        board = initialize_grid()
+                        render(board)
+                        game_id = new_game_id()
+                        game_logger.log({'event': 'start', 'game': game_id, 'opponent': selected_opponent})
                         print(f"Game started: Human (X) vs Minimax Agent (O)")
-                        
-                    elif menu_buttons['ml'].is_clicked(pos):
+
+                    elif MENU_BUTTONS['ml'].is_clicked(pos):
                         # ML Agent coming soon
                         print("ML Agent is not implemented yet!")
 
@@ -405,44 +456,54 @@ def main():
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     run = False
-                    
+
                 if event.type == pygame.MOUSEBUTTONDOWN:
-                    pos = pygame.mouse.get_pos()
-                    
+                    pos = event.pos
+
                     # Check restart button
                     if restart_button.is_clicked(pos):
                         reset_game()
-                        continue
-                    
+                        break
+
                     # Handle game click
-                    if x_turn:
-                        click(game_array)
-                
+                    if x_turn and click(board, pos):
+                        check_game_end(board)
+
                 if event.type == pygame.MOUSEMOTION:
                     restart_button.check_hover(event.pos)
 
-            if not (has_won(game_array) or has_drawn(game_array)):
-                render(game_array)
-            else:
-                current_state = STATE_GAME_OVER
+            if current_state == STATE_PLAYING:
+                if poll_ai_move(board):
+                    check_game_end(board)
+                draw_status_bar(board)
 
         elif current_state == STATE_GAME_OVER:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     run = False
-                    
+
                 if event.type == pygame.MOUSEBUTTONDOWN:
-                    pos = pygame.mouse.get_pos()
+                    pos = event.pos
                     if restart_button.is_clicked(pos):
                         reset_game()
-                
+                        break
+
                 if event.type == pygame.MOUSEMOTION:
                     restart_button.check_hover(event.pos)
-            
-            render(game_array)
 
+            if current_state == STATE_GAME_OVER:
+                draw_status_bar(board)
+
+        flush()
+        clock.tick(FPS)
+
+    if ai_worker:
+        ai_worker.cancel()
+    if ponderer:
+        ponderer.stop()
+    game_logger.close()
     pygame.quit()
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
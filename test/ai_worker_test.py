@@ -0,0 +1,94 @@
+import threading
+
+from agent.aiWorker import MoveWorker
+from agent.minimaxAgt import MinimaxAgent
+from test.minimax_search_test import _midgame_board
+
+
+class _UninterruptibleAgent:
+    """Agent giả bỏ qua stop_event cho tới khi được thả, ghi lại số lượt get_move chạy cùng lúc"""
+
+    def __init__(self):
+        self.stop_event = None
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.active = 0
+        self.max_active = 0
+        self.calls = 0
+        self.events = []  # stop_event nhìn thấy lúc kết thúc mỗi lượt
+
+    def get_move(self, board):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        self.entered.set()
+        self.release.wait()
+        self.calls += 1
+        self.events.append(self.stop_event)
+        self.active -= 1
+        return 0, self.calls
+
+
+def test_move_arrives_through_poll():
+    board = _midgame_board()
+    worker = MoveWorker(MinimaxAgent('x', max_depth=2))
+    worker.request(board)
+    assert worker.thinking
+    worker.join()
+    move = worker.poll()
+    assert move == MinimaxAgent('x', max_depth=2).get_move(board)
+    assert not worker.thinking
+
+
+def test_cancel_discards_stale_result():
+    board = _midgame_board()
+    agent = MinimaxAgent('x', max_depth=12)
+    worker = MoveWorker(agent)
+    worker.request(board)
+    worker.cancel()
+    assert not worker.thinking
+    # Lượt bị hủy dừng tìm kiếm (không thì join phải chờ tìm tới độ sâu 12)
+    worker.join()
+    assert worker.poll() is None and agent.stop_event is None
+    agent.max_depth = 2
+    worker.request(board)
+    worker.join()
+    assert worker.poll() is not None
+
+
+def test_new_request_waits_for_cancelled_search():
+    agent = _UninterruptibleAgent()
+    worker = MoveWorker(agent)
+    board = _midgame_board()
+    worker.request(board)
+    agent.entered.wait()
+    first = worker._thread
+    worker.cancel()
+    worker.request(board)
+    # Lượt cũ chưa nhả agent thì lượt mới chưa được gọi get_move
+    assert agent.active == 1 and agent.calls == 0
+    agent.release.set()
+    first.join()
+    worker.join()
+    assert agent.max_active == 1 and agent.calls == 2
+    # Lượt cũ kết thúc không được xóa stop_event của lượt mới
+    assert agent.events[1] is not None and agent.stop_event is None
+    assert worker.poll() == (0, 2)
+
+
+def test_ponder_hit_through_worker():
+    from agent.ponder import Ponderer
+
+    board = _midgame_board()
+    agent = MinimaxAgent('x', max_depth=3)
+    ponderer = Ponderer(agent)
+    worker = MoveWorker(agent, ponderer)
+    worker.request(board)
+    worker.join()
+    i, j = worker.poll()
+    board.make_move(board.index(i, j))
+    # Người chơi đi đúng nước đoán: lượt mới của worker lấy kết quả ponder
+    board.make_move(ponderer.start(board))
+    worker.request(board)
+    worker.join()
+    assert worker.poll() == MinimaxAgent('x', max_depth=3).get_move(board)
+    assert (ponderer.hits, ponderer.misses) == (1, 0) and not ponderer.active
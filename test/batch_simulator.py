@@ -0,0 +1,115 @@
+"""
+Mô phỏng hàng loạt ván cùng lúc trên mảng NumPy (N, rows, rows)
+Dùng để sinh dữ liệu và đo tỉ lệ thắng cơ sở (ví dụ Random vs Random)
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+
+# Đặt thư mục gốc lên đầu sys.path để import được gói agent khi chạy từ thư mục test
+sys.path.insert(0, os.path.abspath(".."))
+from agent.board import Board, X, O
+from agent.numpyEval import has_five
+from agent.randomAgt import RandomAgent
+
+DRAW = 0
+INVALID = -1
+
+
+class BatchSimulator:
+    def __init__(self, rows=9, win_length=5, seed=None):
+        self.rows = rows
+        self.win_length = win_length
+        self.rng = np.random.default_rng(seed)
+
+    def agent_moves(self, agent, boards):
+        """Hỏi agent nước đi cho cả lô; agent không có get_moves thì hỏi từng ván"""
+        if hasattr(agent, 'get_moves'):
+            return np.asarray(agent.get_moves(boards, rng=self.rng), dtype=np.int64)
+        moves = np.empty(len(boards), dtype=np.int64)
+        for k, cells in enumerate(boards.reshape(len(boards), -1)):
+            board = Board.from_cells(cells.tobytes(), self.rows, self.win_length)
+            i, j = agent.get_move(board)
+            moves[k] = board.index(i, j)
+        return moves
+
+    def play(self, agent1, agent2, num_games, batch_size=50000):
+        """
+        Chơi `num_games` ván agent1 (X) vs agent2 (O), chia thành các lô `batch_size`
+        
+        Returns:
+            winners: mảng (num_games,) gồm 1 (X), 2 (O), 0 (hòa), -1 (nước đi không hợp lệ)
+            moves: mảng (num_games,) số nước đi của từng ván
+        """
+        winners = np.zeros(num_games, dtype=np.int8)
+        moves = np.zeros(num_games, dtype=np.int16)
+        for start in range(0, num_games, batch_size):
+            stop = min(num_games, start + batch_size)
+            winners[start:stop], moves[start:stop] = self._play_batch(agent1, agent2, stop - start)
+        return winners, moves
+
+    def _play_batch(self, agent1, agent2, count):
+        cells = self.rows * self.rows
+        boards = np.zeros((count, self.rows, self.rows), dtype=np.int8)  # Chỉ gồm các ván còn chơi
+        game_ids = np.arange(count)  # Vị trí trong kết quả của từng ván còn chơi
+        winners = np.zeros(count, dtype=np.int8)
+        moves = np.zeros(count, dtype=np.int16)
+
+        for ply in range(cells):
+            if not len(boards):
+                break
+            player = X if ply % 2 == 0 else O
+            agent = agent1 if player == X else agent2
+            chosen = self.agent_moves(agent, boards)
+
+            # Nước đi vào ô đã có quân thì xử thua ván đó (không hợp lệ)
+            flat = boards.reshape(len(boards), -1)
+            rows = np.arange(len(boards))
+            invalid = flat[rows, chosen] != 0
+            flat[rows[~invalid], chosen[~invalid]] = player
+            moves[game_ids] = ply + 1
+
+            # Một lượt vector hóa: chỉ bên vừa đi mới có thể thắng, và bàn nào đã đầy
+            won = has_five(boards, player, self.win_length)
+            winners[game_ids[won]] = player
+            winners[game_ids[invalid]] = INVALID
+            if ply + 1 == cells:
+                break
+            done = won | invalid
+
+            # Loại các ván đã xong khỏi lô
+            if done.any():
+                boards = boards[~done]
+                game_ids = game_ids[~done]
+        return winners, moves
+
+
+def summarize(winners, moves, elapsed):
+    """Tổng hợp kết quả mô phỏng hàng loạt"""
+    num_games = len(winners)
+    return {
+        'num_games': num_games,
+        'x_wins': int((winners == X).sum()),
+        'o_wins': int((winners == O).sum()),
+        'draws': int((winners == DRAW).sum()),
+        'invalid': int((winners == INVALID).sum()),
+        'avg_moves': float(moves.mean()) if num_games else 0.0,
+        'elapsed_time': elapsed,
+        'games_per_minute': num_games / elapsed * 60 if elapsed > 0 else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    simulator = BatchSimulator(rows=9, seed=0)
+    start_time = time.time()
+    winners, moves = simulator.play(RandomAgent('x'), RandomAgent('o'), num_games)
+    summary = summarize(winners, moves, time.time() - start_time)
+    print(f"Random vs Random: {summary['num_games']} games in {summary['elapsed_time']:.2f}s "
+          f"({summary['games_per_minute']:.0f} games/min)")
+    print(f"X wins: {summary['x_wins']} | O wins: {summary['o_wins']} | "
+          f"Draws: {summary['draws']} | Invalid: {summary['invalid']} | "
+          f"Avg moves: {summary['avg_moves']:.1f}")
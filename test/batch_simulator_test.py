@@ -0,0 +1,27 @@
+"""
+Test cho mô phỏng hàng loạt
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from agent.minimaxAgt import MinimaxAgent
+from agent.randomAgt import RandomAgent
+from test.batch_simulator import BatchSimulator, summarize
+
+
+def test_seeded_runs_are_reproducible_and_complete():
+    first = BatchSimulator(seed=42).play(RandomAgent('x'), RandomAgent('o'), 300, batch_size=128)
+    second = BatchSimulator(seed=42).play(RandomAgent('x'), RandomAgent('o'), 300, batch_size=128)
+    assert (first[0] == second[0]).all() and (first[1] == second[1]).all()
+
+    summary = summarize(*first, elapsed=1.0)
+    assert summary['x_wins'] + summary['o_wins'] + summary['draws'] == 300
+    assert summary['invalid'] == 0
+    assert first[1].min() >= 9
+
+
+def test_agents_without_batch_api_are_asked_per_game():
+    winners, moves = BatchSimulator(seed=1).play(MinimaxAgent('x', max_depth=2), RandomAgent('o'), 3)
+    assert (winners == 1).all()
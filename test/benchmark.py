@@ -0,0 +1,207 @@
+"""
+Benchmark tìm kiếm trên bộ thế cờ cố định (khai cuộc, trung cuộc, chiến thuật, gần đầy bàn)
+Ghi số node, nodes/giây, thời gian tới từng độ sâu, nước đi và điểm của MinimaxAgent cùng
+microbenchmark các hàm nóng, rồi so với baseline đã lưu theo ngưỡng sai lệch
+    python benchmark.py                    # chạy và so với benchmark_baseline.json
+    python benchmark.py --save-baseline    # ghi lại baseline
+Số node là tất định nên dùng ngưỡng chặt; thời gian phụ thuộc máy nên ngưỡng rộng hơn
+"""
+
+import json
+import os
+import platform
+import random
+import sys
+import time
+import timeit
+
+# Đặt thư mục gốc lên đầu sys.path để import được gói agent khi chạy từ thư mục test
+sys.path.insert(0, os.path.abspath(".."))
+from agent.board import Board
+from agent.minimaxAgt import MinimaxAgent
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# Sai lệch cho phép so với baseline
+TOLERANCES = {
+    'nodes': 0.10,  # Số node tăng quá 10%: thứ tự nước/cắt tỉa kém đi
+    'time': 0.30,  # nodes/giây giảm hoặc thời gian micro tăng quá 30%
+}
+
+# Thế cờ: danh sách nước đi (i, j), X đi trước
+POSITIONS = {
+    'opening/empty': [],
+    'opening/center': [(4, 4)],
+    'opening/diagonal': [(4, 4), (3, 3), (5, 4)],
+    'midgame/cluster': [(4, 4), (4, 5), (3, 3), (5, 5), (3, 5), (2, 6)],
+    'midgame/spread': [(4, 4), (3, 4), (4, 3), (5, 5), (2, 2), (3, 3), (5, 3), (4, 2), (6, 6), (6, 2)],
+    'tactical/block_four': [(0, 0), (8, 0), (0, 1), (8, 2), (0, 2), (8, 4), (0, 3), (8, 6)],
+    'tactical/open_three': [(4, 2), (0, 0), (4, 3), (0, 8), (4, 4), (8, 0)],
+    'tactical/vcf': [(6, 4), (8, 7), (2, 3), (7, 3), (8, 8), (6, 8), (4, 4), (6, 7),
+                     (3, 8), (4, 1), (6, 6), (5, 6), (2, 0), (1, 5), (5, 3), (2, 4)],
+}
+
+
+def near_full_moves(seed, empties=10, size=9):
+    """
+    Thế cờ gần đầy bàn chưa ai thắng, sinh tất định từ seed
+    Lấp bàn theo mẫu "XXOO" lệch 2 ô mỗi hàng (không hướng nào có quá 2 quân liền nhau),
+    bỏ trống ngẫu nhiên `empties` ô rồi cân lại số quân hai bên
+    """
+    rng = random.Random(seed)
+    cells = [(i, j) for i in range(size) for j in range(size)]
+    empty = set(rng.sample(cells, empties))
+    xs = [c for c in cells if c not in empty and (c[1] + 2 * c[0]) // 2 % 2 == 0]
+    os_ = [c for c in cells if c not in empty and (c[1] + 2 * c[0]) // 2 % 2 == 1]
+    while len(xs) > len(os_) + 1:
+        xs.pop(rng.randrange(len(xs)))
+    while len(os_) > len(xs):
+        os_.pop(rng.randrange(len(os_)))
+    rng.shuffle(xs)
+    rng.shuffle(os_)
+    moves = []
+    for k in range(len(xs)):
+        moves.append(xs[k])
+        if k < len(os_):
+            moves.append(os_[k])
+    return moves
+
+
+for _seed in (1, 2):
+    POSITIONS[f'endgame/near_full_{_seed}'] = near_full_moves(_seed)
+
+
+def build_board(moves, size=9):
+    board = Board(size)
+    for i, j in moves:
+        board.make_move(board.index(i, j))
+    return board
+
+
+def bench_position(moves, depth):
+    board = build_board(moves)
+    symbol = 'x' if len(moves) % 2 == 0 else 'o'
+    agent = MinimaxAgent(symbol, max_depth=depth)
+    start = time.perf_counter()
+    move = agent.get_move(board)
+    elapsed = time.perf_counter() - start
+    return {
+        'move': list(move),
+        'score': agent.best_score,
+        'depth': agent.completed_depth,
+        'nodes': agent.nodes,
+        'threat_nodes': agent.threat_nodes,  # Thế chiến thuật giải bằng VCF/VCT
+        'time_ms': elapsed * 1000,
+        'nps': agent.nodes / elapsed if elapsed > 0 else 0.0,
+        'time_to_depth_ms': {str(d): ms for d, ms, _, _, _ in agent.iterations},
+    }
+
+
+def bench_micro(repeat=5):
+    """Thời gian (ns) mỗi lần gọi các hàm nóng trên một thế trung cuộc"""
+    board = build_board(POSITIONS['midgame/spread'])
+    agent = MinimaxAgent('x')
+    agent._reset_move_ordering(board)
+    calls = {
+        '_check_winner': lambda: agent._check_winner(board),
+        '_evaluate_board': lambda: agent._evaluate_board(board),
+        '_get_prioritized_moves': lambda: agent._get_prioritized_moves(board),
+        '_get_board_hash': lambda: agent._get_board_hash(board),
+    }
+    results = {}
+    for name, call in calls.items():
+        # Số lần gọi tự chọn cho mỗi lần đo ~0.2s, lấy lần nhanh nhất để bớt nhiễu
+        timer = timeit.Timer(call)
+        number, _ = timer.autorange()
+        best = min(timer.repeat(number=number, repeat=repeat))
+        results[name] = best / number * 1e9
+    return results
+
+
+def run_suite(depth=4, positions=None, micro_repeat=5):
+    positions = positions or POSITIONS
+    return {
+        'meta': {
+            'depth': depth,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'positions': {name: bench_position(moves, depth) for name, moves in positions.items()},
+        'micro': bench_micro(micro_repeat) if micro_repeat else {},
+    }
+
+
+def compare(results, baseline, tolerances=None):
+    """
+    So kết quả với baseline, trả về (regressions, changes)
+    regressions: chậm hơn/nhiều node hơn quá ngưỡng; changes: nước đi hoặc điểm khác baseline
+    """
+    tolerances = dict(TOLERANCES, **(tolerances or {}))
+    regressions = []
+    changes = []
+    for name, base in baseline.get('positions', {}).items():
+        current = results['positions'].get(name)
+        if current is None:
+            continue
+        for key in ('nodes', 'threat_nodes'):
+            if current[key] > base[key] * (1 + tolerances['nodes']):
+                regressions.append(f"{name}: {key} {base[key]} -> {current[key]}")
+        # Thế cờ quá nhỏ thì nodes/giây chỉ là nhiễu
+        if base['nodes'] >= 1000 and current['nps'] < base['nps'] * (1 - tolerances['time']):
+            regressions.append(f"{name}: nodes/s {base['nps']:.0f} -> {current['nps']:.0f}")
+        if current['move'] != base['move'] or current['score'] != base['score']:
+            changes.append(f"{name}: {base['move']} ({base['score']}) -> {current['move']} ({current['score']})")
+    for name, base_ns in baseline.get('micro', {}).items():
+        current_ns = results['micro'].get(name)
+        if current_ns is not None and current_ns > base_ns * (1 + tolerances['time']):
+            regressions.append(f"{name}: {base_ns:.0f} ns -> {current_ns:.0f} ns")
+    return regressions, changes
+
+
+def print_report(results):
+    print(f"{'position':28} {'move':>8} {'score':>7} {'depth':>5} {'nodes':>8} {'ms':>9} {'nodes/s':>9}")
+    for name, r in results['positions'].items():
+        print(f"{name:28} {str(tuple(r['move'])):>8} {str(r['score']):>7} {r['depth']:>5} "
+              f"{r['nodes']:>8} {r['time_ms']:>9.1f} {r['nps']:>9.0f}")
+    for name, ns in results['micro'].items():
+        print(f"{name:28} {ns:>10.0f} ns/call")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fixed-position search benchmark")
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--out', default='benchmark_results.json')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--strict', action='store_true', help="also fail when a best move or score changes")
+    args = parser.parse_args()
+
+    results = run_suite(args.depth)
+    print_report(results)
+    with open(args.out, 'w') as f:
+        json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, run with --save-baseline first")
+        sys.exit(0)
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline['meta']['depth'] != args.depth:
+        print(f"Baseline was recorded at depth {baseline['meta']['depth']}, not {args.depth}")
+        sys.exit(2)
+    regressions, changes = compare(results, baseline)
+    for line in changes:
+        print(f"CHANGED    {line}")
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    failed = bool(regressions) or (args.strict and bool(changes))
+    print("FAIL" if failed else "OK: no regressions against baseline")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,32 @@
+from agent.board import X, O
+from test.benchmark import POSITIONS, build_board, compare, near_full_moves, run_suite
+
+
+def test_near_full_positions_are_quiet():
+    for seed in (1, 2):
+        board = build_board(near_full_moves(seed))
+        assert not board.winner and not board.game_over
+        assert board.to_move in (X, O)
+        assert len(board.legal_moves()) >= 10
+
+
+def test_suite_is_deterministic_and_compares_clean():
+    positions = {name: POSITIONS[name] for name in ('opening/center', 'endgame/near_full_1')}
+    first = run_suite(depth=2, positions=positions, micro_repeat=0)
+    second = run_suite(depth=2, positions=positions, micro_repeat=0)
+    for name in positions:
+        assert first['positions'][name]['nodes'] == second['positions'][name]['nodes']
+        assert first['positions'][name]['move'] == second['positions'][name]['move']
+        assert set(first['positions'][name]['time_to_depth_ms']) == {'1', '2'}
+    regressions, changes = compare(second, first, {'time': 100.0})
+    assert regressions == [] and changes == []
+
+
+def test_compare_flags_node_regression_and_move_change():
+    base = {'positions': {'p': {'move': [4, 4], 'score': 10, 'nodes': 1000, 'threat_nodes': 0, 'nps': 5000}},
+            'micro': {'f': 100.0}}
+    current = {'positions': {'p': {'move': [3, 3], 'score': 10, 'nodes': 1200, 'threat_nodes': 0, 'nps': 5000}},
+               'micro': {'f': 200.0}}
+    regressions, changes = compare(current, base)
+    assert len(regressions) == 2
+    assert changes == ["p: [4, 4] (10) -> [3, 3] (10)"]
@@ -0,0 +1,146 @@
+"""
+Test cho Board: đi/hoàn tác, copy và adapter game_array
+"""
+
+import random
+
+from agent.board import Board, X, O
+from agent.gameSimulator import GameSimulator
+
+
+def test_make_undo_restores_board():
+    board = Board(9)
+    board.make_move(board.index(4, 4), X)
+    board.make_move(board.index(4, 5), O)
+    assert board.symbol_at(4, 4) == "x" and board.symbol_at(4, 5) == "o"
+    assert board.to_move == X
+
+    assert board.undo_move() == board.index(4, 5)
+    board.undo_move()
+    assert board.cells == bytearray(81)
+    assert board.moves == []
+
+
+def test_copy_is_independent():
+    board = Board(9)
+    board.make_move(0, X)
+    clone = board.copy()
+    clone.make_move(1, O)
+    assert board.is_empty(0, 1)
+    assert len(board.moves) == 1 and len(clone.moves) == 2
+
+
+def test_game_array_round_trip():
+    board = Board(9)
+    for idx, player in ((10, X), (20, O), (30, X)):
+        board.make_move(idx, player)
+    game_array = board.to_game_array(gap=60)
+    assert game_array[1][1] == (90, 90, "x", False)
+    assert game_array[0][0] == (30, 30, "", True)
+
+    restored = Board.from_game_array(game_array)
+    assert restored.cells == board.cells
+    assert restored.to_move == O
+
+
+def test_simulator_accepts_board():
+    simulator = GameSimulator(rows=9)
+    board = simulator.initialize_game()
+    for j in range(5):
+        board.make_move(board.index(2, j), X)
+    assert simulator.check_winner(board) == "x"
+    assert simulator.convert_to_game_array(board)[2][0][2] == "x"
+
+
+def test_winner_tracked_across_make_undo():
+    board = Board(9)
+    for k in range(4):
+        board.make_move(board.index(k, k), X)
+        board.make_move(board.index(k, 8), O)
+    assert board.winner == 0
+    board.make_move(board.index(4, 4), X)
+    assert board.winner == X
+    assert board.winning_line() == [(k, k) for k in range(5)]
+
+    board.undo_move()
+    assert board.winner == 0 and board.winning_line() == []
+    board.make_move(board.index(4, 8), O)
+    assert board.winner == O
+
+
+def test_anti_diagonal_and_longer_lines():
+    board = Board(9)
+    for k in (0, 1, 3, 4):
+        board.make_move(board.index(k, 6 - k), O)
+    assert board.winner == 0
+    board.make_move(board.index(2, 4), O)
+    assert board.winner == O
+    assert len(board.winning_line()) == 5
+
+
+def test_zobrist_hash_is_incremental_and_order_independent():
+    a = Board(9)
+    b = Board(9)
+    for idx, player in ((40, X), (41, O), (50, X)):
+        a.make_move(idx, player)
+    for idx, player in ((50, X), (41, O), (40, X)):
+        b.make_move(idx, player)
+    assert (a.hash, a.hash2) == (b.hash, b.hash2)
+    assert a.hash != 0 and a.hash != a.hash2
+
+    for _ in range(3):
+        a.undo_move()
+    assert (a.hash, a.hash2) == (0, 0)
+    assert Board.from_game_array(b.to_game_array()).hash == b.hash
+
+
+def _reference_score(board):
+    """Cách tính cũ của _evaluate_board: quét mọi đoạn 5 ô, góc nhìn X"""
+    grid = [[board.symbol_at(r, c) for c in range(board.size)] for r in range(board.size)]
+    n = board.size
+
+    def evaluate_segment(segment, player):
+        opponent = 'o' if player == 'x' else 'x'
+        if opponent in segment:
+            return 0
+        return {4: 500, 3: 50, 2: 10, 1: 1}.get(segment.count(player), 0)
+
+    score = 0
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        for r in range(n):
+            for c in range(n):
+                if not (0 <= r + dr * 4 < n and 0 <= c + dc * 4 < n):
+                    continue
+                segment = [grid[r + dr * k][c + dc * k] for k in range(5)]
+                if segment.count("") <= 2:
+                    score += evaluate_segment(segment, 'x') - evaluate_segment(segment, 'o')
+    return score
+
+
+def test_incremental_score_matches_full_scan():
+    rng = random.Random(7)
+    for _ in range(20):
+        board = Board(9)
+        while not board.game_over:
+            board.make_move(rng.choice(board.legal_moves()))
+            assert board.score == _reference_score(board)
+        while board.moves:
+            board.undo_move()
+        assert board.score == 0 and not any(board.window_codes)
+
+
+def test_candidate_frontier_tracks_stones():
+    rng = random.Random(3)
+    board = Board(9)
+    for _ in range(30):
+        board.make_move(rng.choice(board.legal_moves()))
+        expected = {
+            ni * 9 + nj
+            for idx, _ in board.moves
+            for ni in range(9) for nj in range(9)
+            if max(abs(ni - idx // 9), abs(nj - idx % 9)) <= 2 and board.is_empty(ni, nj)
+        }
+        assert board.candidates == expected
+    while board.moves:
+        board.undo_move()
+    assert board.candidates == set() and not any(board.near)
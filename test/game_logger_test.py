@@ -0,0 +1,76 @@
+import json
+import os
+
+from agent.gameLogger import GameLogger, new_game_id
+
+
+def _read(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_records_are_flushed_on_close(tmp_path):
+    path = str(tmp_path / "games.jsonl")
+    logger = GameLogger(path, flush_interval=10)
+    game = new_game_id()
+    for ply in range(1, 6):
+        logger.log_move(game, ply, 'x' if ply % 2 else 'o', (4, ply), think_ms=1.5, stats={'depth': 3})
+    logger.log_result(game, 'x', 5)
+    logger.close()
+    records = _read(path)
+    assert [r['ply'] for r in records[:5]] == [1, 2, 3, 4, 5]
+    assert records[0]['cell'] == [4, 1] and records[0]['stats'] == {'depth': 3}
+    assert records[-1]['event'] == 'result'
+    # Đóng rồi thì bỏ qua bản ghi mới
+    logger.log({'event': 'late'})
+    logger.close()
+    assert len(_read(path)) == 6
+
+
+def test_rotates_by_size(tmp_path):
+    path = str(tmp_path / "games.jsonl")
+    logger = GameLogger(path, max_bytes=200, backups=2, batch_size=1)
+    for ply in range(40):
+        logger.log_move('g', ply, 'x', (0, 0))
+    logger.close()
+    assert os.path.exists(path + ".1") and os.path.exists(path + ".2")
+    assert not os.path.exists(path + ".3")
+    assert os.path.getsize(path + ".1") < 400
+
+
+def test_simulator_logs_moves_and_result(tmp_path):
+    from agent.minimaxAgt import MinimaxAgent
+    from agent.randomAgt import RandomAgent
+    from agent.gameSimulator import GameSimulator
+
+    path = str(tmp_path / "games.jsonl")
+    logger = GameLogger(path)
+    winner, moves = GameSimulator(logger=logger).play_game(MinimaxAgent('x', max_depth=2), RandomAgent('o', seed=3))
+    logger.close()
+    records = _read(path)
+    assert len(records) == moves + 1
+    assert records[2]['player'] == 'x' and records[2]['stats']['depth'] >= 1 and 'think_ms' in records[2]
+    assert records[-1] == dict(records[-1], event='result', winner=winner, moves=moves)
+
+
+def test_bad_record_is_dropped_alone(tmp_path, capsys):
+    path = str(tmp_path / "games.jsonl")
+    logger = GameLogger(path, batch_size=1)
+    logger.log_move('g', 1, 'x', (0, 0))
+    logger.log_move('g', 2, 'o', (0, 1), stats={'search': object()})
+    logger.log_move('g', 3, 'x', (0, 2))
+    logger.close()
+    # Bản ghi không phải JSON không dừng thread ghi, các bản ghi sau vẫn được ghi
+    assert [r['ply'] for r in _read(path)] == [1, 3]
+    assert logger.written == 2 and logger.dropped == 1
+    assert "dropped 'move' record" in capsys.readouterr().err
+
+
+def test_write_failure_counts_dropped_records(tmp_path, capsys):
+    # Thư mục không tồn tại: mở file lỗi ở mọi lô
+    logger = GameLogger(str(tmp_path / "missing" / "games.jsonl"), batch_size=2)
+    for ply in range(1, 4):
+        logger.log_move('g', ply, 'x', (0, ply))
+    logger.close()
+    assert logger.written == 0 and logger.dropped == 3
+    assert "GameLogger: dropped 2 records" in capsys.readouterr().err
@@ -0,0 +1,37 @@
+import io
+import subprocess
+import sys
+
+import pytest
+
+import headless
+from agent import AGENTS, create_agent, load_agent
+
+
+def test_import_is_lazy():
+    code = ("import sys, headless; "
+            "print('pygame' in sys.modules, 'numpy' in sys.modules, 'agent.minimaxAgt' in sys.modules)")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert output.split() == ['False', 'False', 'False']
+
+
+def test_startup_time_within_target():
+    assert headless.measure_startup(runs=3) <= headless.STARTUP_TARGET_MS
+
+
+def test_registry_and_learning_agent():
+    assert set(AGENTS) == {'minimax', 'random', 'learning'}
+    assert load_agent('random').__name__ == 'RandomAgent'
+    with pytest.raises(ValueError):
+        load_agent('nope')
+    with pytest.raises(RuntimeError):
+        create_agent('learning', 'o').get_move(None)
+
+
+def test_analyse_and_play():
+    out = io.StringIO()
+    move = headless.analyse([(4, 4), (4, 5), (3, 3)], depth=2, out=out)
+    lines = out.getvalue().splitlines()
+    assert [line.split()[2] for line in lines[:2]] == ['1', '2']  # info depth 1, info depth 2
+    assert lines[2].startswith(f"bestmove {move[0]},{move[1]}") and lines[3].startswith("stats ")
+    assert headless.play('minimax', 'random', depth=2, out=io.StringIO()) in ('x', 'o', 'draw')
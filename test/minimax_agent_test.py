@@ -10,180 +10,35 @@ from datetime import datetime
 import sys
 import os
 
-sys.path.append(os.path.abspath(".."))
-from agent.minimaxAgt import MinimaxAgent
-from agent.randomAgt import RandomAgent
-
-class GameSimulator:
-    def __init__(self, rows=9):
-        self.rows = rows
-        
-    def initialize_game(self):
-        """Khởi tạo bàn cờ rỗng"""
-        return [["" for _ in range(self.rows)] for _ in range(self.rows)]
-    
-    def convert_to_game_array(self, board):
-        """Chuyển board thành format game_array cho agents"""
-        game_array = []
-        gap = 80  # Giả định
-        for i in range(self.rows):
-            row = []
-            for j in range(self.rows):
-                x = j * gap + gap // 2
-                y = i * gap + gap // 2
-                symbol = board[i][j]
-                can_play = (symbol == "")
-                row.append((x, y, symbol, can_play))
-            game_array.append(row)
-        return game_array
-    
-    def check_winner(self, board):
-        """Kiểm tra có người thắng không (5 liên tiếp)"""
-        n = len(board)
-        
-        # Kiểm tra hàng ngang
-        for r in range(n):
-            for c in range(n - 4):
-                seq = [board[r][c + k] for k in range(5)]
-                if seq[0] != "" and all(x == seq[0] for x in seq):
-                    return seq[0]
-        
-        # Kiểm tra hàng dọc
-        for c in range(n):
-            for r in range(n - 4):
-                seq = [board[r + k][c] for k in range(5)]
-                if seq[0] != "" and all(x == seq[0] for x in seq):
-                    return seq[0]
-        
-        # Kiểm tra chéo xuôi
-        for r in range(n - 4):
-            for c in range(n - 4):
-                seq = [board[r + k][c + k] for k in range(5)]
-                if seq[0] != "" and all(x == seq[0] for x in seq):
-                    return seq[0]
-        
-        # Kiểm tra chéo ngược
-        for r in range(n - 4):
-            for c in range(4, n):
-                seq = [board[r + k][c - k] for k in range(5)]
-                if seq[0] != "" and all(x == seq[0] for x in seq):
-                    return seq[0]
-        
-        return None
-    
-    def is_board_full(self, board):
-        """Kiểm tra bàn cờ đã đầy chưa"""
-        return all(board[i][j] != "" for i in range(self.rows) for j in range(self.rows))
-    
-    def play_game(self, agent1, agent2, verbose=False, max_moves=81):
-        """
-        Chơi một ván game giữa 2 agents
-        
-        Args:
-            agent1: Agent đi trước (X)
-            agent2: Agent đi sau (O)
-            verbose: In thông tin chi tiết
-            max_moves: Số nước tối đa (tránh game vô hạn)
-        
-        Returns:
-            winner: 'x', 'o', hoặc 'draw'
-            moves: Số nước đi
-        """
-        board = self.initialize_game()
-        current_agent = agent1
-        current_symbol = 'x'
-        move_count = 0
-        
-        if verbose:
-            print(f"\n=== New Game: {agent1.__class__.__name__} (X) vs {agent2.__class__.__name__} (O) ===")
-        
-        while move_count < max_moves:
-            # Chuyển board sang game_array format
-            game_array = self.convert_to_game_array(board)
-            
-            # Agent chọn nước đi
-            move = current_agent.get_move(game_array)
-            
-            if move is None:
-                if verbose:
-                    print(f"No valid move available!")
-                break
-            
-            i, j = move
-            
-            # Kiểm tra nước đi hợp lệ
-            if board[i][j] != "":
-                if verbose:
-                    print(f"Invalid move at ({i},{j})!")
-                return 'invalid', move_count
-            
-            # Thực hiện nước đi
-            board[i][j] = current_symbol
-            move_count += 1
-            
-            if verbose:
-                print(f"Move {move_count}: {current_symbol.upper()} -> ({i},{j})")
-            
-            # Kiểm tra thắng
-            winner = self.check_winner(board)
-            if winner:
-                if verbose:
-                    print(f"\n🎉 {winner.upper()} wins after {move_count} moves!")
-                    self.print_board(board)
-                return winner, move_count
-            
-            # Kiểm tra hòa
-            if self.is_board_full(board):
-                if verbose:
-                    print(f"\n🤝 Draw after {move_count} moves!")
-                    self.print_board(board)
-                return 'draw', move_count
-            
-            # Đổi lượt
-            current_agent = agent2 if current_agent == agent1 else agent1
-            current_symbol = 'o' if current_symbol == 'x' else 'x'
-        
-        if verbose:
-            print(f"\n⏱️ Game timeout after {max_moves} moves!")
-        return 'timeout', move_count
-    
-    def print_board(self, board):
-        """In bàn cờ ra console"""
-        print("\n  ", end="")
-        for j in range(self.rows):
-            print(f"{j} ", end="")
-        print()
-        
-        for i in range(self.rows):
-            print(f"{i} ", end="")
-            for j in range(self.rows):
-                symbol = board[i][j] if board[i][j] != "" else "."
-                print(f"{symbol} ", end="")
-            print()
+# Đặt thư mục gốc lên đầu sys.path để import được gói agent khi chạy từ thư mục test
+sys.path.insert(0, os.path.abspath(".."))
+from agent.searchStats import SearchStats
 
 
-def run_test_suite(num_games=100, test_name="Minimax vs Random"):
+def run_test_suite(num_games=100, test_name="Minimax vs Random", workers=None, seed=0, swap_colours=False,
+                   search_stats=False):
     """
     Chạy test suite với số lượng games nhất định
     
     Args:
         num_games: Số ván chơi
         test_name: Tên test
+        workers: Số process chạy song song (None: số CPU)
+        seed: Seed gốc cho RandomAgent, mỗi ván một seed riêng
+        swap_colours: Đổi màu xen kẽ (Minimax cầm X ở ván lẻ, O ở ván chẵn); mặc định Minimax luôn cầm X
+        search_stats: Đo thống kê tìm kiếm của Minimax, cộng dồn vào results['search_stats']
+            (tắt mặc định: hàm bọc đo đạc làm chậm tìm kiếm, lệch thời gian đo được)
     
     Returns:
         results: Dictionary chứa kết quả
     """
+    from agent.tournament import run_tournament
+    
     print(f"\n{'='*70}")
     print(f"  {test_name}")
     print(f"  Testing {num_games} games")
     print(f"{'='*70}\n")
     
-    simulator = GameSimulator(rows=9)
-    
-    # Khởi tạo agents
-    minimax_agent = MinimaxAgent('x')
-    random_agent = RandomAgent('o')
-    
     # Thống kê
     results = {
         'minimax_wins': 0,
@@ -194,51 +49,50 @@ def run_test_suite(num_games=100, test_name="Minimax vs Random"):
         'total_moves': 0,
         'game_details': []
     }
+    aggregate = SearchStats()
     
     start_time = time.time()
+    report_every = max(1, num_games // 10)
     
-    # Chạy các games
-    for game_num in range(1, num_games + 1):
-        verbose = (game_num <= num_games)  # Chỉ in chi tiết 3 game đầu
-        
-        winner, moves = simulator.play_game(
-            minimax_agent, 
-            random_agent, 
-            verbose=verbose
-        )
-        
+    def record(game):
         # Cập nhật thống kê
-        if winner == 'x':
+        if game['result'] == 'a':
             results['minimax_wins'] += 1
-        elif winner == 'o':
+        elif game['result'] == 'b':
             results['random_wins'] += 1
-        elif winner == 'draw':
+        elif game['result'] == 'draw':
             results['draws'] += 1
-        elif winner == 'invalid':
+        elif game['result'] == 'invalid':
             results['invalid'] += 1
-        elif winner == 'timeout':
+        elif game['result'] == 'timeout':
             results['timeout'] += 1
         
-        results['total_moves'] += moves
+        results['total_moves'] += game['moves']
+        if 'a' in game.get('search', {}):
+            aggregate.merge(SearchStats.from_dict(game['search']['a']))
         results['game_details'].append({
-            'game': game_num,
-            'winner': winner,
-            'moves': moves
+            'game': game['game'],
+            'winner': game['winner'],
+            'minimax_symbol': game['a_symbol'],
+            'moves': game['moves']
         })
         
-        # Progress bar
-        # if game_num % 10 == 0 or game_num <= 3:
-        elapsed = time.time() - start_time
-        avg_time = elapsed / game_num
-        remaining = avg_time * (num_games - game_num)
-        
-        minimax_win_rate = (results['minimax_wins'] / game_num) * 100
-        
-        print(f"Game {game_num}/{num_games} | "
-                f"Minimax: {results['minimax_wins']} ({minimax_win_rate:.1f}%) | "
-                f"Random: {results['random_wins']} | "
-                f"Draw: {results['draws']} | "
-                f"ETA: {remaining:.0f}s")
+        # Progress bar (mỗi 10% số ván)
+        game_num = game['game']
+        if game_num % report_every == 0 or game_num == num_games:
+            elapsed = time.time() - start_time
+            remaining = elapsed / game_num * (num_games - game_num)
+            minimax_win_rate = (results['minimax_wins'] / game_num) * 100
+            print(f"Game {game_num}/{num_games} | "
+                    f"Minimax: {results['minimax_wins']} ({minimax_win_rate:.1f}%) | "
+                    f"Random: {results['random_wins']} | "
+                    f"Draw: {results['draws']} | "
+                    f"ETA: {remaining:.0f}s")
+    
+    # Chạy các games song song, kết quả trả về theo thứ tự ván
+    minimax = ('minimax', {'collect_stats': True}) if search_stats else 'minimax'
+    run_tournament(minimax, 'random', num_games, workers=workers, seed=seed,
+                   swap_colours=swap_colours, on_result=record)
     
     elapsed_time = time.time() - start_time
     
@@ -261,6 +115,13 @@ def run_test_suite(num_games=100, test_name="Minimax vs Random"):
     print(f"Draws:                {results['draws']} ({results['draws']/num_games*100:.2f}%)")
     print(f"Invalid games:        {results['invalid']}")
     print(f"Timeout games:        {results['timeout']}")
+    if aggregate.moves:
+        stats = results['search_stats'] = aggregate.as_dict()
+        print(f"Search:               {stats['nodes']} nodes, {stats['nps']} nodes/s, "
+              f"avg depth {stats['avg_depth']}, seldepth {stats['seldepth']}, EBF {stats['ebf']}")
+        print(f"                      TT hit {stats['tt_hit_rate'] * 100:.1f}%, "
+              f"first-move cutoffs {stats['first_move_cutoff_rate'] * 100:.1f}%")
+        print(f"Time per phase (ms):  " + ', '.join(f"{k} {v:.0f}" for k, v in stats['phase_ms'].items()))
     print(f"{'─'*70}\n")
     
     # Đánh giá
@@ -344,11 +205,11 @@ def analyze_results(results):
     
     # Phân tích win rate theo độ dài
     minimax_wins_short = sum(1 for g in results['game_details'] 
-                             if g['winner'] == 'x' and g['moves'] < 20)
+                             if g['winner'] == g['minimax_symbol'] and g['moves'] < 20)
     minimax_wins_medium = sum(1 for g in results['game_details'] 
-                              if g['winner'] == 'x' and 20 <= g['moves'] < 40)
+                              if g['winner'] == g['minimax_symbol'] and 20 <= g['moves'] < 40)
     minimax_wins_long = sum(1 for g in results['game_details'] 
-                            if g['winner'] == 'x' and g['moves'] >= 40)
+                            if g['winner'] == g['minimax_symbol'] and g['moves'] >= 40)
     
     print(f"\nMinimax Win Rate by Game Length:")
     if short_games > 0:
@@ -374,9 +235,9 @@ if __name__ == "__main__":
     
     # Menu
     print("Choose test mode:")
-    print("  1. Quick Test (10 games) - ~30 seconds")
-    print("  2. Standard Test (100 games) - ~5 minutes")
-    print("  3. Extensive Test (500 games) - ~25 minutes")
+    print("  1. Quick Test (10 games) - ~30 seconds / số CPU")
+    print("  2. Standard Test (100 games) - ~5 minutes / số CPU")
+    print("  3. Extensive Test (500 games) - ~25 minutes / số CPU")
     print("  4. Custom number of games")
     
     choice = input("\nEnter choice (1-4) [default: 2]: ").strip() or "2"
@@ -390,7 +251,8 @@ if __name__ == "__main__":
     elif choice == "4":
         try:
             num = int(input("Enter number of games: "))
-            results = run_test_suite(num_games=num, test_name=f"Custom Test: {num} games")
+            stats = input("Collect search statistics? (y/N): ").strip().lower() == 'y'
+            results = run_test_suite(num_games=num, test_name=f"Custom Test: {num} games", search_stats=stats)
             save_results(results, f'test_results_{num}.json')
         except ValueError:
             print("Invalid number!")
@@ -0,0 +1,170 @@
+"""
+Test cho tìm kiếm sâu dần của MinimaxAgent: ngân sách thời gian/node và đồng hồ ván
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from agent.board import Board, X, O
+from agent.clock import GameClock
+from agent.minimaxAgt import MinimaxAgent
+
+
+def _midgame_board():
+    board = Board(9)
+    for (i, j), player in (((4, 4), X), ((4, 5), O), ((3, 3), X), ((5, 5), O), ((3, 5), X), ((2, 6), O)):
+        board.make_move(board.index(i, j), player)
+    return board
+
+
+def test_takes_immediate_win_and_blocks():
+    board = Board(9)
+    for j in range(4):
+        board.make_move(board.index(0, j), X)
+        board.make_move(board.index(8, 2 * j), O)
+    assert MinimaxAgent('x').get_move(board) == (0, 4)
+    assert MinimaxAgent('o').get_move(board) == (0, 4)
+
+
+def test_node_budget_stops_search():
+    agent = MinimaxAgent('x', max_depth=8, node_limit=300)
+    move = agent.get_move(_midgame_board())
+    assert move is not None
+    assert agent.nodes <= 300
+    assert agent.completed_depth < 8
+
+
+def _threat_heavy_board():
+    # Thế cờ mà pha VCF/VCT tốn hơn 10000 node
+    board = Board(9)
+    for i, j in ((8, 6), (5, 0), (2, 3), (8, 0), (2, 6), (5, 7), (4, 3), (6, 5), (8, 8), (0, 5),
+                 (8, 3), (8, 7), (8, 2), (2, 8)):
+        board.make_move(board.index(i, j))
+    return board
+
+
+def test_threat_phase_respects_budgets():
+    board = _threat_heavy_board()
+    agent = MinimaxAgent('x', max_depth=1)
+    agent.get_move(board)
+    assert 5000 < agent.threat_nodes <= agent.threat_search.node_limit
+    # Node đe dọa tính chung vào node_limit
+    agent = MinimaxAgent('x', max_depth=8, node_limit=1000)
+    assert board.is_empty(*agent.get_move(board))
+    assert agent.nodes + agent.threat_nodes <= 1000 + 64
+    # Cờ dừng được kiểm tra cả trong pha đe dọa
+    stop = threading.Event()
+    stop.set()
+    agent = MinimaxAgent('x', max_depth=8)
+    agent.stop_event = stop
+    assert board.is_empty(*agent.get_move(board))
+    assert agent.threat_nodes <= 2 * 64 and agent.nodes == 0  # Mỗi lần gọi find_* kiểm tra sau 64 node
+
+
+def test_time_budget_returns_completed_iteration():
+    agent = MinimaxAgent('x', max_depth=20, time_limit_ms=200)
+    start = time.perf_counter()
+    move = agent.get_move(_midgame_board())
+    assert time.perf_counter() - start < 1.0
+    assert move is not None and agent.completed_depth >= 1
+    assert agent.pv and agent.pv[0] == Board(9).index(*move)
+
+
+def test_game_clock_spreads_time():
+    clock = GameClock(total_ms=2000)
+    board = _midgame_board()
+    first = clock.allocate(board)
+    assert 0 < first <= 1000
+    clock.consume(first)
+    assert clock.remaining_ms == 2000 - first
+    assert clock.allocate(board) < first
+
+
+def test_move_ordering_statistics():
+    agent = MinimaxAgent('x', max_depth=3)
+    agent.get_move(_midgame_board())
+    assert agent.stats['cutoffs'] > 0
+    assert 0.5 < agent.first_move_cutoff_rate <= 1.0
+    assert any(any(row) for row in agent.history[1:])
+    assert any(killer is not None for killers in agent.killers for killer in killers)
+
+
+def test_principal_variation_with_verify_hash():
+    plain = MinimaxAgent('x', max_depth=4)
+    checked = MinimaxAgent('x', max_depth=4, verify_hash=True)
+    plain.get_move(_midgame_board())
+    checked.get_move(_midgame_board())
+    # Entry lưu kèm key thứ hai thì đọc biến chính cũng phải tra kèm key đó
+    assert len(checked.pv) > 1 and checked.pv == plain.pv
+
+
+def test_lazy_smp_search_reports_per_worker_stats():
+    agent = MinimaxAgent('x', max_depth=2, workers=2, tt_size_mb=1)
+    try:
+        move = agent.get_move(_midgame_board())
+        stats = agent._smp.stats
+    finally:
+        agent.close()
+    assert _midgame_board().is_empty(*move)
+    assert [r['worker'] for r in stats['workers']] == [0, 1]
+    assert stats['depth'] >= 2 and stats['total_nodes'] == agent.nodes
+    # Bảng chuyển vị nằm ở shared memory của worker, process chính không cấp bảng đủ cỡ
+    assert agent.transposition_table.size_mb < 0.01
+
+
+def test_lazy_smp_workers_follow_stop_event():
+    agent = MinimaxAgent('x', max_depth=1, workers=2, tt_size_mb=1, verify_hash=True)
+    try:
+        agent.get_move(_midgame_board())  # Khởi động process
+        agent.max_depth = 20
+        agent.stop_event = threading.Event()
+        threading.Timer(0.2, agent.stop_event.set).start()
+        start = time.perf_counter()
+        move = agent.get_move(_midgame_board())
+        elapsed = time.perf_counter() - start
+    finally:
+        agent.close()
+    assert _midgame_board().is_empty(*move)
+    assert elapsed < 2.0 and agent.completed_depth < 20
+
+
+@pytest.mark.skipif((os.cpu_count() or 1) < 4, reason="cần ít nhất 4 nhân để đo tăng tốc")
+def test_lazy_smp_speedup_on_multicore():
+    from agent.lazySmp import measure_speedup
+
+    assert measure_speedup(_midgame_board(), 'x', 4, workers=4)['speedup'] > 1.0
+
+
+def test_lazy_smp_worker_releases_shared_table():
+    from agent import lazySmp
+
+    search = lazySmp.LazySmpSearch('x', workers=1, tt_size_mb=0.01)
+    search.pool.shutdown()
+    try:
+        # Chạy phần khởi tạo/dọn dẹp của worker ngay trong process này
+        lazySmp._init_worker(search._tt_shm.name, search._control_shm.name, 'x', {'max_depth': 1})
+        table = lazySmp._worker['agent'].transposition_table
+        lazySmp._release_worker()
+        assert not lazySmp._worker
+        # View tới shared memory đã được nhả (shm.close() trong worker không còn BufferError)
+        with pytest.raises(ValueError):
+            len(table.table)
+    finally:
+        search.close()
+
+
+def test_tt_cache_warm_start(tmp_path):
+    path = str(tmp_path / "tt.cache")
+    board = _midgame_board()
+    cold = MinimaxAgent('x', max_depth=3, tt_size_mb=1, tt_cache=path)
+    assert cold.tt_cache_loaded == 0
+    move = cold.get_move(board)
+    cold.close()
+
+    warm = MinimaxAgent('x', max_depth=3, tt_size_mb=1, tt_cache=path)
+    assert warm.tt_cache_loaded > 0
+    assert warm.get_move(board) == move
+    assert warm.nodes < cold.nodes
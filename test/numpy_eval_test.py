@@ -0,0 +1,47 @@
+"""
+Test tương đương giữa backend NumPy và MinimaxAgent._evaluate_board
+"""
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from agent.board import Board
+from agent.minimaxAgt import MinimaxAgent
+from agent.numpyEval import evaluate, evaluate_batch, find_winners
+
+
+def _random_boards(count, seed=11):
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        board = Board(9)
+        for _ in range(rng.randrange(0, 40)):
+            if board.game_over:
+                break
+            board.make_move(rng.choice(board.legal_moves()))
+        boards.append(board)
+    return boards
+
+
+def test_matches_evaluate_board():
+    agents = {'x': MinimaxAgent('x', tt_size_mb=0.01), 'o': MinimaxAgent('o', tt_size_mb=0.01)}
+    for board in _random_boards(200):
+        for symbol, agent in agents.items():
+            assert evaluate(board, symbol) == agent._evaluate_board(board)
+
+
+def test_batch_matches_single_and_finds_winners():
+    boards = _random_boards(100, seed=3)
+    scores = evaluate_batch(boards)
+    assert scores.tolist() == [board.score for board in boards]
+    assert find_winners(boards).tolist() == [board.winner for board in boards]
+
+
+def test_other_sizes_and_win_lengths():
+    board = Board(7, win_length=4)
+    for idx in (8, 9, 10, 24, 16, 30):
+        board.make_move(idx)
+    assert evaluate_batch(board, win_length=4)[0] == board.score
@@ -0,0 +1,38 @@
+from agent.board import Board
+from agent.minimaxAgt import MinimaxAgent
+from agent.openingBook import OpeningBook, build_book, write_book
+
+
+def test_build_and_lookup(tmp_path):
+    path = str(tmp_path / "opening.book")
+    count = build_book(path, plies=2, depth=2, width=2)
+    book = OpeningBook(path)
+    try:
+        assert len(book) == count >= 2
+        board = Board(9)
+        assert book.lookup(board)[0] == board.index(4, 4)
+        board.make_move(board.index(4, 4))
+        move, _ = book.lookup(board)
+        assert board.cells[move] == 0
+        # Thế cờ ngoài sách
+        board.make_move(board.index(0, 0))
+        assert book.lookup(board) is None
+    finally:
+        book.close()
+
+
+def test_agent_plays_book_move(tmp_path):
+    path = str(tmp_path / "opening.book")
+    board = Board(9)
+    board.make_move(board.index(4, 4))
+    # Nước trong sách khác với nước minimax tự chọn
+    write_book(path, [(board.hash, board.hash2, board.index(0, 8), 7)])
+    agent = MinimaxAgent('o', opening_book=path)
+    try:
+        assert agent.get_move(board) == (0, 8)
+        assert agent.nodes == 0 and agent.best_score == 7
+        board.make_move(board.index(0, 8))
+        board.make_move(board.index(4, 5))
+        assert agent.get_move(board) != (0, 8)
+    finally:
+        agent.close()
@@ -0,0 +1,52 @@
+from agent.minimaxAgt import MinimaxAgent
+from agent.ponder import Ponderer
+from test.minimax_search_test import _midgame_board
+
+
+def test_ponder_hit_answers_from_background_search():
+    board = _midgame_board()
+    agent = MinimaxAgent('x', max_depth=3)
+    i, j = agent.get_move(board)
+    board.make_move(board.index(i, j))
+
+    ponderer = Ponderer(agent)
+    predicted = ponderer.start(board)
+    assert predicted is not None
+    board.make_move(predicted)
+    move = ponderer.resolve(board)
+    assert ponderer.hits == 1 and not ponderer.active
+    assert move == MinimaxAgent('x', max_depth=3).get_move(board)
+
+
+def test_ponder_miss_is_cancelled():
+    board = _midgame_board()
+    agent = MinimaxAgent('x', max_depth=12, time_limit_ms=200)
+    i, j = agent.get_move(board)
+    board.make_move(board.index(i, j))
+
+    ponderer = Ponderer(agent)
+    predicted = ponderer.start(board)
+    other = next(m for m in agent._get_prioritized_moves(board) if m != predicted)
+    board.make_move(other)
+    assert ponderer.resolve(board) is None
+    assert ponderer.misses == 1 and not ponderer.active
+    # Agent dùng lại bình thường sau khi hủy
+    assert agent.stop_event is None and agent.time_limit_ms == 200
+    assert board.is_empty(*agent.get_move(board))
+
+
+def test_stop_does_not_wait_for_search():
+    board = _midgame_board()
+    agent = MinimaxAgent('x', max_depth=12, time_limit_ms=200)
+    i, j = agent.get_move(board)
+    board.make_move(board.index(i, j))
+
+    ponderer = Ponderer(agent)
+    # Giữ agent như một lượt tìm kiếm chưa dừng kịp: stop() vẫn phải trả về ngay
+    with ponderer.lock:
+        ponderer.start(board)
+        thread = ponderer._thread
+        ponderer.stop()
+        assert not ponderer.active and thread.is_alive()
+    thread.join()
+    assert agent.stop_event is None and agent.time_limit_ms == 200
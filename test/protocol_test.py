@@ -0,0 +1,59 @@
+import subprocess
+import sys
+
+from agent.protocol import ProtocolEngine
+
+
+def _run(engine, *lines):
+    output = []
+    for line in lines:
+        output.extend(engine.handle(line))
+    return output
+
+
+def test_game_is_updated_incrementally():
+    engine = ProtocolEngine(turn_ms=200)
+    assert _run(engine, "START 9", "INFO timeout_turn 100") == ["OK"]
+    table = engine.table
+    reply = _run(engine, "TURN 4,4")
+    assert len(reply) == 1
+    x, y = map(int, reply[0].split(','))
+    assert engine.board.moves[-1][0] == engine.board.index(y, x)
+    _run(engine, "TURN 0,0")
+    assert len(engine.board.moves) == 4
+    # Cùng một bảng chuyển vị suốt ván và sau RESTART
+    assert _run(engine, "RESTART") == ["OK"] and engine.table is table and not engine.board.moves
+
+
+def test_board_command_and_errors():
+    engine = ProtocolEngine(turn_ms=100)
+    _run(engine, "START 9")
+    # Đối thủ (2) có 4 quân hàng ngang, mình (1) phải chặn ở 4,0 hoặc thắng thì không có
+    lines = ["BOARD", "0,0,2", "0,8,1", "1,0,2", "1,8,1", "2,0,2", "8,2,1", "3,0,2", "DONE"]
+    reply = _run(engine, *lines)
+    assert reply == ["4,0"]
+    assert _run(engine, "TURN 4,0")[0].startswith("ERROR")
+    assert _run(engine, "TURN 42")[0].startswith("ERROR")
+    assert _run(engine, "FOO") == ["UNKNOWN command FOO"]
+
+
+def test_max_memory_resizes_table():
+    engine = ProtocolEngine(turn_ms=100, tt_size_mb=16)
+    _run(engine, "START 9")
+    assert engine.table.size_mb == 16
+    # INFO max_memory tới sau START: bảng phải theo giới hạn mới ngay, kể cả qua START tiếp theo
+    assert _run(engine, "INFO max_memory 8388608") == []
+    table = engine.table
+    assert table.size_mb <= 4
+    assert _run(engine, "START 9") == ["OK"] and engine.table is table
+    assert len(_run(engine, "TURN 4,4")) == 1
+    assert all(agent.transposition_table is table for agent in engine.agents.values())
+    assert engine.agents
+
+
+def test_subprocess_session():
+    script = "START 9\nINFO timeout_turn 100\nBEGIN\nTURN 0,0\nEND\n"
+    result = subprocess.run([sys.executable, "-m", "agent.protocol"], input=script,
+                            capture_output=True, text=True, timeout=30)
+    lines = result.stdout.split()
+    assert lines[0] == "OK" and lines[1] == "4,4" and len(lines) == 3
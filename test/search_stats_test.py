@@ -0,0 +1,55 @@
+import json
+
+from agent.minimaxAgt import MinimaxAgent
+from agent.randomAgt import RandomAgent
+from agent.searchStats import SearchStats, profile_move
+from test.benchmark import POSITIONS, build_board
+from agent.gameSimulator import GameSimulator
+from agent.tournament import run_tournament
+
+
+def test_stats_match_plain_search_and_leave_agent_unpatched():
+    board = build_board(POSITIONS['midgame/cluster'])
+    progress = []
+    agent = MinimaxAgent('x', max_depth=3, collect_stats=True, on_progress=progress.append)
+    plain = MinimaxAgent('x', max_depth=3)
+    assert agent.get_move(board) == plain.get_move(board)
+    stats = agent.search_stats
+    assert stats.nodes == plain.nodes == agent.nodes
+    assert stats.tt_probes >= stats.tt_hits > 0 and stats.tt_stores > 0
+    assert sum(stats.cutoffs) == agent.stats['cutoffs'] and stats.cutoffs[0] == agent.stats['first_move_cutoffs']
+    assert stats.seldepth == 3 and stats.effective_branching_factor > 1
+    assert sum(stats.phase_ms.values()) <= stats.time_ms
+    assert [info['depth'] for info in progress] == [1, 2, 3]
+    assert progress[-1]['pv'][0] == progress[-1]['move'] == board.coords(agent.pv[0])
+    # Các hàm bọc chỉ gắn trong lượt get_move
+    assert not {'_minimax', '_check_winner', '_record_cutoff'} & set(vars(agent))
+
+
+def test_merge_and_round_trip():
+    board = build_board(POSITIONS['opening/diagonal'])
+    agent = MinimaxAgent('o', max_depth=2, collect_stats=True)
+    agent.get_move(board)
+    first = agent.search_stats
+    total = SearchStats().merge(first).merge(first)
+    data = json.loads(json.dumps(total.as_dict()))
+    assert data['moves'] == 2 and data['nodes'] == 2 * first.nodes
+    assert data['cutoffs'] == [2 * c for c in first.cutoffs]
+    restored = SearchStats.from_dict(data).as_dict()
+    assert restored['nodes'] == data['nodes'] and restored['ebf'] == data['ebf']
+
+
+def test_simulator_and_tournament_aggregate_stats():
+    simulator = GameSimulator()
+    simulator.play_game(MinimaxAgent('x', max_depth=2, collect_stats=True), RandomAgent('o', seed=1))
+    assert set(simulator.search_stats) == {'x'} and simulator.search_stats['x'].moves > 0
+    games = run_tournament(('minimax', {'max_depth': 2, 'collect_stats': True}), 'random', 2, workers=1)
+    assert all(set(game['search']) == {'a'} for game in games)
+
+
+def test_profile_modes():
+    board = build_board(POSITIONS['opening/center'])
+    move, stats = profile_move(MinimaxAgent('o', max_depth=2), board, 'cprofile')
+    assert move is not None and stats.total_calls > 0
+    move, sampler = profile_move(MinimaxAgent('o', max_depth=2), board, 'sample', interval=0.0005)
+    assert move is not None and 'samples' in sampler.report()
@@ -0,0 +1,97 @@
+"""
+Client kiểm tra tải cho agent/server.py
+Mở nhiều ván cùng lúc (mỗi ván một kết nối), người chơi giả đi nước ngẫu nhiên,
+đo độ trễ từ lúc gửi nước tới lúc nhận nước của AI, in p50/p99 và số nước/giây
+    python -m agent.server --port 8765 &
+    cd test && python server_load.py --port 8765 --sessions 32 --games 2
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+# Đặt thư mục gốc lên đầu sys.path để import được gói agent khi chạy từ thư mục test
+sys.path.insert(0, os.path.abspath(".."))
+from agent.board import Board
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def play_session(host, port, games, time_ms, rng, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def request(message):
+        writer.write((json.dumps(message) + '\n').encode())
+        await writer.drain()
+        reply = json.loads(await reader.readline())
+        if reply['type'] == 'error':
+            raise RuntimeError(reply['message'])
+        return reply
+
+    results = []
+    try:
+        for _ in range(games):
+            started = await request({'type': 'new', 'opponent': 'minimax', 'human': 'x', 'time_ms': time_ms})
+            session = started['session']
+            board = Board(9)
+            while True:
+                move = rng.choice(board.legal_moves())
+                i, j = board.coords(move)
+                board.make_move(move)
+                sent = time.perf_counter()
+                reply = await request({'type': 'move', 'session': session, 'cell': [i, j]})
+                if reply['type'] == 'result':
+                    results.append(reply['result'])
+                    break
+                latencies.append((time.perf_counter() - sent) * 1000)
+                ai_i, ai_j = reply['cell']
+                board.make_move(board.index(ai_i, ai_j))
+                if reply['result']:
+                    results.append(reply['result'])
+                    break
+    finally:
+        writer.close()
+    return results
+
+
+async def run_load(host='127.0.0.1', port=8765, sessions=16, games=1, time_ms=200, seed=0):
+    """Chạy `sessions` client song song, trả về dict thống kê độ trễ và thông lượng"""
+    latencies = []
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(play_session(host, port, games, time_ms, random.Random(seed + k), latencies)
+                                      for k in range(sessions)))
+    elapsed = time.perf_counter() - start
+    results = [result for outcome in outcomes for result in outcome]
+    return {
+        'games': len(results),
+        'ai_wins': results.count('o'),
+        'moves': len(latencies),
+        'elapsed': elapsed,
+        'moves_per_second': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': percentile(latencies, 0.50),
+        'p99_ms': percentile(latencies, 0.99),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load test for the JSON Lines engine server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--sessions', type=int, default=16)
+    parser.add_argument('--games', type=int, default=1)
+    parser.add_argument('--time', type=int, default=200, dest='time_ms')
+    args = parser.parse_args()
+    report = asyncio.run(run_load(args.host, args.port, args.sessions, args.games, args.time_ms))
+    print(f"{report['games']} games, {report['moves']} AI moves in {report['elapsed']:.2f}s "
+          f"({report['moves_per_second']:.1f} moves/s) | AI wins: {report['ai_wins']}")
+    print(f"Move latency p50: {report['p50_ms']:.1f} ms | p99: {report['p99_ms']:.1f} ms")
@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+from agent.server import EngineServer
+from test.server_load import run_load
+
+
+async def _with_server(body, **kwargs):
+    server = await EngineServer(port=0, workers=1, **kwargs).start()
+    try:
+        return await body(server)
+    finally:
+        await server.close()
+
+
+def test_load_client_plays_against_server():
+    async def body(server):
+        return await run_load(port=server.port, sessions=3, games=1, time_ms=50)
+
+    report = asyncio.run(_with_server(body, max_depth=3))
+    assert report['games'] == 3 and report['moves'] > 0
+    assert report['p50_ms'] <= report['p99_ms']
+
+
+def test_rules_and_disconnect_cancels_search():
+    async def body(server):
+        reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+
+        async def request(message):
+            writer.write((json.dumps(message) + '\n').encode())
+            await writer.drain()
+            return json.loads(await reader.readline())
+
+        session = (await request({'type': 'new', 'human': 'x', 'time_ms': 5000}))['session']
+        assert (await request({'type': 'move', 'session': session, 'cell': [9, 9]}))['type'] == 'error'
+        assert (await request({'type': 'new', 'opponent': 'nope'}))['type'] == 'error'
+        assert 'unknown opponent' in (await request({'type': 'new', 'opponent': 'learning'}))['message']
+        # Gửi nước rồi ngắt ngay khi AI đang nghĩ
+        writer.write((json.dumps({'type': 'move', 'session': session, 'cell': [4, 4]}) + '\n').encode())
+        await writer.drain()
+        await asyncio.sleep(0.2)
+        writer.close()
+        for _ in range(100):
+            if not server.sessions and len(server._free_slots) == server.max_sessions:
+                break
+            await asyncio.sleep(0.05)
+        return server
+
+    server = asyncio.run(_with_server(body, max_depth=12))
+    assert not server.sessions
+    assert server.stats['cancelled'] == 1 and server.stats['moves'] == 0
+
+
+def test_sessions_are_private_and_times_validated():
+    async def body(server):
+        clients = [await asyncio.open_connection('127.0.0.1', server.port) for _ in range(2)]
+
+        async def request(client, message):
+            reader, writer = client
+            writer.write((json.dumps(message) + '\n').encode())
+            await writer.drain()
+            return json.loads(await reader.readline())
+
+        mine, other = clients
+        for bad in ({'time_ms': -5}, {'time_ms': '100'}, {'time_ms': True}, {'budget_ms': 0}):
+            assert (await request(mine, dict(bad, type='new')))['type'] == 'error'
+        session = (await request(mine, {'type': 'new', 'human': 'x'}))['session']
+        # Kết nối khác không được đi nước hay đóng ván không phải của mình
+        assert (await request(other, {'type': 'move', 'session': session, 'cell': [4, 4]}))['type'] == 'error'
+        assert (await request(other, {'type': 'close', 'session': session}))['type'] == 'error'
+        assert session in server.sessions
+        for _, writer in clients:
+            writer.close()
+        return len(server.sessions)
+
+    assert asyncio.run(_with_server(body, max_depth=2)) == 1
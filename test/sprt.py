@@ -0,0 +1,195 @@
+"""
+Kiểm định SPRT (sequential probability ratio test) giữa hai cấu hình engine
+Các ván đi theo cặp: cùng một khai cuộc ngẫu nhiên, A cầm X ván đầu và cầm O ván sau, nên lợi thế
+đi trước và khai cuộc lệch triệt tiêu trong từng cặp. Sau mỗi cặp tính log-likelihood ratio (GSPRT
+trên điểm của cặp, 5 kết quả 0, 0.5, 1, 1.5, 2) giữa H0: elo = elo0 và H1: elo = elo1; dừng ngay khi
+LLR vượt một trong hai ngưỡng suy ra từ alpha/beta
+    python sprt.py "minimax:max_depth=3" "minimax:max_depth=2" --elo0 0 --elo1 50
+"""
+
+import ast
+import math
+import os
+import random
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Đặt thư mục gốc lên đầu sys.path để import được gói agent khi chạy từ thư mục test
+sys.path.insert(0, os.path.abspath(".."))
+from agent.tournament import play_one
+
+# Một cặp ảo chia đều cho 5 loại kết quả: khi mới có vài cặp cùng kết quả, phương sai không
+# co về 0 (LLR sẽ vọt qua ngưỡng chỉ sau 1-2 cặp); ảnh hưởng mất dần khi số cặp tăng
+_PRIOR = 0.2
+
+
+def elo_to_score(elo):
+    """Điểm kỳ vọng (0..1) của bên mạnh hơn `elo` theo mô hình logistic"""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def score_to_elo(score):
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+def sprt_bounds(alpha=0.05, beta=0.05):
+    """Ngưỡng (dưới, trên) của LLR: dưới -> chấp nhận H0, trên -> chấp nhận H1"""
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+
+def _moments(pairs):
+    """Trung bình và phương sai của điểm mỗi ván trong cặp, pairs[k] = số cặp được k/2 điểm"""
+    counts = [n + _PRIOR for n in pairs]
+    total = sum(counts)
+    mean = sum(n * k / 4 for k, n in enumerate(counts)) / total
+    var = sum(n * (k / 4 - mean) ** 2 for k, n in enumerate(counts)) / total
+    return mean, var, total
+
+
+def llr(pairs, elo0, elo1):
+    """
+    Log-likelihood ratio xấp xỉ chuẩn (GSPRT) cho số liệu cặp ván
+    pairs: list 5 phần tử, pairs[k] là số cặp mà A được k/2 điểm (0, 0.5, ..., 2)
+    """
+    if not sum(pairs):
+        return 0.0
+    mean, var, total = _moments(pairs)
+    s0, s1 = elo_to_score(elo0), elo_to_score(elo1)
+    return total * (s1 - s0) * (2 * mean - s0 - s1) / (2 * var)
+
+
+def elo_estimate(pairs, z=1.96):
+    """Elo của A so với B và khoảng tin cậy (mặc định 95%): (elo, thấp, cao)"""
+    mean, var, total = _moments(pairs)
+    margin = z * math.sqrt(var / total)
+    return score_to_elo(mean), score_to_elo(mean - margin), score_to_elo(mean + margin)
+
+
+def make_opening(seed, plies=2, size=9, radius=2):
+    """Khai cuộc `plies` nước ngẫu nhiên (tất định theo seed) quanh tâm bàn cờ"""
+    rng = random.Random(seed)
+    center = size // 2
+    area = [(i, j) for i in range(center - radius, center + radius + 1)
+            for j in range(center - radius, center + radius + 1)]
+    return rng.sample(area, plies)
+
+
+def play_pair(task):
+    """Chơi một cặp ván cùng khai cuộc, A đổi màu; trả về (số cặp, [kết quả ván 1, ván 2])"""
+    pair_num, spec_a, spec_b, seed, rows, plies = task
+    opening = make_opening(seed, plies, rows)
+    games = [play_one((2 * pair_num - 1 + k, spec_a, spec_b, k == 0, seed * 2 + k, rows, opening))
+             for k in range(2)]
+    return pair_num, games
+
+
+def pair_points(games):
+    """Điểm của A trong cặp tính theo nửa điểm (0..4): thắng 2, hòa/khác 1, thua 0"""
+    return sum(2 if game['result'] == 'a' else 0 if game['result'] == 'b' else 1 for game in games)
+
+
+def run_sprt(spec_a, spec_b, elo0=0, elo1=50, alpha=0.05, beta=0.05, max_pairs=1000, workers=None,
+             seed=0, rows=9, plies=2, on_pair=None):
+    """
+    Đấu spec_a với spec_b theo cặp tới khi LLR vượt ngưỡng hoặc hết max_pairs
+
+    Args:
+        spec_a, spec_b: Như agent.tournament.make_agent: 'minimax' hoặc ('minimax', {'max_depth': 3})
+        elo0, elo1: Elo của A so với B theo H0 và H1
+        alpha, beta: Xác suất chấp nhận nhầm H1 / H0
+        workers: Số process (None: số CPU, 1: chạy ngay trong process hiện tại)
+        on_pair: Hàm gọi lại sau mỗi cặp với dict trạng thái hiện tại
+
+    Returns:
+        dict: 'result' ('H1', 'H0' hoặc 'inconclusive'), llr, bounds, pairs, số ván, W/D/L, elo và khoảng tin cậy
+    """
+    lower, upper = sprt_bounds(alpha, beta)
+    pairs = [0] * 5
+    wdl = [0, 0, 0]
+    state = {'result': 'inconclusive', 'llr': 0.0, 'bounds': (lower, upper)}
+
+    def record(games):
+        pairs[pair_points(games)] += 1
+        for game in games:
+            wdl[0 if game['result'] == 'a' else 2 if game['result'] == 'b' else 1] += 1
+        state['llr'] = llr(pairs, elo0, elo1)
+        if state['llr'] >= upper:
+            state['result'] = 'H1'
+        elif state['llr'] <= lower:
+            state['result'] = 'H0'
+        if on_pair:
+            on_pair(summary())
+        return state['result'] != 'inconclusive'
+
+    def summary():
+        elo, elo_low, elo_high = elo_estimate(pairs)
+        return dict(state, pairs=list(pairs), games=2 * sum(pairs), wins=wdl[0], draws=wdl[1], losses=wdl[2],
+                    elo=elo, elo_low=elo_low, elo_high=elo_high)
+
+    tasks = ((pair_num, spec_a, spec_b, seed + pair_num, rows, plies) for pair_num in range(1, max_pairs + 1))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for task in tasks:
+            if record(play_pair(task)[1]):
+                break
+        return summary()
+
+    # Giữ tối đa 2 cặp mỗi worker đang chạy; kết quả xét theo đúng thứ tự cặp để tái lập được
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        finished = False
+        for task in tasks:
+            pending.append(pool.submit(play_pair, task))
+            if len(pending) >= workers * 2:
+                finished = record(pending.popleft().result()[1])
+                if finished:
+                    break
+        while pending and not finished:
+            finished = record(pending.popleft().result()[1])
+        for future in pending:
+            future.cancel()
+    return summary()
+
+
+def parse_spec(text):
+    """'minimax:max_depth=3,threat_nodes=0' -> ('minimax', {'max_depth': 3, 'threat_nodes': 0})"""
+    name, _, args = text.partition(':')
+    kwargs = {}
+    for item in filter(None, args.split(',')):
+        key, value = item.split('=')
+        kwargs[key.strip()] = ast.literal_eval(value.strip())
+    return (name, kwargs) if kwargs else name
+
+
+def format_summary(summary):
+    lower, upper = summary['bounds']
+    return (f"{summary['result']} | LLR {summary['llr']:.2f} ({lower:.2f}, {upper:.2f}) | "
+            f"games {summary['games']} W/D/L {summary['wins']}/{summary['draws']}/{summary['losses']} | "
+            f"elo {summary['elo']:.1f} [{summary['elo_low']:.1f}, {summary['elo_high']:.1f}]")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="SPRT match between two engine configurations")
+    parser.add_argument('engine_a', type=parse_spec, help="e.g. minimax:max_depth=3")
+    parser.add_argument('engine_b', type=parse_spec)
+    parser.add_argument('--elo0', type=float, default=0)
+    parser.add_argument('--elo1', type=float, default=50)
+    parser.add_argument('--alpha', type=float, default=0.05)
+    parser.add_argument('--beta', type=float, default=0.05)
+    parser.add_argument('--max-pairs', type=int, default=1000)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--plies', type=int, default=2, help="random opening moves per pair")
+    args = parser.parse_args()
+
+    def progress(summary):
+        if summary['games'] % 20 == 0 and summary['result'] == 'inconclusive':
+            print(format_summary(summary), flush=True)
+
+    result = run_sprt(args.engine_a, args.engine_b, args.elo0, args.elo1, args.alpha, args.beta,
+                      args.max_pairs, args.workers, args.seed, plies=args.plies, on_pair=progress)
+    print(format_summary(result))
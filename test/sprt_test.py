@@ -0,0 +1,35 @@
+import pytest
+
+from test.sprt import elo_estimate, llr, make_opening, parse_spec, play_pair, run_sprt, sprt_bounds
+
+
+def test_llr_direction_and_bounds():
+    lower, upper = sprt_bounds(0.05, 0.05)
+    assert lower == pytest.approx(-upper) and upper == pytest.approx(2.944, abs=1e-3)
+    assert llr([0] * 5, 0, 50) == 0.0
+    # A thắng nhiều hơn hẳn: nghiêng về H1; hai bên ngang nhau: nghiêng về H0
+    assert llr([5, 10, 20, 30, 35], 0, 50) > upper
+    assert llr([20, 20, 40, 20, 20], 0, 50) < 0
+    assert llr([20, 20, 40, 20, 20], 0, 50) > llr([40, 20, 40, 20, 0], 0, 50)
+
+
+def test_elo_estimate_is_symmetric():
+    elo, low, high = elo_estimate([10, 20, 40, 20, 10])
+    assert elo == pytest.approx(0) and low == pytest.approx(-high) and low < 0
+    assert elo_estimate([0, 0, 10, 20, 10])[0] > 100
+
+
+def test_pair_shares_opening_and_swaps_colours():
+    opening = make_opening(5, plies=3)
+    assert opening == make_opening(5, plies=3) and len(set(opening)) == 3
+    _, games = play_pair((1, ('minimax', {'max_depth': 1}), 'random', 5, 9, 2))
+    assert [g['a_symbol'] for g in games] == ['x', 'o'] and [g['game'] for g in games] == [1, 2]
+    assert all(g['moves'] > 2 for g in games)
+
+
+def test_stops_early_on_clear_difference():
+    result = run_sprt(('minimax', {'max_depth': 2}), 'random', elo0=0, elo1=100, max_pairs=50, workers=1)
+    assert result['result'] == 'H1' and result['games'] < 20
+    assert result['llr'] >= result['bounds'][1] and result['elo_low'] > 0
+    assert parse_spec('minimax:max_depth=3,threat_nodes=0') == ('minimax', {'max_depth': 3, 'threat_nodes': 0})
+    assert parse_spec('random') == 'random'
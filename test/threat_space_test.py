@@ -0,0 +1,47 @@
+"""
+Test cho tìm kiếm chuỗi đe dọa (VCF/VCT)
+"""
+
+from agent.board import Board, X, O
+from agent.minimaxAgt import MinimaxAgent
+from agent.threatSpace import ThreatSearch
+
+POSITION = [(6, 4), (8, 7), (2, 3), (7, 3), (8, 8), (6, 8), (4, 4), (6, 7),
+            (3, 8), (4, 1), (6, 6), (5, 6), (2, 0), (1, 5), (5, 3), (2, 4)]
+
+
+def _position():
+    board = Board(9)
+    for k, (i, j) in enumerate(POSITION):
+        board.make_move(board.index(i, j), X if k % 2 == 0 else O)
+    return board
+
+
+def test_vcf_line_is_forced_and_wins():
+    board = _position()
+    search = ThreatSearch()
+    line = search.find_vcf(board, X)
+    assert line is not None and len(line) >= 5
+
+    # Mỗi nước của X tạo 4, O chỉ có đúng một ô chặn
+    for k in range(0, len(line) - 1, 2):
+        board.make_move(line[k], X)
+        assert search.win_cells(board, X) == {line[k + 1]}
+        board.make_move(line[k + 1], O)
+        assert not board.winner
+    board.make_move(line[-1], X)
+    assert board.winner == X or len(search.win_cells(board, X)) >= 2
+
+
+def test_no_vcf_for_defender_and_budget_respected():
+    search = ThreatSearch(node_limit=5)
+    assert search.find_vcf(_position(), X) is None
+    assert search.nodes <= 6
+    assert ThreatSearch().find_vcf(Board(9), X) is None
+
+
+def test_agent_plays_vcf_beyond_horizon():
+    board = _position()
+    line = ThreatSearch().find_vcf(board, X)
+    agent = MinimaxAgent('x', max_depth=1)
+    assert agent.get_move(board) == board.coords(line[0])
@@ -0,0 +1,14 @@
+from agent.tournament import run_tournament
+
+
+def test_results_do_not_depend_on_worker_count():
+    serial = run_tournament('random', 'random', 6, workers=1, seed=7)
+    parallel = run_tournament('random', 'random', 6, workers=2, seed=7)
+    assert serial == parallel
+    assert [g['game'] for g in parallel] == list(range(1, 7))
+
+
+def test_colours_alternate():
+    games = run_tournament(('minimax', {'max_depth': 2}), 'random', 2, workers=1, seed=1)
+    assert [g['a_symbol'] for g in games] == ['x', 'o']
+    assert all(g['result'] == 'a' for g in games)
@@ -0,0 +1,79 @@
+"""
+Test cho TranspositionTable: đóng gói entry, cận và chính sách thay thế
+"""
+
+import os
+
+import pytest
+
+from agent.transTable import TranspositionTable, EXACT, LOWER, UPPER, BUCKET_SIZE, pack, unpack
+
+
+def test_pack_round_trip():
+    for score, move, depth, flag in ((0, None, 0, EXACT), (-10003, 80, 3, UPPER), (12345, 0, 9, LOWER)):
+        assert unpack(pack(score, move, depth, flag, 5)) == (depth, score, flag, move, 5)
+
+
+def test_store_and_probe_with_lock():
+    table = TranspositionTable(size_mb=0.01)
+    table.store(123456789, 3, -42, LOWER, 17)
+    assert table.probe(123456789) == (3, -42, LOWER, 17)
+    assert table.probe(123456789 + table.num_buckets) is None
+
+    table.store(987654321, 2, 7, EXACT, None, lock=555)
+    assert table.probe(987654321, lock=555) == (2, 7, EXACT, None)
+    assert table.probe(987654321, lock=556) is None
+
+
+def test_memory_stays_fixed_and_prefers_deep_entries():
+    table = TranspositionTable(size_mb=0.001)
+    size = len(table.table)
+    buckets = table.num_buckets
+    # Một entry sâu rồi nhiều entry nông cùng bucket
+    table.store(0, 8, 1, EXACT, 1)
+    for k in range(1, 4 * BUCKET_SIZE):
+        table.store(k * buckets, 1, k, EXACT, None)
+    assert len(table.table) == size
+    assert table.probe(0) == (8, 1, EXACT, 1)
+
+    # Sang lượt mới, entry cũ bị thay dần
+    for _ in range(10):
+        table.new_search()
+    for k in range(1, 4 * BUCKET_SIZE):
+        table.store(k * buckets, 1, k, EXACT, None)
+    assert table.probe(0) is None
+
+
+def test_cache_round_trip_and_rejects_stale(tmp_path):
+    path = str(tmp_path / "tt.cache")
+    table = TranspositionTable(size_mb=0.01)
+    table.store(111, 4, 25, EXACT, 3)
+    table.store(222, 1, -5, UPPER, 7)
+    assert table.save(path, eval_version=1, seed=9, min_depth=2) == 1
+
+    warm = TranspositionTable(size_mb=0.01)
+    warm.new_search()
+    assert warm.load(path, eval_version=1, seed=9) == 1
+    assert warm.probe(111) == (4, 25, EXACT, 3)
+    assert warm.probe(222) is None
+    with pytest.raises(ValueError):
+        TranspositionTable(size_mb=0.01).load(path, eval_version=2, seed=9)
+    with pytest.raises(ValueError):
+        TranspositionTable(size_mb=0.02).load(path, eval_version=1, seed=9)
+
+
+def test_truncated_cache_is_rejected(tmp_path):
+    from agent.minimaxAgt import MinimaxAgent
+
+    path = str(tmp_path / "tt.cache")
+    table = TranspositionTable(size_mb=0.01)
+    for key in range(1, 4):
+        table.store(key * 1000, 4, key, EXACT, key)
+    assert table.save(path, eval_version=1, seed=9) == 3
+    # Cắt mất một word 8 byte ở cuối, như file ghi dở
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 8)
+    with pytest.raises(ValueError, match="truncated"):
+        TranspositionTable(size_mb=0.01).load(path, eval_version=1, seed=9)
+    # Agent nạp cache hỏng thì bắt đầu với bảng trống thay vì lỗi
+    assert MinimaxAgent('x', tt_size_mb=0.01, tt_cache=path).tt_cache_loaded == 0